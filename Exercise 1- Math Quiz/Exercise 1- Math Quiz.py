@@ -1,7 +1,47 @@
+import time
+STARTED = time.perf_counter()  # Start-up reference for the splash screen budget
 import tkinter as tk
 from tkinter import messagebox
-import random
 import os   
+import sys
+import getpass
+
+# Run directly rather than from launcher.py: the shared modules (ui_toolkit,
+# grading) live at the repository root
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from score_store import ScoreStore
+from quiz_engine import QuizEngine, ADAPTIVE, CUSTOM, DEFAULT_OPERATIONS, CORRECT, RETRY, calculate_grade, get_achievement_message
+from problems import PROBLEM_TYPES
+from telemetry import TelemetryLog
+from speed_run import SPEED_VARIANTS, Countdown, QuestionBuffer
+import ui_toolkit as ui
+
+# Widget presets for game buttons and labels (colour and size are set per widget)
+ui.define_style("quiz.button", height=2, fg='#ffffff', activebackground='#ff0088', activeforeground='#ffffff',
+    relief='raised', borderwidth=3, cursor='hand2')
+ui.define_style("quiz.label", bg='#0a0a1a', wraplength=500)
+# Instruction lines; lines starting with a section icon are rendered as headers, "" as a gap
+INSTRUCTIONS = (
+    "🎯 HOW TO PLAY:", "• Select a difficulty level to start your math adventure",
+    "• Answer 10 arithmetic questions (+ and -, or any of + - × ÷ in Custom)", "• You get 2 attempts per question",
+    "• Speed Run: race the clock with one attempt per question",
+    "• LAN Game: join a classroom game hosted with quiz_server.py", "",
+    "💰 SCORING SYSTEM:", "• First attempt correct: 10 points", "• Second attempt correct: 5 points",
+    "• Wrong answer: 0 points", "", "🔥 COMBO SYSTEM:", "• Correct answers build your combo streak",
+    "• Higher combos = more excitement!", "", "🏆 DIFFICULTY LEVELS:", "• Easy: Single digit numbers (0-9)",
+    "• Moderate: Double digit numbers (10-99)", "• Advanced: Four digit numbers (1000-9999)",
+    "• Adaptive: Number size follows how fast and accurately you answer",
+    "• Custom: Choose operations (+ - × ÷), digits and numbers per question", "",
+    "💡 TIP: Practice makes perfect! Start with Easy and work your way up!", "", "🖥️ CONTROLS:",
+    "• Press ESC to toggle full screen mode", "• Use Enter key to submit answers quickly"
+)
+SECTION_ICONS = ("🎯", "💰", "🔥", "🏆", "💡", "🖥️")
+
+# Leaderboard columns on the main menu
+LEADERBOARD_COLUMNS = (("easy", "🌱 Easy"), ("moderate", "⚡ Moderate"), ("advanced", "🔥 Advanced"), (ADAPTIVE, "🧠 Adaptive"))
+LEADERBOARD_WIDTH = 240  # Canvas pixels per leaderboard column
+
 
 class MathsQuizGame:
     def __init__(self, root):
@@ -18,21 +58,33 @@ class MathsQuizGame:
         self.root.configure(bg='#0a0a1a')  # Set dark blue background color
         self.root.bind('<Escape>', self.toggle_fullscreen)  # Bind ESC key to toggle fullscreen
 
-        # Initialize game state variables
-        self.difficulty = None  # Store current difficulty level
-        self.score = 0  # Player's current score
-        self.current_question = 0  # Track current question number
-        self.total_questions = 10  # Total questions per game
-        self.current_attempt = 1  # Track attempt count per question (1 or 2)
-        self.num1 = 0  # First number in math problem
-        self.num2 = 0  # Second number in math problem
-        self.operation = ''  # Math operation (+ or -)
-        self.correct_answer = 0  # Store correct answer for current problem
-        self.combo = 0  # Track consecutive correct answers
-        self.max_combo = 0  # Track highest combo achieved
+        # Every answer goes through the telemetry ring; the adaptive difficulty reads it from there
+        self.telemetry = TelemetryLog()  # Per-answer latency ring and log
+        # Game state and scoring live in the headless engine
+        self.engine = QuizEngine(ring=self.telemetry.ring)
+        self.max_combo = 0  # Track highest combo achieved this session
+        self.question_started = 0  # When the current question was shown
+        self.attempt_started = 0  # When the current attempt became answerable
+        self.question_times = []  # (question, attempts, seconds, points) for this game
+        
+        # Persistent score history shared by everyone who plays on this machine
+        self.player = getpass.getuser()
+        self.scores = ScoreStore()
+        self.closed = False  # Set once close() has flushed the stores
         
         # Initialize UI elements
         self.attempt_label = None  # Label to show current attempt
+        self.screens = {}  # Static screens built once and reused: name -> Frame
+        self.menu_stats_dirty = True  # Scores changed since the menu stats were last drawn
+        
+        # Speed run state
+        self.countdown = None  # Running Countdown, if any
+        self.speed_run = None  # (variant, difficulty) of the current speed run
+        
+        # LAN game state
+        self.lan_client = None  # Connected LanQuizClient, if any
+        self.lan_poll = None  # Pending after() callback polling the client's message queue
+        self.lan_question = None  # (round, question) currently open on the server
         
         # Define color scheme for consistent styling
         self.colors = {
@@ -63,33 +115,46 @@ class MathsQuizGame:
     def create_game_button(self, parent, text, command, color='primary', width=20, font_size=12):
         # Create styled buttons with consistent appearance
         bg_color = self.colors[color]  # Get background color from scheme
-        return tk.Button(parent, text=text, font=('Arial', font_size, 'bold'), width=width, height=2,
-            bg=bg_color, fg=self.colors['text'], activebackground=self.colors['accent'],
-            activeforeground=self.colors['text'], relief='raised', borderwidth=3, cursor='hand2', command=command)
+        return ui.button(parent, "quiz.button", text=text, font=('Arial', font_size, 'bold'), width=width,
+            bg=bg_color, command=command)
     
     def create_game_label(self, parent, text, font_size=12, is_title=False, color='text'):
         # Create styled labels with consistent appearance
         font_style = ('Arial', font_size, 'bold') if is_title else ('Arial', font_size)
-        return tk.Label(parent, text=text, font=font_style, bg=self.colors['bg'], fg=self.colors[color], wraplength=500)
+        return ui.label(parent, "quiz.label", text=text, font=font_style, fg=self.colors[color])
+    
+    def show_screen(self, name, build):
+        # Show a cached static screen, building it on first use
+        self.clear_frame()  # Hide or clear whatever is showing
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = self.screens[name] = tk.Frame(self.main_frame, bg=self.colors['bg'])
+            build(screen)
+        screen.pack(expand=True, fill='both')
+        return screen
     
     def displayMenu(self):
         # Display main menu with game options and stats
-        self.clear_frame()  # Clear any existing widgets
-        
+        self.show_screen('menu', self.build_menu)
+        if self.menu_stats_dirty:
+            self.draw_menu_stats()
+    
+    def build_menu(self, screen):
+        # Build the main menu once; only its stats canvas is redrawn afterwards
         # Create and pack title label
-        title_label = self.create_game_label(self.main_frame, "🏰 MATH QUEST ADVENTURE", 36, True, 'primary')
+        title_label = self.create_game_label(screen, "🏰 MATH QUEST ADVENTURE", 36, True, 'primary')
         title_label.pack(pady=30)
         
         # Create and pack subtitle label
-        subtitle_label = self.create_game_label(self.main_frame, "Embark on a Mathematical Journey!", 18, False, 'secondary')
+        subtitle_label = self.create_game_label(screen, "Embark on a Mathematical Journey!", 18, False, 'secondary')
         subtitle_label.pack(pady=5)
         
         # Create and pack screen info label
-        screen_info = self.create_game_label(self.main_frame, "Press ESC to exit full screen", 12, False, 'secondary')
+        screen_info = self.create_game_label(screen, "Press ESC to exit full screen", 12, False, 'secondary')
         screen_info.pack(pady=5)
         
         # Create menu buttons frame
-        menu_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        menu_frame = tk.Frame(screen, bg=self.colors['bg'])
         menu_frame.pack(pady=40)
         
         # Create and pack difficulty selection button
@@ -100,18 +165,41 @@ class MathsQuizGame:
         instructions_btn = self.create_game_button(menu_frame, "📖 INSTRUCTIONS", self.showInstructions, 'warning', 25, 14)
         instructions_btn.pack(pady=15)
         
+        # Create and pack speed run button
+        speed_btn = self.create_game_button(menu_frame, "⏱️ SPEED RUN", self.showSpeedModes, 'secondary', 25, 14)
+        speed_btn.pack(pady=15)
+        
+        # Create and pack LAN game button
+        lan_btn = self.create_game_button(menu_frame, "🌐 JOIN LAN GAME", self.join_lan_game, 'accent', 25, 14)
+        lan_btn.pack(pady=15)
+        
         # Create and pack exit game button
         exit_btn = self.create_game_button(menu_frame, "🚪 EXIT GAME", self.confirm_quit, 'danger', 25, 14)
         exit_btn.pack(pady=15)
         
-        # Create stats display frame
-        stats_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
-        stats_frame.pack(pady=20)
-        
-        # Create and pack stats label with high score and max combo
-        stats_text = f"🏆 High Score: {self.get_high_score()} | 🔥 Max Combo: {self.max_combo}"
-        stats_label = self.create_game_label(stats_frame, stats_text, 12, False, 'secondary')
-        stats_label.pack()
+        # Stats and leaderboards share one canvas instead of a label per column
+        self.menu_stats = tk.Canvas(screen, width=LEADERBOARD_WIDTH * len(LEADERBOARD_COLUMNS), height=190,
+            bg=self.colors['bg'], highlightthickness=0)
+        self.menu_stats.pack(pady=20)
+    
+    def draw_menu_stats(self):
+        # Redraw the high score line and the top 5 games for each difficulty
+        canvas = self.menu_stats
+        canvas.delete('all')
+        self.menu_stats_dirty = False
+        
+        best_score, best_combo = self.scores.player_best(self.player)
+        best_combo = max(self.max_combo, best_combo)
+        canvas.create_text(LEADERBOARD_WIDTH * len(LEADERBOARD_COLUMNS) // 2, 10, anchor='n',
+            text=f"🏆 High Score: {best_score} | 🔥 Max Combo: {best_combo}", font=ui.get_font(self.root, ('Arial', 12)), fill=self.colors['secondary'])
+        for column, (diff_value, diff_name) in enumerate(LEADERBOARD_COLUMNS):
+            lines = [diff_name]
+            for rank, (player, score, combo) in enumerate(self.scores.top_scores(diff_value, 5), 1):
+                lines.append(f"{rank}. {player} - {score} (x{combo})")
+            if len(lines) == 1:
+                lines.append("No games yet")
+            canvas.create_text(LEADERBOARD_WIDTH * column + 25, 50, anchor='nw', text="\n".join(lines),
+                font=ui.get_font(self.root, ('Arial', 11)), fill=self.colors['text'], width=LEADERBOARD_WIDTH - 30)
     
     def showDifficultyLevel(self):
         # Show difficulty selection screen with three options
@@ -133,7 +221,8 @@ class MathsQuizGame:
         difficulties = [
             ("🌱 Easy", "Single Digit Numbers (0-9)", "easy", "primary"),
             ("⚡ Moderate", "Double Digit Numbers (10-99)", "moderate", "warning"), 
-            ("🔥 Advanced", "Four Digit Numbers (1000-9999)", "advanced", "danger")
+            ("🔥 Advanced", "Four Digit Numbers (1000-9999)", "advanced", "danger"),
+            ("🧠 Adaptive", "Numbers grow or shrink with your speed and accuracy", ADAPTIVE, "secondary")
         ]
         
         # Create buttons for each difficulty level
@@ -149,101 +238,111 @@ class MathsQuizGame:
             # Create description label for difficulty level
             desc_label = self.create_game_label(diff_frame, diff_desc, 12, False, 'text')
             desc_label.pack()
+        
+        # Create custom challenge options: operations, digits and numbers per question
+        custom_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        custom_frame.pack(pady=15)
+        options_frame = tk.Frame(custom_frame, bg=self.colors['bg'])
+        options_frame.pack(pady=5)
+        
+        self.custom_ops = {}  # Operator symbol -> BooleanVar
+        for symbol in PROBLEM_TYPES:
+            var = tk.BooleanVar(value=symbol in DEFAULT_OPERATIONS)
+            ui.make(tk.Checkbutton, options_frame, text=symbol, variable=var, font=('Arial', 14, 'bold'),
+                bg=self.colors['bg'], fg=self.colors['text'], selectcolor=self.colors['bg'],
+                activebackground=self.colors['bg']).pack(side=tk.LEFT, padx=8)
+            self.custom_ops[symbol] = var
+        
+        self.custom_digits = tk.IntVar(value=2)
+        self.custom_operands = tk.IntVar(value=2)
+        for label_text, var, low, high in (("Digits", self.custom_digits, 1, 9), ("Numbers", self.custom_operands, 2, 5)):
+            self.create_game_label(options_frame, label_text, 12, False, 'text').pack(side=tk.LEFT, padx=(20, 5))
+            ui.make(tk.Spinbox, options_frame, from_=low, to=high, textvariable=var, width=3, font=('Arial', 14),
+                state='readonly').pack(side=tk.LEFT)
+        
+        custom_btn = self.create_game_button(custom_frame, "🛠️ Custom Challenge", self.start_custom_quiz, 'secondary', 25, 14)
+        custom_btn.pack(pady=5)
     
     def showInstructions(self):
         # Display game instructions and rules
-        self.clear_frame()  # Clear existing widgets
-        
+        self.show_screen('instructions', self.build_instructions)
+    
+    def build_instructions(self, screen):
+        # Render every instruction line into one read-only Text widget, styled with tags
         # Create back button to return to main menu
-        back_btn = self.create_game_button(self.main_frame, "← Back to Menu", self.displayMenu, 'accent', 15)
+        back_btn = self.create_game_button(screen, "← Back to Menu", self.displayMenu, 'accent', 15)
         back_btn.pack(anchor='nw', pady=10)
         
         # Create and pack instructions title
-        title_label = self.create_game_label(self.main_frame, "📖 GAME INSTRUCTIONS", 24, True, 'primary')
+        title_label = self.create_game_label(screen, "📖 GAME INSTRUCTIONS", 24, True, 'primary')
         title_label.pack(pady=20)
         
-        # Define instruction text with sections
-        instructions = [
-            "🎯 HOW TO PLAY:", "• Select a difficulty level to start your math adventure",
-            "• Answer 10 arithmetic questions (addition or subtraction)", "• You get 2 attempts per question", "",
-            "💰 SCORING SYSTEM:", "• First attempt correct: 10 points", "• Second attempt correct: 5 points", 
-            "• Wrong answer: 0 points", "", "🔥 COMBO SYSTEM:", "• Correct answers build your combo streak",
-            "• Higher combos = more excitement!", "", "🏆 DIFFICULTY LEVELS:", "• Easy: Single digit numbers (0-9)",
-            "• Moderate: Double digit numbers (10-99)", "• Advanced: Four digit numbers (1000-9999)", "",
-            "💡 TIP: Practice makes perfect! Start with Easy and work your way up!", "", "🖥️ CONTROLS:",
-            "• Press ESC to toggle full screen mode", "• Use Enter key to submit answers quickly"
-        ]
-        
-        # Create frame for instructions content
-        instructions_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
-        instructions_frame.pack(pady=20)
-        
-        # Create labels for each instruction line
-        for instruction in instructions:
+        text = tk.Text(screen, bg=self.colors['bg'], fg=self.colors['text'], font=ui.get_font(self.root, ('Arial', 10)), width=70,
+            height=len(INSTRUCTIONS), relief='flat', borderwidth=0, highlightthickness=0, cursor='arrow',
+            takefocus=0, wrap='word')
+        text.tag_configure('header', font=ui.get_font(self.root, ('Arial', 12, 'bold')), foreground=self.colors['warning'], justify='center', spacing1=2, spacing3=2)
+        text.tag_configure('line', justify='center', spacing1=2, spacing3=2)
+        text.tag_configure('gap', font=ui.get_font(self.root, ('Arial', 8)))
+        for instruction in INSTRUCTIONS:
             # Check for section headers and style them differently
-            if instruction.startswith("🎯") or instruction.startswith("💰") or instruction.startswith("🔥") or instruction.startswith("🏆") or instruction.startswith("💡") or instruction.startswith("🖥️"):
-                label = self.create_game_label(instructions_frame, instruction, 12, True, 'warning')
+            if instruction.startswith(SECTION_ICONS):
+                text.insert('end', instruction + "\n", 'header')
             elif instruction == "":  # Empty line for spacing
-                label = self.create_game_label(instructions_frame, " ", 8, False, 'text')
+                text.insert('end', "\n", 'gap')
             else:  # Regular instruction text
-                label = self.create_game_label(instructions_frame, instruction, 10, False, 'text')
-            label.pack(pady=2)
+                text.insert('end', instruction + "\n", 'line')
+        text.config(state='disabled')  # Read only
+        text.pack(pady=20)
     
     def randomInt(self, difficulty):
         # Generate random numbers based on selected difficulty
-        if difficulty == "easy": 
-            return random.randint(0, 9)  # Single digit numbers
-        elif difficulty == "moderate": 
-            return random.randint(10, 99)  # Double digit numbers
-        else: 
-            return random.randint(1000, 9999)  # Four digit numbers
+        return self.engine.randomInt(difficulty)
     
     def decideOperation(self):
         # Randomly choose between addition and subtraction
-        return random.choice(['+', '-'])
+        return self.engine.decideOperation()
     
     def clear_frame(self):
         # Clear all widgets from the main frame
+        if self.countdown:
+            self.countdown.cancel()  # Leaving a speed run stops its clock
+            self.countdown = None
+        if self.lan_client:
+            self.leave_lan_game()  # Leaving the LAN screen disconnects from the server
+        cached = self.screens.values()
         for widget in self.main_frame.winfo_children():
-            widget.destroy()  # Remove each widget
+            if widget in cached:
+                widget.pack_forget()  # Keep cached screens for next time
+            else:
+                widget.destroy()  # Remove each widget
         self.attempt_label = None  # Reset attempt label reference
     
     def get_high_score(self):
-        # Placeholder for high score functionality
-        return max(self.score, 100)  # Temporary implementation
+        # Best score this player has ever recorded
+        return self.scores.player_best(self.player)[0]
     
-    def start_quiz(self, difficulty):
+    def start_custom_quiz(self):
+        # Start a quiz using the operations, digits and operand count chosen on the difficulty screen
+        operations = tuple(symbol for symbol, var in self.custom_ops.items() if var.get())
+        if not operations:
+            messagebox.showerror("No Operations", "🚫 Pick at least one operation!", parent=self.root)
+            return
+        self.start_quiz(CUSTOM, self.custom_digits.get(), operations, self.custom_operands.get())
+    
+    def start_quiz(self, difficulty, digits=None, operations=DEFAULT_OPERATIONS, operands=2):
         # Start new quiz with selected difficulty
-        self.difficulty = difficulty  # Set difficulty level
-        self.score = 0  # Reset score
-        self.current_question = 0  # Reset question counter
-        self.combo = 0  # Reset combo counter
+        self.engine.operations = operations  # Operations to draw questions from
+        self.engine.operands = operands  # Numbers per question
+        self.engine.start(difficulty, digits)  # Reset score, questions and combo
+        self.question_times = []  # Reset per-question timings
         self.next_question()  # Start first question
     
     def next_question(self):
         # Generate and display next question or show results
-        if self.current_question >= self.total_questions:
+        if not self.engine.next_question():
             self.displayResults()  # Show results if all questions completed
             return
         
-        self.current_question += 1  # Increment question counter
-        self.current_attempt = 1  # Reset attempts for new question
-        
-        # Generate random numbers and operation
-        self.num1 = self.randomInt(self.difficulty)
-        self.num2 = self.randomInt(self.difficulty)
-        self.operation = self.decideOperation()
-        
-        # Ensure subtraction problems don't yield negative results
-        if self.operation == '-' and self.num1 < self.num2:
-            self.num1, self.num2 = self.num2, self.num1  # Swap numbers
-        
-        # Calculate correct answer based on operation
-        if self.operation == '+':
-            self.correct_answer = self.num1 + self.num2
-        else:
-            self.correct_answer = self.num1 - self.num2
-        
         # Display the generated problem
         self.displayProblem()
     
@@ -251,29 +350,34 @@ class MathsQuizGame:
         # Display current math problem with input field
         self.clear_frame()  # Clear previous widgets
         
+        self.question_started = time.perf_counter()  # Start timing this question
+        self.attempt_started = self.question_started  # First attempt starts now too
+        
         # Create header frame for difficulty and score display
         header_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
         header_frame.pack(fill='x', pady=20)
         
+        engine = self.engine
+        
         # Define difficulty display names and icons
-        diff_names = {"easy": "Easy", "moderate": "Moderate", "advanced": "Advanced"}
-        diff_icons = {"easy": "🌱", "moderate": "⚡", "advanced": "🔥"}
+        diff_names = {"easy": "Easy", "moderate": "Moderate", "advanced": "Advanced", ADAPTIVE: "Adaptive", CUSTOM: "Custom"}
+        diff_icons = {"easy": "🌱", "moderate": "⚡", "advanced": "🔥", ADAPTIVE: "🧠", CUSTOM: "🛠️"}
         
         # Create and pack difficulty label on left side
         diff_label = self.create_game_label(header_frame, 
-            f"{diff_icons[self.difficulty]} {diff_names[self.difficulty]} - Question {self.current_question}/10", 
+            f"{diff_icons[engine.difficulty]} {diff_names[engine.difficulty]} - Question {engine.current_question}/{engine.total_questions}", 
             16, True, 'primary')
         diff_label.pack(side=tk.LEFT)
         
         # Create and pack score label on right side
-        score_label = self.create_game_label(header_frame, f"💰 Score: {self.score}", 16, True, 'warning')
+        score_label = self.create_game_label(header_frame, f"💰 Score: {engine.score}", 16, True, 'warning')
         score_label.pack(side=tk.RIGHT)
         
         # Display combo streak if active
-        if self.combo > 1:
+        if engine.combo > 1:
             combo_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
             combo_frame.pack(pady=10)
-            combo_label = self.create_game_label(combo_frame, f"🔥 COMBO x{self.combo}!", 18, True, 'accent')
+            combo_label = self.create_game_label(combo_frame, f"🔥 COMBO x{engine.combo}!", 18, True, 'accent')
             combo_label.pack()
         
         # Create frame for the math problem display
@@ -281,8 +385,8 @@ class MathsQuizGame:
         question_frame.pack(pady=40)
         
         # Format and display the math problem
-        question_text = f"{self.num1} {self.operation} {self.num2} = ?"
-        question_label = tk.Label(question_frame, text=question_text, font=('Arial', 48, 'bold'),
+        question_text = f"{engine.question_text} = ?"
+        question_label = ui.label(question_frame, text=question_text, font=('Arial', 48, 'bold'),
             bg=self.colors['primary'], fg=self.colors['bg'], padx=50, pady=30, relief='ridge', borderwidth=6)
         question_label.pack()
         
@@ -295,7 +399,7 @@ class MathsQuizGame:
         input_label.pack(side=tk.LEFT, padx=20)
         
         # Create and pack answer entry field
-        self.answer_entry = tk.Entry(input_frame, font=('Arial', 24, 'bold'), width=15, justify='center',
+        self.answer_entry = ui.entry(input_frame, font=('Arial', 24, 'bold'), width=15, justify='center',
             relief='solid', borderwidth=4)
         self.answer_entry.pack(side=tk.LEFT, padx=20)
         self.answer_entry.bind('<Return>', lambda e: self.check_answer())  # Bind Enter key to submit
@@ -306,7 +410,7 @@ class MathsQuizGame:
         submit_btn.pack(pady=20)
         
         # Create and pack attempt counter label
-        attempt_text = "First Attempt" if self.current_attempt == 1 else "Second Attempt"
+        attempt_text = "First Attempt" if self.engine.current_attempt == 1 else "Second Attempt"
         self.attempt_label = self.create_game_label(self.main_frame, attempt_text, 14, False, 'secondary')
         self.attempt_label.pack(pady=10)
         
@@ -316,13 +420,13 @@ class MathsQuizGame:
     
     def confirm_quit_to_difficulty(self):
         # Confirm before quitting to difficulty selection
-        if messagebox.askyesno("Quit to Difficulty Selection?", "Are you sure you want to return to difficulty selection? Your current progress will be lost."):
+        if messagebox.askyesno("Quit to Difficulty Selection?", "Are you sure you want to return to difficulty selection? Your current progress will be lost.", parent=self.root):
             self.showDifficultyLevel()  # Return to difficulty selection
     
     def update_attempt_display(self):
         # Update attempt counter display
         if self.attempt_label:
-            attempt_text = "First Attempt" if self.current_attempt == 1 else "Second Attempt"
+            attempt_text = "First Attempt" if self.engine.current_attempt == 1 else "Second Attempt"
             self.attempt_label.config(text=attempt_text)  # Update label text
     
     def check_answer(self):
@@ -330,51 +434,73 @@ class MathsQuizGame:
         try:
             user_answer = int(self.answer_entry.get())  # Convert input to integer
         except ValueError:
-            messagebox.showerror("Invalid Input", "🚫 Please enter a valid number!")  # Show error for invalid input
+            messagebox.showerror("Invalid Input", "🚫 Please enter a valid number!", parent=self.root)  # Show error for invalid input
             return
         
-        # Check if answer is correct
-        self.isCorrect(user_answer == self.correct_answer)
+        # Check if answer is correct and record how long it took
+        correct = self.engine.is_correct(user_answer)
+        self.record_latency(correct)
+        self.isCorrect(correct)
+    
+    def record_latency(self, correct, engine=None):
+        # Log this attempt's latency and feed it to the adaptive difficulty
+        engine = engine or self.engine
+        seconds = time.perf_counter() - self.attempt_started
+        digits = engine.largest_operand_digits()
+        self.telemetry.write(self.player, engine.difficulty, engine.current_question,
+            engine.current_attempt, digits, seconds, correct)
+        engine.observe(seconds, correct)
+        return seconds
     
     def isCorrect(self, correct):
         # Handle correct/incorrect answers with scoring
-        if correct:
-            # Calculate points based on attempt number
-            points = 10 if self.current_attempt == 1 else 5
-            self.score += points  # Add points to score
-            self.combo += 1  # Increment combo counter
-            self.max_combo = max(self.max_combo, self.combo)  # Update max combo
+        engine = self.engine
+        attempt = engine.current_attempt  # Attempt being answered, before the engine moves on
+        outcome, points = engine.submit(correct)
+        
+        if outcome == CORRECT:
+            self.max_combo = max(self.max_combo, engine.combo)  # Update session max combo
+            self.menu_stats_dirty = True
+            self.record_question_time(attempt, points)
             
             # Show appropriate success message
-            if self.current_attempt == 1:
-                if self.combo > 3:
-                    messagebox.showinfo("Perfect! 🎯", f"🔥 COMBO x{self.combo}! +{points} points")
+            if attempt == 1:
+                if engine.combo > 3:
+                    messagebox.showinfo("Perfect! 🎯", f"🔥 COMBO x{engine.combo}! +{points} points", parent=self.root)
                 else:
-                    messagebox.showinfo("Excellent! 🎉", f"Perfect! +{points} points")
+                    messagebox.showinfo("Excellent! 🎉", f"Perfect! +{points} points", parent=self.root)
             else:
-                messagebox.showinfo("Good! 👍", f"Nice recovery! +{points} points")
+                messagebox.showinfo("Good! 👍", f"Nice recovery! +{points} points", parent=self.root)
             
             # Move to next question
             self.next_question()
+        elif outcome == RETRY:
+            # Allow second attempt
+            messagebox.showerror("Wrong! ❌", "💥 Incorrect! You have one more try!", parent=self.root)
+            self.attempt_started = time.perf_counter()  # Second attempt starts once the message is closed
+            self.answer_entry.delete(0, tk.END)  # Clear entry field
+            self.answer_entry.focus()  # Refocus on entry field
+            self.update_attempt_display()  # Update attempt display
         else:
-            self.combo = 0  # Reset combo on incorrect answer
-            
-            if self.current_attempt == 1:
-                # Allow second attempt
-                self.current_attempt = 2
-                messagebox.showerror("Wrong! ❌", "💥 Incorrect! You have one more try!")
-                self.answer_entry.delete(0, tk.END)  # Clear entry field
-                self.answer_entry.focus()  # Refocus on entry field
-                self.update_attempt_display()  # Update attempt display
-            else:
-                # Show correct answer and move to next question
-                messagebox.showerror("Failed! 💀", f"❌ The correct answer was {self.correct_answer}\nKeep going adventurer!")
-                self.next_question()
+            # Show correct answer and move to next question
+            self.record_question_time(attempt, 0)
+            messagebox.showerror("Failed! 💀", f"❌ The correct answer was {engine.correct_answer}\nKeep going adventurer!", parent=self.root)
+            self.next_question()
+    
+    def record_question_time(self, attempts, points):
+        # Store how long the current question took to resolve
+        seconds = time.perf_counter() - self.question_started
+        self.question_times.append((self.engine.current_question, attempts, round(seconds, 3), points))
     
     def displayResults(self):
         # Show final results with score and achievements
         self.clear_frame()  # Clear previous widgets
         
+        # Save the finished game (written in the background)
+        engine = self.engine
+        self.scores.record_game(self.player, engine.difficulty, engine.score, engine.max_combo, self.question_times)
+        self.menu_stats_dirty = True
+        
         # Create and pack results title
         title_label = self.create_game_label(self.main_frame, "🏆 QUEST COMPLETE!", 28, True, 'primary')
         title_label.pack(pady=30)
@@ -384,25 +510,25 @@ class MathsQuizGame:
         score_frame.pack(pady=20)
         
         # Create and pack final score display
-        score_text = f"Final Score: {self.score}/100"
-        score_label = tk.Label(score_frame, text=score_text, font=('Arial', 24, 'bold'),
+        score_text = f"Final Score: {engine.score}/100"
+        score_label = ui.label(score_frame, text=score_text, font=('Arial', 24, 'bold'),
             bg=self.colors['accent'], fg=self.colors['text'], padx=30, pady=20, relief='ridge', borderwidth=6)
         score_label.pack()
         
         # Calculate and display grade
         grade = self.calculate_grade()
         grade_colors = {"A+": "#FFD700", "A": "#FFD700", "B": "#C0C0C0", "C": "#CD7F32", "D": "#8B4513", "F": "#8B0000"}
-        grade_label = tk.Label(self.main_frame, text=f"Rank: {grade}", font=('Arial', 20, 'bold'),
+        grade_label = ui.label(self.main_frame, text=f"Rank: {grade}", font=('Arial', 20, 'bold'),
             bg=self.colors['bg'], fg=grade_colors.get(grade.split()[0], "#FFFFFF"))
         grade_label.pack(pady=15)
         
         # Create and pack statistics display
-        stats_text = f"🔥 Max Combo: x{self.max_combo}\n⚔️ Questions: {self.total_questions}\n💰 Total Points: {self.score}"
+        stats_text = f"🔥 Max Combo: x{self.max_combo}\n⚔️ Questions: {engine.total_questions}\n💰 Total Points: {engine.score}"
         stats_label = self.create_game_label(self.main_frame, stats_text, 16, False, 'secondary')
         stats_label.pack(pady=15)
         
         # Get and display achievement message
-        achievement = self.get_achievement_message(self.score)
+        achievement = self.get_achievement_message(engine.score)
         achievement_label = self.create_game_label(self.main_frame, achievement, 16, True, 'warning')
         achievement_label.pack(pady=15)
         
@@ -423,50 +549,351 @@ class MathsQuizGame:
     
     def prompt_play_again(self):
         # Ask user if they want to play another game
-        play_again = messagebox.askyesno("Play Again?", f"Your final score is {self.score}/100!\n\nWould you like to play again?")
+        play_again = messagebox.askyesno("Play Again?", f"Your final score is {self.engine.score}/100!\n\nWould you like to play again?", parent=self.root)
         if play_again:
             self.displayMenu()  # Return to main menu
     
     def calculate_grade(self):
         # Calculate letter grade based on final score
-        if self.score > 90: 
-            return "A+ ⭐⭐⭐"
-        elif self.score >= 80: 
-            return "A ⭐⭐"
-        elif self.score >= 70: 
-            return "B ⭐"
-        elif self.score >= 60: 
-            return "C 🛡️"
-        elif self.score >= 50: 
-            return "D ⚔️"
-        else: 
-            return "F 💀"
+        return calculate_grade(self.engine.score)
     
     def get_achievement_message(self, score):
         # Generate achievement message based on performance
-        if score > 90: 
-            return "🎖️ LEGENDARY MATH HERO! 🎖️"
-        elif score >= 80: 
-            return "🏅 EPIC ADVENTURER! 🏅"
-        elif score >= 70: 
-            return "⭐ BRAVE WARRIOR! ⭐"
-        elif score >= 60: 
-            return "🛡️ NOBLE KNIGHT! 🛡️"
-        elif score >= 50: 
-            return "⚔️ COURAGEOUS TRAVELER! ⚔️"
-        else: 
-            return "💪 KEEP PRACTICING, YOUNG APPRENTICE! 💪"
+        return get_achievement_message(score)
+    
+    def showSpeedModes(self):
+        # Show speed run variants, each playable at every fixed difficulty
+        self.clear_frame()  # Clear existing widgets
+        
+        # Create back button to return to main menu
+        back_btn = self.create_game_button(self.main_frame, "← Back to Menu", self.displayMenu, 'accent', 15, 12)
+        back_btn.pack(anchor='nw', pady=10)
+        
+        # Create and pack speed run title
+        title_label = self.create_game_label(self.main_frame, "⏱️ SPEED RUN", 28, True, 'primary')
+        title_label.pack(pady=20)
+        
+        # Define variants with names and descriptions
+        variants = [
+            ("sprint", "⚡ 60 Second Sprint", "Answer as many questions as you can in 60 seconds"),
+            ("clock", "⏳ Beat the Clock", "Answer 10 questions before 90 seconds run out"),
+        ]
+        
+        # Create a row of difficulty buttons for each variant
+        for variant, name, desc in variants:
+            variant_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+            variant_frame.pack(pady=15)
+            self.create_game_label(variant_frame, name, 18, True, 'warning').pack()
+            self.create_game_label(variant_frame, desc, 12, False, 'text').pack(pady=5)
+            buttons_frame = tk.Frame(variant_frame, bg=self.colors['bg'])
+            buttons_frame.pack()
+            for diff_value, diff_name, color in (("easy", "🌱 Easy", 'primary'), ("moderate", "⚡ Moderate", 'warning'), ("advanced", "🔥 Advanced", 'danger')):
+                diff_btn = self.create_game_button(buttons_frame, diff_name,
+                    lambda v=variant, d=diff_value: self.start_speed_run(v, d), color, 15, 12)
+                diff_btn.pack(side=tk.LEFT, padx=10)
+        
+        # One attempt per question in speed runs
+        self.create_game_label(self.main_frame, "One attempt per question • 10 points per correct answer", 12, False, 'secondary').pack(pady=20)
+    
+    def start_speed_run(self, variant, difficulty):
+        # Start a timed speed run with its own engine and question buffer
+        seconds, questions = SPEED_VARIANTS[variant]
+        self.speed_run = (variant, difficulty)
+        self.speed_engine = QuizEngine(total_questions=questions, max_attempts=1)
+        self.speed_engine.start(difficulty)
+        self.speed_times = []  # (question, attempts, seconds, points) for this run
+        self.speed_answered = 0  # Questions answered
+        self.speed_correct = 0  # Questions answered correctly
+        
+        # Generate questions up front so the clock never waits on the generator
+        self.question_buffer = QuestionBuffer(self.speed_engine, self.root)
+        self.question_buffer.fill()
+        
+        self.displaySpeedRun(seconds)
+        self.countdown = Countdown(self.root, seconds, self.update_timer, self.finish_speed_run)
+        self.next_speed_question()
+        self.countdown.start()
+    
+    def displaySpeedRun(self, seconds):
+        # Build the speed run screen once; each question only reconfigures its labels
+        self.clear_frame()  # Clear previous widgets
+        
+        # Create header frame for timer and score
+        header_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        header_frame.pack(fill='x', pady=20)
+        
+        self.timer_text = ""  # Last text shown on the timer, so unchanged ticks skip reconfiguring
+        self.timer_label = self.create_game_label(header_frame, f"⏱️ {seconds:.1f}s", 24, True, 'primary')
+        self.timer_label.pack(side=tk.LEFT)
+        
+        self.speed_score_label = self.create_game_label(header_frame, "💰 Score: 0", 16, True, 'warning')
+        self.speed_score_label.pack(side=tk.RIGHT)
+        
+        # Create the question display
+        self.speed_question_label = ui.label(self.main_frame, text="", font=('Arial', 48, 'bold'),
+            bg=self.colors['primary'], fg=self.colors['bg'], padx=50, pady=30, relief='ridge', borderwidth=6)
+        self.speed_question_label.pack(pady=40)
+        
+        # Create answer entry field
+        self.speed_entry = ui.entry(self.main_frame, font=('Arial', 24, 'bold'), width=15, justify='center',
+            relief='solid', borderwidth=4)
+        self.speed_entry.pack(pady=20)
+        self.speed_entry.bind('<Return>', lambda e: self.submit_speed_answer())  # Bind Enter key to submit
+        self.speed_entry.focus()
+        
+        # Inline feedback instead of message boxes, which would stall the clock
+        self.feedback_label = self.create_game_label(self.main_frame, "Press Enter to submit", 16, True, 'secondary')
+        self.feedback_label.pack(pady=10)
+        
+        # Create menu return button
+        menu_btn = self.create_game_button(self.main_frame, "← Back to Menu", self.displayMenu, 'accent', 15, 12)
+        menu_btn.pack(pady=20)
+    
+    def update_timer(self, remaining):
+        # Countdown tick: reconfigure only the timer label, and only when its text changes
+        text = f"⏱️ {remaining:.1f}s"
+        if text != self.timer_text:
+            self.timer_text = text
+            self.timer_label.config(text=text, fg=self.colors['danger'] if remaining < 10 else self.colors['primary'])
+    
+    def next_speed_question(self):
+        # Show the next buffered question, or finish when the question limit is reached
+        if not self.speed_engine.next_question(self.question_buffer.take()):
+            self.finish_speed_run()
+            return
+        engine = self.speed_engine
+        self.speed_question_label.config(text=f"{engine.question_text} = ?")
+        self.attempt_started = time.perf_counter()
+    
+    def submit_speed_answer(self):
+        # Score the answer inline and move straight on to the next question
+        try:
+            user_answer = int(self.speed_entry.get())
+        except ValueError:
+            self.feedback_label.config(text="🚫 Please enter a valid number!", fg=self.colors['warning'])
+            return
+        
+        engine = self.speed_engine
+        correct = engine.is_correct(user_answer)
+        seconds = self.record_latency(correct, engine)
+        outcome, points = engine.submit(correct)
+        self.speed_times.append((engine.current_question, 1, round(seconds, 3), points))
+        self.speed_answered += 1
+        
+        if correct:
+            self.speed_correct += 1
+            self.feedback_label.config(text=f"✅ +{points}  🔥 x{engine.combo}", fg=self.colors['primary'])
+        else:
+            self.feedback_label.config(text=f"❌ {engine.question_text} = {engine.correct_answer}",
+                fg=self.colors['danger'])
+        self.speed_score_label.config(text=f"💰 Score: {engine.score}")
+        self.speed_entry.delete(0, tk.END)
+        self.next_speed_question()
+    
+    def finish_speed_run(self):
+        # Stop the clock, save the run and show the results
+        elapsed = self.countdown.seconds - self.countdown.remaining() if self.countdown else 0
+        if self.countdown:
+            self.countdown.cancel()
+            self.countdown = None
+        
+        variant, difficulty = self.speed_run
+        engine = self.speed_engine
+        self.max_combo = max(self.max_combo, engine.max_combo)
+        self.scores.record_game(self.player, f"{variant}:{difficulty}", engine.score, engine.max_combo, self.speed_times)
+        self.menu_stats_dirty = True
+        self.displaySpeedResults(elapsed)
+    
+    def displaySpeedResults(self, elapsed):
+        # Show speed run results without a blocking prompt
+        self.clear_frame()
+        engine = self.speed_engine
+        
+        title_label = self.create_game_label(self.main_frame, "⏱️ TIME!", 28, True, 'primary')
+        title_label.pack(pady=30)
+        
+        score_label = ui.label(self.main_frame, text=f"Score: {engine.score}", font=('Arial', 24, 'bold'),
+            bg=self.colors['accent'], fg=self.colors['text'], padx=30, pady=20, relief='ridge', borderwidth=6)
+        score_label.pack(pady=20)
+        
+        # Create and pack statistics display
+        accuracy = self.speed_correct / self.speed_answered if self.speed_answered else 0
+        per_minute = self.speed_answered * 60 / elapsed if elapsed else 0
+        stats_text = (f"⚔️ Answered: {self.speed_answered}\n✅ Correct: {self.speed_correct} ({accuracy:.0%})\n"
+            f"⚡ Pace: {per_minute:.1f} per minute\n🔥 Max Combo: x{engine.max_combo}")
+        stats_label = self.create_game_label(self.main_frame, stats_text, 16, False, 'secondary')
+        stats_label.pack(pady=15)
+        
+        # Create frame for action buttons
+        button_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        button_frame.pack(pady=25)
+        again_btn = self.create_game_button(button_frame, "🔄 Run Again", lambda: self.start_speed_run(*self.speed_run), 'primary', 20, 14)
+        again_btn.pack(side=tk.LEFT, padx=15)
+        menu_btn = self.create_game_button(button_frame, "← Back to Menu", self.displayMenu, 'accent', 20, 14)
+        menu_btn.pack(side=tk.LEFT, padx=15)
+    
+    def join_lan_game(self):
+        # Ask for the server address and connect to a classroom game
+        from tkinter import simpledialog
+        from lan_client import DEFAULT_PORT, LanQuizClient, parse_address  # Networking loads only when needed
+        address = simpledialog.askstring("Join LAN Game", "Server address (host:port):",
+            initialvalue=f"127.0.0.1:{DEFAULT_PORT}", parent=self.root)
+        if not address:
+            return
+        try:
+            host, port = parse_address(address)
+            client = LanQuizClient(host, port, self.player)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Connection Failed", f"Could not connect to {address}:\n{e}", parent=self.root)
+            return
+        self.displayLanGame(address)
+        self.lan_client = client
+        self.poll_lan()
+    
+    def displayLanGame(self, address):
+        # Build the LAN game screen once; server messages only reconfigure its labels
+        self.clear_frame()  # Clear previous widgets
+        
+        # Create header frame for status and score
+        header_frame = tk.Frame(self.main_frame, bg=self.colors['bg'])
+        header_frame.pack(fill='x', pady=20)
+        
+        self.lan_status_label = self.create_game_label(header_frame, f"🌐 Connecting to {address}...", 16, True, 'secondary')
+        self.lan_status_label.pack(side=tk.LEFT)
+        
+        self.lan_score_label = self.create_game_label(header_frame, "💰 Score: 0", 16, True, 'warning')
+        self.lan_score_label.pack(side=tk.RIGHT)
+        
+        # Create the question display
+        self.lan_question_label = ui.label(self.main_frame, text="Waiting for the round to start...",
+            font=('Arial', 36, 'bold'), bg=self.colors['primary'], fg=self.colors['bg'], padx=50, pady=30,
+            relief='ridge', borderwidth=6)
+        self.lan_question_label.pack(pady=30)
+        
+        # Create answer entry field
+        self.lan_entry = ui.entry(self.main_frame, font=('Arial', 24, 'bold'), width=15, justify='center',
+            relief='solid', borderwidth=4)
+        self.lan_entry.pack(pady=15)
+        self.lan_entry.bind('<Return>', lambda e: self.submit_lan_answer())  # Bind Enter key to submit
+        self.lan_entry.focus()
+        
+        # Inline feedback, since a message box would block polling
+        self.lan_feedback_label = self.create_game_label(self.main_frame, "Press Enter to submit", 16, True, 'secondary')
+        self.lan_feedback_label.pack(pady=10)
+        
+        # Live leaderboard pushed by the server
+        self.lan_board_label = self.create_game_label(self.main_frame, "", 13, False, 'text')
+        self.lan_board_label.config(justify='left')
+        self.lan_board_label.pack(pady=10)
+        
+        # Create leave button
+        leave_btn = self.create_game_button(self.main_frame, "← Leave Game", self.displayMenu, 'accent', 15, 12)
+        leave_btn.pack(pady=20)
+    
+    def poll_lan(self):
+        # Apply every message the reader thread has queued, then check again shortly
+        self.lan_poll = None
+        client = self.lan_client
+        while client is self.lan_client and not client.messages.empty():
+            self.handle_lan_message(client.messages.get_nowait())
+        if client is self.lan_client:
+            self.lan_poll = self.root.after(50, self.poll_lan)
+    
+    def handle_lan_message(self, message):
+        # Update the LAN screen for one server message
+        kind = message.get("type")
+        if kind == "welcome":
+            self.lan_status_label.config(text=f"🌐 Joined as {message['name']} • {message['players']} players")
+        elif kind == "lobby":
+            self.lan_status_label.config(text=f"🌐 {message['players']} players • next round in {message['starts_in']:.0f}s")
+        elif kind == "round":
+            self.lan_status_label.config(text=f"🌐 Round {message['round']} • {message['difficulty'].title()}")
+            self.lan_score_label.config(text="💰 Score: 0")
+        elif kind == "question":
+            self.lan_question = (message["round"], message["question"])
+            self.lan_question_label.config(text=f"{message['text']} = ?")
+            self.lan_feedback_label.config(text=f"Question {message['question']} of {message['of']} • "
+                f"{message['time']:.0f}s to answer", fg=self.colors['secondary'])
+            self.lan_entry.delete(0, tk.END)
+        elif kind == "result":
+            outcome = message["outcome"]
+            if outcome == CORRECT:
+                self.lan_feedback_label.config(text=f"✅ +{message['points']}  🔥 x{message['combo']}", fg=self.colors['primary'])
+            elif outcome == RETRY:
+                self.lan_feedback_label.config(text="❌ Not quite - one more try!", fg=self.colors['warning'])
+            else:
+                self.lan_feedback_label.config(text=f"❌ The answer was {message['correct_answer']}", fg=self.colors['danger'])
+            if outcome != RETRY:
+                self.lan_question = None  # Wait for the next question
+            self.lan_score_label.config(text=f"💰 Score: {message['score']}")
+        elif kind in ("leaderboard", "final"):
+            title = "🏆 Final standings" if kind == "final" else f"🏆 Live leaderboard ({message['players']} players)"
+            lines = [title] + [f"{rank}. {name} - {score}" for rank, (name, score, _) in enumerate(message["top"], 1)]
+            self.lan_board_label.config(text="\n".join(lines))
+        elif kind == "placing":
+            self.lan_question_label.config(text=f"You placed {message['rank']} of {message['of']}!")
+            self.lan_feedback_label.config(text="Next round starts soon", fg=self.colors['secondary'])
+        elif kind == "disconnected":
+            self.lan_client = None
+            self.lan_question = None
+            self.lan_status_label.config(text="🌐 Disconnected from server", fg=self.colors['danger'])
+    
+    def submit_lan_answer(self):
+        # Send the typed answer for the open question
+        if not self.lan_client or not self.lan_question:
+            return
+        try:
+            user_answer = int(self.lan_entry.get())
+        except ValueError:
+            self.lan_feedback_label.config(text="🚫 Please enter a valid number!", fg=self.colors['warning'])
+            return
+        self.lan_client.answer(*self.lan_question, user_answer)
+        self.lan_entry.delete(0, tk.END)
+    
+    def leave_lan_game(self):
+        # Disconnect from the server and stop polling
+        if self.lan_poll is not None:
+            self.root.after_cancel(self.lan_poll)
+            self.lan_poll = None
+        self.lan_client.close()
+        self.lan_client = None
+        self.lan_question = None
     
     def confirm_quit(self):
         # Confirm before exiting the game
-        if messagebox.askyesno("Exit Game?", "Are you sure you want to exit the Math Quest Adventure?"):
-            self.root.quit()  # Close the application
+        if messagebox.askyesno("Exit Game?", "Are you sure you want to exit the Math Quest Adventure?", parent=self.root):
+            self.root.destroy()  # Close the game window (and the application when run standalone)
+    
+    def close(self):
+        # Stop timers and connections, then flush scores and latency records (safe to call twice)
+        if self.closed:
+            return
+        self.closed = True
+        if self.countdown:
+            self.countdown.cancel()
+            self.countdown = None
+        if self.lan_client:
+            self.leave_lan_game()
+        self.scores.close()  # Flush any scores still being written
+        self.telemetry.close()  # Flush buffered latency records
+
+def launch(master):
+    # Open the game in its own window on an existing Tk root (used by the portfolio launcher)
+    window = tk.Toplevel(master)
+    app = MathsQuizGame(window)
+    window.bind('<Destroy>', lambda e: app.close() if e.widget is window else None)
+    return window
 
 def main():
     # Initialize and run the game application
     root = tk.Tk()  # Create main Tkinter window
+    root.withdraw()  # Show the splash while the game is set up
+    splash = ui.Splash(root, "🏰 Loading Math Quest...", STARTED)
     app = MathsQuizGame(root)  # Create game instance
+    splash.close()
+    root.deiconify()
     root.mainloop()  # Start the GUI event loop
+    app.close()  # Flush scores and latency records
 
 if __name__ == "__main__":
     main()  
\ No newline at end of file
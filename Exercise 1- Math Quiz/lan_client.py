@@ -0,0 +1,61 @@
+import json
+import queue
+import socket
+import threading
+from quiz_server import DEFAULT_PORT, encode
+
+
+def parse_address(text):
+    # Split "host" or "host:port" into (host, port)
+    host, _, port = text.strip().rpartition(":")
+    if not host:
+        return port or "127.0.0.1", DEFAULT_PORT
+    return host, int(port)
+
+
+class LanQuizClient:
+    # Blocking socket connection to a quiz server; messages arrive on a queue the Tk thread polls
+    def __init__(self, host, port, name, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.settimeout(None)  # Reader thread blocks until the server sends something
+        self.messages = queue.Queue()  # Decoded server messages, plus {"type": "disconnected"} at the end
+        self.closed = False
+        self.reader = threading.Thread(target=self._read_loop, daemon=True)
+        self.reader.start()
+        self.send({"type": "join", "name": name})
+
+    def send(self, message):
+        # Send one message; connection errors surface as a disconnect on the queue
+        if self.closed:
+            return
+        try:
+            self.sock.sendall(encode(message))
+        except OSError:
+            self.close()
+
+    def answer(self, round_number, question, answer):
+        # Submit an answer to the open question
+        self.send({"type": "answer", "round": round_number, "question": question, "answer": answer})
+
+    def close(self):
+        # Close the connection (the reader thread then reports the disconnect)
+        if not self.closed:
+            self.closed = True
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+
+    def _read_loop(self):
+        # Read JSON lines from the server until the connection ends
+        try:
+            with self.sock.makefile("r", encoding="utf-8") as stream:
+                for line in stream:
+                    try:
+                        self.messages.put(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        self.messages.put({"type": "disconnected"})
@@ -0,0 +1,95 @@
+# Registry of problem generators; each one builds a question in constant time
+
+# Symbol -> generator(rng, low, high) returning (tokens, answer)
+PROBLEM_TYPES = {}
+
+# Operators that bind tighter than + and -
+TERM_OPERATORS = ('×', '÷')
+
+
+def register_problem(symbol):
+    # Decorator adding a generator to the registry under its operator symbol
+    def decorator(generator):
+        PROBLEM_TYPES[symbol] = generator
+        return generator
+    return decorator
+
+
+@register_problem('+')
+def addition(rng, low, high):
+    # a + b
+    a, b = rng.randint(low, high), rng.randint(low, high)
+    return [a, '+', b], a + b
+
+
+@register_problem('-')
+def subtraction(rng, low, high):
+    # a - b, ordered so the answer is never negative
+    a, b = rng.randint(low, high), rng.randint(low, high)
+    if a < b:
+        a, b = b, a  # Swap numbers
+    return [a, '-', b], a - b
+
+
+@register_problem('×')
+def multiplication(rng, low, high):
+    # a × b
+    a, b = rng.randint(low, high), rng.randint(low, high)
+    return [a, '×', b], a * b
+
+
+@register_problem('÷')
+def division(rng, low, high):
+    # (divisor × quotient) ÷ divisor, so the answer is always a whole number without retrying
+    divisor = rng.randint(max(low, 1), max(high, 1))
+    quotient = rng.randint(low, high)
+    return [divisor * quotient, '÷', divisor], quotient
+
+
+def generate_expression(rng, low, high, operations, operands):
+    # Build an expression with `operands` numbers using the given operators, honouring precedence
+    tokens = [rng.randint(low, high)]
+    term_start = 0  # Index of the first number in the current ×/÷ term
+    for _ in range(operands - 1):
+        op = rng.choice(operations)
+        if op == '÷':
+            # Scale the term's first number by the divisor so the running term divides exactly
+            divisor = rng.randint(max(low, 1), max(high, 1))
+            tokens[term_start] *= divisor
+            tokens += [op, divisor]
+        else:
+            if op not in TERM_OPERATORS:
+                term_start = len(tokens) + 1  # A + or - starts a new term
+            tokens += [op, rng.randint(low, high)]
+
+    answer = evaluate(tokens)
+    if answer < 0:
+        # Turning every top-level minus into a plus leaves a sum of non-negative terms
+        tokens = ['+' if t == '-' else t for t in tokens]
+        answer = evaluate(tokens)
+    return tokens, answer
+
+
+def evaluate(tokens):
+    # Evaluate number/operator tokens with ×/÷ before +/-, without eval()
+    total = 0
+    sign = 1
+    term = tokens[0]
+    for i in range(1, len(tokens), 2):
+        op, value = tokens[i], tokens[i + 1]
+        if op == '×':
+            term *= value
+        elif op == '÷':
+            term, remainder = divmod(term, value)
+            if remainder:
+                raise ValueError(f"{term * value + remainder} ÷ {value} is not a whole number")
+        else:
+            total += sign * term
+            sign = 1 if op == '+' else -1
+            term = value
+    return total + sign * term
+
+
+def format_problem(tokens):
+    # Text shown to the player, e.g. "12 × 3 + 4"
+    return " ".join(str(t) for t in tokens)
@@ -0,0 +1,337 @@
+import os
+import random
+import sys
+import time
+from collections import Counter
+from telemetry import LatencyRing
+
+# Grade boundaries are shared with the Student Manager from the repository
+# root; importers put it on the path, a command line run adds it here
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import grading
+from problems import PROBLEM_TYPES, generate_expression, format_problem
+
+# Operand digit counts for each difficulty level
+DIFFICULTY_DIGITS = {
+    "easy": 1,  # Single digit numbers (0-9)
+    "moderate": 2,  # Double digit numbers (10-99)
+    "advanced": 4,  # Four digit numbers (1000-9999)
+}
+
+TOTAL_QUESTIONS = 10  # Questions per game
+FIRST_ATTEMPT_POINTS = 10  # Points for a correct first attempt
+SECOND_ATTEMPT_POINTS = 5  # Points for a correct second attempt
+
+ADAPTIVE = "adaptive"  # Difficulty whose operand range follows the player's recent answers
+CUSTOM = "custom"  # Difficulty with a player-chosen digit count
+
+DEFAULT_OPERATIONS = ('+', '-')  # Addition and subtraction, as in the original quiz
+
+# Outcomes returned by QuizEngine.submit
+CORRECT = "correct"
+RETRY = "retry"
+FAILED = "failed"
+
+
+def calculate_grade(score):
+    # Letter grade for a final score, from the "quiz" scheme in grading.json
+    return grading.scheme("quiz").grade(score)
+
+
+def get_achievement_message(score):
+    # Achievement message for a final score, from the "quiz.achievement" scheme in grading.json
+    return grading.scheme("quiz.achievement").grade(score)
+
+
+def digit_range(digits):
+    # Operand range for numbers with the given digit count (1 digit includes 0)
+    if digits <= 1:
+        return 0, 9
+    return 10 ** (digits - 1), 10 ** digits - 1
+
+
+class AdaptiveRange:
+    # Picks the operand digit count from recent answer latency and accuracy
+    __slots__ = ("ring", "owns_ring", "digits", "min_digits", "max_digits", "window", "since_change")
+
+    def __init__(self, ring=None, digits=1, min_digits=1, max_digits=6, window=5):
+        self.ring = ring or LatencyRing()  # Recent answers; a ring passed in is filled by its owner (the GUI's TelemetryLog)
+        self.owns_ring = ring is None  # True if observe() has to add answers to the ring itself
+        self.digits = digits  # Current operand digit count
+        self.min_digits = min_digits
+        self.max_digits = max_digits
+        self.window = window  # Answers considered per decision
+        self.since_change = 0  # Answers seen since the digit count last moved
+
+    def observe(self, seconds, correct):
+        # Record one answer and re-evaluate the range once a full window has been seen
+        if self.owns_ring:
+            self.ring.append(seconds, correct)
+        self.since_change += 1
+        if self.since_change >= self.window:
+            self.adjust()
+
+    def adjust(self):
+        # Step up when fast and accurate, step down when slow or struggling
+        accuracy = self.ring.accuracy(self.window)
+        latency = self.ring.mean_latency(self.window)
+        target = 3.0 + 2.0 * self.digits  # Seconds a comfortable answer takes at this size
+        if accuracy >= 0.8 and latency <= target and self.digits < self.max_digits:
+            self.digits += 1
+            self.since_change = 0
+        elif (accuracy < 0.5 or latency > 2 * target) and self.digits > self.min_digits:
+            self.digits -= 1
+            self.since_change = 0
+
+    def operand_range(self):
+        # (low, high) for the current digit count
+        return digit_range(self.digits)
+
+
+# Operand ranges for each difficulty level
+DIFFICULTY_RANGES = {name: digit_range(digits) for name, digits in DIFFICULTY_DIGITS.items()}
+
+
+class QuizEngine:
+    # Game state and scoring for one player, with no Tk dependency
+    __slots__ = ("rng", "difficulty", "score", "current_question", "total_questions", "current_attempt",
+                 "num1", "num2", "operation", "correct_answer", "combo", "max_combo", "adaptive", "max_attempts",
+                 "operations", "operands", "digits", "tokens", "ring")
+
+    def __init__(self, total_questions=TOTAL_QUESTIONS, rng=None, max_attempts=2,
+                 operations=DEFAULT_OPERATIONS, operands=2, ring=None):
+        self.rng = rng or random.Random()  # Own generator so simulations can be seeded
+        self.difficulty = None  # Store current difficulty level
+        self.score = 0  # Player's current score
+        self.current_question = 0  # Track current question number
+        self.total_questions = total_questions  # Total questions per game (None = no limit)
+        self.max_attempts = max_attempts  # Attempts allowed per question
+        self.current_attempt = 1  # Track attempt count per question (1 or 2)
+        self.num1 = 0  # First number in math problem
+        self.num2 = 0  # Second number in math problem
+        self.operation = ''  # Math operation (first operator for longer expressions)
+        self.operations = tuple(operations)  # Registered operator symbols to draw from
+        self.operands = operands  # Numbers per question (more than 2 builds an expression)
+        self.digits = None  # Operand digit count for CUSTOM games
+        self.tokens = []  # Current question as numbers and operator symbols
+        self.correct_answer = 0  # Store correct answer for current problem
+        self.combo = 0  # Track consecutive correct answers
+        self.max_combo = 0  # Highest combo in this game
+        self.adaptive = None  # AdaptiveRange, created on the first adaptive game
+        self.ring = ring  # LatencyRing the caller fills with every answer, or None for the engine's own
+
+    def operand_range(self, difficulty=None):
+        # (low, high) operand range for a difficulty level
+        difficulty = difficulty or self.difficulty
+        if difficulty == ADAPTIVE:
+            return self.adaptive.operand_range()
+        if difficulty == CUSTOM:
+            return digit_range(self.digits)
+        return DIFFICULTY_RANGES[difficulty]
+
+    def randomInt(self, difficulty):
+        # Generate random numbers based on selected difficulty
+        low, high = self.operand_range(difficulty)
+        return self.rng.randint(low, high)
+
+    def decideOperation(self):
+        # Randomly choose one of the enabled operations
+        return self.rng.choice(self.operations)
+
+    def start(self, difficulty, digits=None):
+        # Start new game with selected difficulty (digits is required for CUSTOM)
+        self.difficulty = difficulty
+        self.digits = digits
+        self.score = 0
+        self.current_question = 0
+        self.combo = 0
+        self.max_combo = 0
+        if difficulty == ADAPTIVE and self.adaptive is None:
+            self.adaptive = AdaptiveRange(self.ring)  # Kept across games so the level carries over
+
+    def observe(self, seconds, correct):
+        # Feed one answer's latency to the adaptive range (ignored for fixed difficulties)
+        if self.difficulty == ADAPTIVE:
+            self.adaptive.observe(seconds, correct)
+
+    @property
+    def finished(self):
+        # True once every question has been asked and resolved
+        return self.total_questions is not None and self.current_question >= self.total_questions
+
+    def generate_question(self):
+        # Build one (tokens, answer) question for the current difficulty and operations
+        low, high = self.operand_range()
+        if self.operands > 2:
+            return generate_expression(self.rng, low, high, self.operations, self.operands)
+        return PROBLEM_TYPES[self.decideOperation()](self.rng, low, high)
+
+    def next_question(self, question=None):
+        # Move to the next question (generated now unless one is supplied); False when the game is over
+        if self.finished:
+            return False
+
+        self.current_question += 1  # Increment question counter
+        self.current_attempt = 1  # Reset attempts for new question
+        self.tokens, self.correct_answer = question or self.generate_question()
+        self.num1, self.operation, self.num2 = self.tokens[0], self.tokens[1], self.tokens[2]
+        return True
+
+    @property
+    def question_text(self):
+        # Current question as shown to the player
+        return format_problem(self.tokens)
+
+    def largest_operand_digits(self):
+        # Digit count of the biggest number in the current question
+        return max(len(str(abs(t))) for t in self.tokens[::2])
+
+    def is_correct(self, answer):
+        # Check an answer against the current question
+        return answer == self.correct_answer
+
+    def submit(self, correct):
+        # Score an answer; returns (outcome, points) where outcome is CORRECT, RETRY or FAILED
+        if correct:
+            points = FIRST_ATTEMPT_POINTS if self.current_attempt == 1 else SECOND_ATTEMPT_POINTS
+            self.score += points
+            self.combo += 1
+            self.max_combo = max(self.max_combo, self.combo)
+            return CORRECT, points
+
+        self.combo = 0  # Reset combo on incorrect answer
+        if self.current_attempt < self.max_attempts:
+            self.current_attempt += 1  # Allow another attempt
+            return RETRY, 0
+        return FAILED, 0
+
+    def grade(self):
+        # Letter grade for the current score
+        return calculate_grade(self.score)
+
+
+# SIMULATION
+class FixedAccuracy:
+    # Synthetic player who is right with a fixed probability on each attempt
+    __slots__ = ("p_first", "p_second")
+
+    def __init__(self, p_first, p_second):
+        self.p_first = p_first
+        self.p_second = p_second
+
+    def __call__(self, engine, rng):
+        p = self.p_first if engine.current_attempt == 1 else self.p_second
+        return rng.random() < p
+
+    def latency(self, engine, rng):
+        # Seconds taken to answer, independent of the question
+        return rng.uniform(2.0, 6.0)
+
+
+class DigitSkill:
+    # Synthetic player whose accuracy drops with every digit in the answer
+    __slots__ = ("base", "per_digit", "retry_bonus")
+
+    def __init__(self, base=0.98, per_digit=0.06, retry_bonus=0.1):
+        self.base = base
+        self.per_digit = per_digit
+        self.retry_bonus = retry_bonus
+
+    def __call__(self, engine, rng):
+        p = self.base - self.per_digit * len(str(engine.correct_answer))
+        if engine.current_attempt == 2:
+            p += self.retry_bonus
+        return rng.random() < p
+
+    def latency(self, engine, rng):
+        # Seconds taken to answer, growing with the size of the answer
+        return 1.5 * len(str(engine.correct_answer)) + rng.random()
+
+
+def play_games(games, difficulty, model, seed=None, operations=DEFAULT_OPERATIONS, operands=2):
+    # Play `games` complete games and return Counters of scores and grade letters
+    rng = random.Random(seed)
+    engine = QuizEngine(rng=rng, operations=operations, operands=operands)
+    scores = Counter()
+    adaptive = difficulty == ADAPTIVE
+    while games > 0:
+        engine.start(difficulty)
+        while engine.next_question():
+            while True:
+                correct = model(engine, rng)
+                if adaptive:
+                    engine.observe(model.latency(engine, rng), correct)
+                if engine.submit(correct)[0] != RETRY:
+                    break
+        scores[engine.score] += 1
+        games -= 1
+    grades = Counter()
+    for score, count in scores.items():
+        grades[calculate_grade(score).split()[0]] += count
+    return scores, grades
+
+
+def simulate(games, difficulty, model, workers=None, seed=None, chunk=50_000,
+             operations=DEFAULT_OPERATIONS, operands=2):
+    # Spread games over worker processes and merge their score/grade distributions
+    workers = workers or os.cpu_count() or 1
+    chunks = [min(chunk, games - start) for start in range(0, games, chunk)]
+    base = seed if seed is not None else random.randrange(2 ** 32)
+    scores, grades = Counter(), Counter()
+    if workers == 1:
+        results = (play_games(n, difficulty, model, base + i, operations, operands) for i, n in enumerate(chunks))
+        for s, g in results:
+            scores.update(s)
+            grades.update(g)
+        return scores, grades
+    
+    from concurrent.futures import ProcessPoolExecutor  # Deferred so the GUI does not pay for it at start-up
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_games, n, difficulty, model, base + i, operations, operands)
+                   for i, n in enumerate(chunks)]
+        for future in futures:
+            s, g = future.result()
+            scores.update(s)
+            grades.update(g)
+    return scores, grades
+
+
+def main(argv=None):
+    # Command line entry point for batch simulations
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulate Math Quiz games with synthetic players")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_RANGES) + [ADAPTIVE], default="easy")
+    parser.add_argument("--operations", default="+-", help="operators to use, any of +-×÷ (or * and /)")
+    parser.add_argument("--operands", type=int, default=2, help="numbers per question")
+    parser.add_argument("--model", choices=["fixed", "digits"], default="fixed")
+    parser.add_argument("--p-first", type=float, default=0.8, help="fixed model: first attempt accuracy")
+    parser.add_argument("--p-second", type=float, default=0.5, help="fixed model: second attempt accuracy")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    model = FixedAccuracy(args.p_first, args.p_second) if args.model == "fixed" else DigitSkill()
+    started = time.perf_counter()
+    operations = tuple(args.operations.replace('*', '×').replace('/', '÷'))
+    unknown = set(operations) - set(PROBLEM_TYPES)
+    if unknown:
+        parser.error(f"unknown operations: {''.join(sorted(unknown))}")
+    scores, grades = simulate(args.games, args.difficulty, model, args.workers, args.seed,
+                              operations=operations, operands=args.operands)
+    elapsed = time.perf_counter() - started
+
+    total = sum(scores.values())
+    mean = sum(score * count for score, count in scores.items()) / total if total else 0
+    print(f"{total} games in {elapsed:.2f}s ({total / elapsed:,.0f} games/s), mean score {mean:.2f}")
+    print("Scores:")
+    for score in sorted(scores):
+        print(f"  {score:>3}: {scores[score] / total:7.2%}")
+    print("Grades:")
+    for grade in ("A+", "A", "B", "C", "D", "F"):
+        print(f"  {grade:<2}: {grades[grade] / total:7.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+if __name__ == "__main__":  # quiz_server's engine needs grading from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from quiz_server import DEFAULT_PORT, encode
+from problems import evaluate
+
+
+class BotStats:
+    # Results gathered across every simulated player
+    def __init__(self):
+        self.connected = 0
+        self.messages = 0
+        self.answers = 0
+        self.result_latency = []  # Seconds from sending an answer to receiving its result
+        self.final_scores = []
+
+
+async def bot(index, args, stats, rng):
+    # One simulated player: join, answer every question after a think time, leave after the last round
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    stats.connected += 1
+    writer.write(encode({"type": "join", "name": f"bot{index:04d}"}))
+    await writer.drain()
+
+    rounds_left = args.rounds
+    sent_at = 0.0
+    question = None
+
+    async def answer_later(correct_answer, attempt):
+        # Think, then answer correctly with the configured accuracy
+        nonlocal sent_at
+        await asyncio.sleep(rng.uniform(args.min_think, args.max_think))
+        right = rng.random() < (args.accuracy if attempt == 1 else args.retry_accuracy)
+        value = correct_answer if right else correct_answer + rng.randint(1, 9)
+        sent_at = time.monotonic()
+        writer.write(encode({"type": "answer", "round": question["round"], "question": question["question"],
+                             "answer": value}))
+        stats.answers += 1
+
+    try:
+        async for line in reader:
+            stats.messages += 1
+            message = json.loads(line)
+            kind = message.get("type")
+            if kind == "question":
+                question = message
+                asyncio.create_task(answer_later(evaluate(message["tokens"]), 1))
+            elif kind == "result":
+                stats.result_latency.append(time.monotonic() - sent_at)
+                if message["outcome"] == "retry":
+                    asyncio.create_task(answer_later(evaluate(question["tokens"]), 2))
+            elif kind == "placing":
+                stats.final_scores.append(message["score"])
+                rounds_left -= 1
+                if rounds_left <= 0:
+                    break
+    finally:
+        writer.close()
+
+
+async def run(args):
+    # Start all bots, staggering connections slightly, and wait for them to finish
+    stats = BotStats()
+    started = time.perf_counter()
+    bots = []
+    for i in range(args.players):
+        bots.append(asyncio.create_task(bot(i, args, stats, random.Random(i))))
+        if i % 50 == 49:
+            await asyncio.sleep(0.05)
+    results = await asyncio.gather(*bots, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    elapsed = time.perf_counter() - started
+
+    print(f"{stats.connected}/{args.players} players connected, {len(errors)} failed, {elapsed:.1f}s")
+    print(f"{stats.answers} answers sent, {stats.messages} messages received")
+    if stats.result_latency:
+        latency = sorted(stats.result_latency)
+        p95 = latency[int(len(latency) * 0.95) - 1]
+        print(f"Answer -> result latency: median {statistics.median(latency) * 1000:.1f} ms, "
+              f"p95 {p95 * 1000:.1f} ms, max {latency[-1] * 1000:.1f} ms")
+    if stats.final_scores:
+        print(f"Mean final score {statistics.mean(stats.final_scores):.1f}")
+    for error in errors[:5]:
+        print(f"  {type(error).__name__}: {error}")
+
+
+def main(argv=None):
+    # Command line entry point for load testing a quiz server
+    parser = argparse.ArgumentParser(description="Simulate many players against a Math Quest LAN server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=1, help="rounds to play before disconnecting")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance a first attempt is right")
+    parser.add_argument("--retry-accuracy", type=float, default=0.6, help="chance a second attempt is right")
+    parser.add_argument("--min-think", type=float, default=0.5, help="shortest think time in seconds")
+    parser.add_argument("--max-think", type=float, default=4.0, help="longest think time in seconds")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import random
+import sys
+import time
+
+if __name__ == "__main__":  # quiz_engine needs grading from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from quiz_engine import QuizEngine, DIFFICULTY_RANGES, DEFAULT_OPERATIONS, TOTAL_QUESTIONS, RETRY, FAILED
+from problems import PROBLEM_TYPES, format_problem
+
+# Messages are newline-delimited JSON objects with a "type" field:
+#   client -> server: join {name}, answer {round, question, answer}
+#   server -> client: welcome, lobby, round, question, result, leaderboard, final, placing
+DEFAULT_PORT = 8770
+LEADERBOARD_SIZE = 10  # Players shown in each leaderboard push
+LEADERBOARD_INTERVAL = 0.5  # Seconds between leaderboard pushes (only sent when something changed)
+
+
+def encode(message):
+    # Encode one protocol message as a JSON line
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def question_set(seed, difficulty, count, operations=DEFAULT_OPERATIONS, operands=2):
+    # Build the round's questions from a seed, so every player gets the same stream
+    engine = QuizEngine(rng=random.Random(seed), operations=operations, operands=operands)
+    engine.start(difficulty)
+    return [engine.generate_question() for _ in range(count)]
+
+
+class Player:
+    # One connected client and its scoring engine for the current round
+    __slots__ = ("name", "writer", "engine", "answer_time", "resolved")
+
+    def __init__(self, name, writer):
+        self.name = name
+        self.writer = writer
+        self.engine = None  # Set when a round starts; late joiners sit out until the next one
+        self.answer_time = 0.0  # Total server-measured seconds to resolve questions this round
+        self.resolved = True  # True once the open question is answered or out of attempts
+
+    def send(self, data):
+        # Queue already-encoded bytes for this player, skipping closed connections
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+
+class QuizServer:
+    # Runs rounds of seeded questions for every connected player and pushes live leaderboards
+    def __init__(self, difficulty="easy", questions=TOTAL_QUESTIONS, question_time=20.0, lobby=15.0,
+                 operations=DEFAULT_OPERATIONS, operands=2):
+        self.difficulty = difficulty
+        self.question_count = questions
+        self.question_time = question_time  # Seconds each question stays open
+        self.lobby = lobby  # Seconds to wait for players before a round starts
+        self.operations = operations
+        self.operands = operands
+
+        self.players = {}  # StreamWriter -> Player
+        self.round = 0  # Current round number
+        self.question_index = 0  # Open question number, 0 when none is open
+        self.question_sent = 0.0  # Monotonic time the open question was broadcast
+        self.unresolved = 0  # Players still answering the open question
+        self.all_resolved = asyncio.Event()  # Set when every playing player has resolved the question
+        self.has_players = asyncio.Event()  # Set while at least one player is connected
+        self.leaderboard_dirty = False  # A score changed since the last leaderboard push
+
+    def broadcast(self, message):
+        # Encode once and send the same bytes to every player
+        data = encode(message)
+        for player in self.players.values():
+            player.send(data)
+
+    async def handle_client(self, reader, writer):
+        # Read one client's messages until it disconnects
+        player = None
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if message.get("type") == "join" and player is None:
+                    name = str(message.get("name") or "Player").strip()[:20] or "Player"
+                    player = Player(name, writer)
+                    self.players[writer] = player
+                    self.has_players.set()
+                    player.send(encode({"type": "welcome", "name": name, "round": self.round,
+                                        "difficulty": self.difficulty, "players": len(self.players)}))
+                    self.leaderboard_dirty = True
+                elif message.get("type") == "answer" and player is not None:
+                    self.on_answer(player, message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if self.players.pop(writer, None) is not None:
+                self.leaderboard_dirty = True
+                if not self.players:
+                    self.has_players.clear()
+                if not player.resolved:
+                    self.resolve(player)
+            writer.close()
+
+    def on_answer(self, player, message):
+        # Score an answer with the same rules as the desktop quiz, timed on the server
+        received = time.monotonic()
+        if (player.engine is None or player.resolved or message.get("round") != self.round
+                or message.get("question") != self.question_index):
+            return  # Stale, duplicate or early answer
+        try:
+            answer = int(message.get("answer"))
+        except (TypeError, ValueError):
+            return
+
+        engine = player.engine
+        outcome, points = engine.submit(engine.is_correct(answer))
+        reply = {"type": "result", "question": self.question_index, "outcome": outcome,
+                 "points": points, "score": engine.score, "combo": engine.combo}
+        if outcome != RETRY:
+            player.answer_time += received - self.question_sent
+            if outcome == FAILED:
+                reply["correct_answer"] = engine.correct_answer
+        player.send(encode(reply))
+        self.leaderboard_dirty = True
+        if outcome != RETRY:
+            self.resolve(player)
+
+    def resolve(self, player):
+        # Mark a player done with the open question, closing it early once nobody is still answering
+        player.resolved = True
+        self.unresolved -= 1
+        if self.unresolved <= 0:
+            self.all_resolved.set()
+
+    def ranked(self, limit=None):
+        # Players in the current round, best first (score, then least answer time)
+        playing = [p for p in self.players.values() if p.engine is not None]
+        key = lambda p: (-p.engine.score, p.answer_time)
+        return heapq.nsmallest(limit, playing, key=key) if limit else sorted(playing, key=key)
+
+    def standings(self, players):
+        # Leaderboard rows for ranked players
+        return [[p.name, p.engine.score, round(p.answer_time, 2)] for p in players]
+
+    async def push_leaderboards(self):
+        # Coalesce score changes into at most one leaderboard push per interval
+        while True:
+            await asyncio.sleep(LEADERBOARD_INTERVAL)
+            if self.leaderboard_dirty and self.players:
+                self.leaderboard_dirty = False
+                self.broadcast({"type": "leaderboard", "round": self.round, "players": len(self.players),
+                                "top": self.standings(self.ranked(LEADERBOARD_SIZE))})
+
+    async def run(self):
+        # Wait for players, run a round, repeat
+        asyncio.create_task(self.push_leaderboards())
+        while True:
+            await self.has_players.wait()
+            self.broadcast({"type": "lobby", "starts_in": self.lobby, "players": len(self.players)})
+            await asyncio.sleep(self.lobby)
+            if self.players:
+                await self.play_round()
+                await asyncio.sleep(5)  # Let players read the final standings
+
+    async def play_round(self):
+        # Broadcast one seeded question set and collect everyone's answers
+        self.round += 1
+        seed = random.randrange(2 ** 32)
+        questions = question_set(seed, self.difficulty, self.question_count, self.operations, self.operands)
+        for player in self.players.values():
+            player.engine = QuizEngine(total_questions=self.question_count, operations=self.operations,
+                                       operands=self.operands)
+            player.engine.start(self.difficulty)
+            player.answer_time = 0.0
+        self.broadcast({"type": "round", "round": self.round, "seed": seed, "difficulty": self.difficulty,
+                        "questions": self.question_count, "question_time": self.question_time})
+
+        for index, question in enumerate(questions, 1):
+            self.unresolved = 0
+            for player in self.players.values():
+                if player.engine is not None:
+                    player.engine.next_question(question)
+                    player.resolved = False
+                    self.unresolved += 1
+            self.all_resolved.clear()
+            if not self.unresolved:
+                self.all_resolved.set()  # Everyone from this round has left
+            self.question_index = index
+            self.question_sent = time.monotonic()
+            tokens, answer = question
+            self.broadcast({"type": "question", "round": self.round, "question": index,
+                            "of": self.question_count, "text": format_problem(tokens), "tokens": tokens,
+                            "time": self.question_time})
+            try:
+                await asyncio.wait_for(self.all_resolved.wait(), self.question_time)
+            except asyncio.TimeoutError:
+                pass
+
+            # Anyone still answering ran out of time
+            self.question_index = 0
+            for player in self.players.values():
+                if player.engine is not None and not player.resolved:
+                    self.resolve(player)
+                    player.engine.combo = 0
+                    player.answer_time += self.question_time
+                    player.send(encode({"type": "result", "question": index, "outcome": "timeout", "points": 0,
+                                        "score": player.engine.score, "combo": 0, "correct_answer": answer}))
+
+        ranked = self.ranked()
+        self.broadcast({"type": "final", "round": self.round, "players": len(ranked),
+                        "top": self.standings(ranked[:LEADERBOARD_SIZE])})
+        for rank, player in enumerate(ranked, 1):
+            player.send(encode({"type": "placing", "rank": rank, "of": len(ranked), "score": player.engine.score}))
+        for player in self.players.values():
+            player.engine = None
+
+    async def serve(self, host, port):
+        # Listen for players and run rounds until interrupted
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"Math Quest LAN server on {host}:{port} ({self.difficulty}, {self.question_count} questions)")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run())
+
+
+def main(argv=None):
+    # Command line entry point for hosting a classroom game
+    parser = argparse.ArgumentParser(description="Host a multiplayer Math Quest game on the local network")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on (0.0.0.0 = whole LAN)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_RANGES), default="easy")
+    parser.add_argument("--questions", type=int, default=TOTAL_QUESTIONS)
+    parser.add_argument("--question-time", type=float, default=20.0, help="seconds per question")
+    parser.add_argument("--lobby", type=float, default=15.0, help="seconds to wait for players before each round")
+    parser.add_argument("--operations", default="+-", help="operators to use, any of +-×÷ (or * and /)")
+    parser.add_argument("--operands", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    operations = tuple(args.operations.replace('*', '×').replace('/', '÷'))
+    if set(operations) - set(PROBLEM_TYPES):
+        parser.error("operations must be chosen from +-×÷")
+    server = QuizServer(args.difficulty, args.questions, args.question_time, args.lobby, operations, args.operands)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Scores are kept next to the game, one history per machine: WAL mode needs
+# the file on a local disk, so it must not live on a network share
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "quiz_scores.db")
+
+# Seconds to wait for another process on this machine (a second game window,
+# the LAN server) to finish writing before giving up with "database is locked"
+BUSY_TIMEOUT = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    max_combo INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+-- Leaderboard queries walk this index from the top, so they stay fast as games grow
+CREATE INDEX IF NOT EXISTS games_leaderboard ON games (difficulty, score DESC, max_combo DESC);
+CREATE INDEX IF NOT EXISTS games_player ON games (player, score DESC);
+CREATE TABLE IF NOT EXISTS question_times (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    question INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (game_id, question)
+) WITHOUT ROWID;
+"""
+
+
+class ScoreStore:
+    def __init__(self, path=DB_PATH, batch_size=50, flush_interval=1.0):
+        # Open the score database and start the background writer
+        self.path = path
+        self.batch_size = batch_size  # Most games written per transaction
+        self.flush_interval = flush_interval  # Longest a game waits before being written
+
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)  # Read connection, used by the Tk thread only
+        self.conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+        self.conn.executescript(SCHEMA)
+
+        self.pending = queue.Queue()  # Games waiting for the writer thread
+        self.unflushed = []  # Games queued but not yet committed, so reads still see them
+        self.lock = threading.Lock()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def record_game(self, player, difficulty, score, max_combo, question_times):
+        # Queue a finished game; question_times is a list of (question, attempts, seconds, points)
+        game = {"player": player, "difficulty": difficulty, "score": score,
+                "max_combo": max_combo, "played_at": time.time(), "questions": list(question_times)}
+        with self.lock:
+            self.unflushed.append(game)
+        self.pending.put(game)
+
+    def top_scores(self, difficulty, limit=5):
+        # Return the best (player, score, max_combo) rows for one difficulty
+        with self.lock:  # The writer commits and prunes unflushed under it, so each game is seen once
+            rows = self.conn.execute(
+                "SELECT player, score, max_combo FROM games WHERE difficulty = ? "
+                "ORDER BY score DESC, max_combo DESC LIMIT ?", (difficulty, limit)).fetchall()
+            rows += [(g["player"], g["score"], g["max_combo"]) for g in self.unflushed if g["difficulty"] == difficulty]
+        rows.sort(key=lambda r: (r[1], r[2]), reverse=True)
+        return rows[:limit]
+
+    def player_best(self, player):
+        # Return (best score, best combo) for a player across every difficulty
+        with self.lock:  # See top_scores
+            best_score, best_combo = self.conn.execute(
+                "SELECT MAX(score), MAX(max_combo) FROM games WHERE player = ?", (player,)).fetchone()
+            best_score, best_combo = best_score or 0, best_combo or 0
+            for g in self.unflushed:
+                if g["player"] == player:
+                    best_score = max(best_score, g["score"])
+                    best_combo = max(best_combo, g["max_combo"])
+        return best_score, best_combo
+
+    def close(self):
+        # Write anything still queued, retrying a batch that failed, and stop the writer thread
+        self.pending.put(None)
+        self.writer.join()
+        self.conn.close()
+
+    def _write_loop(self):
+        # Collect games into batches and commit each batch in one transaction
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        failed = []  # Games of a batch that could not be written, tried again with the next one
+        running = True
+        while running:
+            batch, failed = failed, []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    # Wait for a first game as long as it takes; a failed batch is retried after flush_interval
+                    game = self.pending.get(timeout=max(0, deadline - time.monotonic()) if batch else None)
+                except queue.Empty:
+                    break
+                if game is None:
+                    running = False  # Write what we have, then stop
+                    break
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(game)
+            if batch and not self._write_batch(conn, batch):
+                failed = batch
+        if failed:
+            print(f"Could not save {len(failed)} games; they are lost when the quiz closes")
+        conn.close()
+
+    def _write_batch(self, conn, batch):
+        # Insert a batch of games and their question timings; False if it could not be written
+        try:
+            for game in batch:
+                cur = conn.execute(
+                    "INSERT INTO games (player, difficulty, score, max_combo, played_at) VALUES (?, ?, ?, ?, ?)",
+                    (game["player"], game["difficulty"], game["score"], game["max_combo"], game["played_at"]))
+                conn.executemany(
+                    "INSERT INTO question_times (game_id, question, attempts, seconds, points) VALUES (?, ?, ?, ?, ?)",
+                    [(cur.lastrowid, *q) for q in game["questions"]])
+            # Commit and prune in one step under the lock, so no read sees a game both ways
+            with self.lock:
+                conn.commit()
+                written = set(map(id, batch))
+                self.unflushed = [g for g in self.unflushed if id(g) not in written]
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Could not save scores, will retry: {e}")  # The games stay in unflushed meanwhile
+            return False
@@ -0,0 +1,89 @@
+import time
+from collections import deque
+
+# Speed run variants: name -> (seconds on the clock, question limit or None for unlimited)
+SPEED_VARIANTS = {
+    "sprint": (60, None),  # 60 seconds, as many questions as possible
+    "clock": (90, 10),  # Beat the clock: 10 questions in 90 seconds
+}
+
+
+class Countdown:
+    # after()-driven countdown whose ticks are scheduled against a monotonic clock, so it never drifts
+    def __init__(self, widget, seconds, on_tick, on_finish, interval=0.1):
+        self.widget = widget  # Any Tk widget, used for after()/after_cancel()
+        self.seconds = seconds
+        self.on_tick = on_tick  # Called with the seconds remaining
+        self.on_finish = on_finish  # Called once when time runs out
+        self.interval = interval  # Seconds between ticks
+        self.started = 0  # Monotonic start time
+        self.deadline = 0  # Monotonic time the countdown ends
+        self.after_id = None  # Pending after() callback
+
+    def start(self):
+        # Start counting down from now
+        self.started = time.monotonic()
+        self.deadline = self.started + self.seconds
+        self._tick()
+
+    def remaining(self):
+        # Seconds left on the clock
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self):
+        # Stop the countdown without calling on_finish
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        # Report the time left and schedule the next tick on the interval grid
+        self.after_id = None
+        now = time.monotonic()
+        if now >= self.deadline:
+            self.on_tick(0.0)
+            self.on_finish()
+            return
+        self.on_tick(self.deadline - now)
+
+        # Aim for the next grid point after now; a late tick is absorbed instead of pushing every later tick back
+        ticks_done = int((now - self.started) / self.interval) + 1
+        next_tick = min(self.started + ticks_done * self.interval, self.deadline)
+        delay_ms = max(0, round((next_tick - time.monotonic()) * 1000))
+        self.after_id = self.widget.after(delay_ms, self._tick)
+
+
+class QuestionBuffer:
+    # Pre-generated questions, topped up in small chunks while Tk is idle
+    def __init__(self, engine, widget, size=60, low_water=20, chunk=10):
+        self.engine = engine  # QuizEngine used to generate questions
+        self.widget = widget  # Any Tk widget, used for after_idle()
+        self.size = size  # Questions held when full
+        self.low_water = low_water  # Top up once fewer than this remain
+        self.chunk = chunk  # Questions generated per idle callback
+        self.questions = deque()
+        self.topping_up = False
+
+    def fill(self):
+        # Fill the buffer completely (call before the clock starts)
+        while len(self.questions) < self.size:
+            self.questions.append(self.engine.generate_question())
+
+    def take(self):
+        # Return the next question, scheduling a top-up when running low
+        if not self.questions:
+            self.questions.append(self.engine.generate_question())  # Only if the buffer was never filled
+        question = self.questions.popleft()
+        if len(self.questions) < self.low_water and not self.topping_up:
+            self.topping_up = True
+            self.widget.after_idle(self._top_up)
+        return question
+
+    def _top_up(self):
+        # Generate one chunk, then yield back to Tk before generating more
+        for _ in range(self.chunk):
+            self.questions.append(self.engine.generate_question())
+        if len(self.questions) < self.size:
+            self.widget.after_idle(self._top_up)
+        else:
+            self.topping_up = False
@@ -0,0 +1,86 @@
+import csv
+import os
+import time
+from array import array
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_PATH = os.path.join(BASE_DIR, "answer_latency.log")
+
+LOG_FIELDS = ("timestamp", "player", "difficulty", "question", "attempt", "digits", "seconds", "correct")
+
+
+class LatencyRing:
+    # Fixed-size ring of recent answer latencies and results, using flat arrays
+    __slots__ = ("capacity", "seconds", "correct", "count", "next")
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.seconds = array('d', bytes(8 * capacity))  # Latency of each answer in seconds
+        self.correct = array('b', bytes(capacity))  # 1 if the answer was right, else 0
+        self.count = 0  # Number of slots filled so far (max capacity)
+        self.next = 0  # Slot the next answer goes into
+
+    def append(self, seconds, correct):
+        # Add one answer, overwriting the oldest once the ring is full
+        self.seconds[self.next] = seconds
+        self.correct[self.next] = 1 if correct else 0
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _recent_slots(self, n):
+        # Indexes of the newest n answers
+        n = min(n, self.count)
+        return [(self.next - i - 1) % self.capacity for i in range(n)]
+
+    def mean_latency(self, n):
+        # Average latency over the newest n answers (0 if there are none)
+        slots = self._recent_slots(n)
+        return sum(self.seconds[i] for i in slots) / len(slots) if slots else 0.0
+
+    def accuracy(self, n):
+        # Fraction of the newest n answers that were right (0 if there are none)
+        slots = self._recent_slots(n)
+        return sum(self.correct[i] for i in slots) / len(slots) if slots else 0.0
+
+    def __len__(self):
+        return self.count
+
+
+class TelemetryLog:
+    # Keeps every answer in a LatencyRing and streams it to a local CSV log, flushing every few records
+    def __init__(self, path=LOG_PATH, flush_every=20, capacity=256):
+        self.ring = LatencyRing(capacity)  # Recent answers of every mode, read by the adaptive difficulty
+        self.flush_every = flush_every
+        self.unflushed = 0
+        new_file = not os.path.exists(path)
+        try:
+            self.file = open(path, "a", encoding="utf-8", newline="", buffering=64 * 1024)
+            self.writer = csv.writer(self.file)  # Quotes player names holding commas, quotes or newlines
+            if new_file:
+                self.writer.writerow(LOG_FIELDS)
+        except OSError as e:
+            print(f"Answer telemetry disabled: {e}")
+            self.file = None
+
+    def write(self, player, difficulty, question, attempt, digits, seconds, correct):
+        # Add one answer to the ring and append its record to the log
+        self.ring.append(seconds, correct)
+        if not self.file:
+            return
+        self.writer.writerow((f"{time.time():.3f}", player, difficulty, question, attempt, digits,
+                              f"{seconds:.3f}", int(correct)))
+        self.unflushed += 1
+        if self.unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        # Push buffered records to disk
+        if self.file:
+            self.file.flush()
+        self.unflushed = 0
+
+    def close(self):
+        # Flush and close the log
+        if self.file:
+            self.file.close()
+            self.file = None
@@ -1,14 +1,252 @@
+import time
+STARTED = time.perf_counter()  # Start-up reference for the splash screen budget
 import tkinter as tk
 from tkinter import PhotoImage
-import random
-import pyttsx3
-import winsound
 import os
-from PIL import Image, ImageTk
+import sys
+import queue
+import threading
+from collections import deque
+from joke_service import JokeCorpus
+
+# pyttsx3, winsound and PIL are imported where they are first used, so the
+# window can appear before the speech engine and imaging libraries load
+
+
+def sound():
+    """The winsound module, imported on first use (Windows only)"""
+    import winsound
+    return winsound
+
 
 # Always locate files relative to this .py file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Shared fonts and widget styles live at the repository root, which
+# launcher.py puts on the path; a direct run has to add it
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(BASE_DIR))
+import ui_toolkit as ui
+from app_runtime import ASSETS
+
+# Widget presets (fonts are created once and shared by every widget using them)
+ui.define_style("joke.button", "flat_button", font=("Arial", 16, "bold"), fg="white", bg="#6c3b18",
+                activeforeground="white", activebackground="#6c3b18", cursor="hand2")
+ui.define_style("joke.quit", "joke.button", bg="#cc0000", activebackground="#cc0000")
+ui.define_style("joke.text", bg="white", font=("Arial", 16), wraplength=500, justify="center")
+
+# Pre-resized backgrounds are kept here so later launches skip resampling
+IMAGE_CACHE_DIR = os.path.join(BASE_DIR, ".image_cache")
+
+# How many jokes to keep selected and rendered ahead of the user
+PREFETCH_DEPTH = 3
+
+# Joke screen states (see JokeApp.show_random_joke / show_punchline)
+IDLE = "idle"
+SPEAKING_SETUP = "speaking setup"
+AWAITING_PUNCHLINE = "awaiting punchline"
+SPEAKING_PUNCHLINE = "speaking punchline"
+LAUGHING = "laughing"
+
+
+class PreparedJoke:
+    """A selected joke whose speech is rendered to memory in the background"""
+    def __init__(self, setup, punchline):
+        self.setup = setup
+        self.punchline = punchline
+        self.audio = {}                      # "setup"/"punchline" -> WAV bytes
+        self.rendered = threading.Event()    # Set once both parts are rendered
+
+
+class JokePrefetcher:
+    """Keeps the next few jokes selected with their speech already rendered"""
+    def __init__(self, corpus, depth=PREFETCH_DEPTH):
+        self.corpus = corpus
+        self.depth = depth
+        self.ready = deque()        # Selected jokes waiting to be told
+        self.to_render = deque()    # Selected jokes whose audio is not rendered yet
+        self.lock = threading.Condition()
+        self.closed = False
+
+        with self.lock:
+            self._top_up()
+
+        # Rendering runs on its own thread so clicks never wait for the TTS engine
+        self.thread = threading.Thread(target=self._render_loop, daemon=True)
+        self.thread.start()
+
+    def _top_up(self):
+        """Select jokes until the ready queue is full (lock must be held)"""
+        while len(self.corpus) and len(self.ready) < self.depth:
+            joke = PreparedJoke(*self.corpus.random_joke())
+            self.ready.append(joke)
+            self.to_render.append(joke)
+        self.lock.notify()
+
+    def take(self):
+        """Return the next joke straight away; its audio may still be rendering"""
+        with self.lock:
+            if not self.ready:
+                return None
+            joke = self.ready.popleft()
+            self._top_up()
+        return joke
+
+    def close(self):
+        """Stop the render thread once it finishes the joke it is rendering"""
+        with self.lock:
+            self.closed = True
+            self.lock.notify()
+
+    def _render_loop(self):
+        """Render queued jokes in selection order, so a taken joke is always next
+
+        Every joke is marked rendered even if its speech could not be made
+        (it is then shown without audio), so playback never waits forever.
+        """
+        try:
+            engine = self._create_engine()
+        except Exception as e:
+            print(f"Speech engine unavailable: {e}")
+            engine = None
+        while True:
+            with self.lock:
+                while not self.to_render and not self.closed:
+                    self.lock.wait()
+                if self.closed:
+                    return
+                joke = self.to_render[0]
+
+            try:
+                if engine is not None:
+                    for part in ("setup", "punchline"):
+                        joke.audio[part] = self._render(engine, getattr(joke, part))
+            except Exception as e:
+                print(f"Speech rendering failed: {e}")
+            finally:
+                with self.lock:
+                    self.to_render.popleft()
+                joke.rendered.set()
+
+    def _create_engine(self):
+        """Create the speech engine owned by the render thread"""
+        try:
+            # SAPI needs COM initialised on every thread that uses it
+            import comtypes
+            comtypes.CoInitialize()
+        except ImportError:
+            pass
+
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty("rate", 175)
+        engine.setProperty("volume", 1.0)
+
+        voices = engine.getProperty('voices')
+        for v in voices:
+            if "Zira" in v.name:
+                engine.setProperty('voice', v.id)
+                break
+        return engine
+
+    def _render(self, engine, text):
+        """Render text to WAV bytes held in memory (None if rendering fails)"""
+        import tempfile
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read() or None
+        except Exception as e:
+            print(f"Speech rendering failed: {e}")
+            return None
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class SpeechPlayer:
+    """Plays rendered speech on a worker thread and reports when each part ends"""
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.finished = queue.Queue()    # Parts that finished playing, read by the Tk thread
+        self.thread = threading.Thread(target=self._play_loop, daemon=True)
+        self.thread.start()
+
+    def play(self, joke, part):
+        self.requests.put((joke, part))
+
+    def close(self):
+        """Stop the player thread after anything already queued"""
+        self.requests.put(None)
+
+    def _play_loop(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            joke, part = request
+            try:
+                joke.rendered.wait()    # Only blocks if the user outran the prefetcher
+                audio = joke.audio.get(part)
+                if audio:
+                    winsound = sound()
+                    winsound.PlaySound(audio, winsound.SND_MEMORY)
+            except Exception as e:
+                print(f"Speech playback failed: {e}")
+            finally:
+                self.finished.put(part)    # The joke screen moves on either way
+
+
+class BackgroundImages:
+    """Screen backgrounds at the window size, from the shared asset cache with a disk cache"""
+    def __init__(self, master, width, height):
+        self.master = master   # Photos are shared with other windows on this Tk root
+        self.width = width
+        self.height = height
+
+    def get(self, name):
+        """Return the PhotoImage for name, decoding it now if it isn't ready"""
+        path = os.path.join(BASE_DIR, name)
+        return ASSETS.photo(self.master, path, (self.width, self.height), self._fallback(path),
+                            cache_dir=IMAGE_CACHE_DIR)
+
+    def preload(self, names):
+        """Decode the given images on the shared worker pool"""
+        ASSETS.preload([os.path.join(BASE_DIR, name) for name in names], (self.width, self.height),
+                       self.master, cache_dir=IMAGE_CACHE_DIR)
+
+    def _fallback(self, path):
+        """Photo factory for when PIL is not installed (None when it is)"""
+        from importlib.util import find_spec
+        if find_spec("PIL") is None:
+            return lambda: self._subsampled(path)
+        return None
+
+    def _subsampled(self, path):
+        """Shrink an image with tkinter alone (must run on the Tk thread)"""
+        print("PIL not available, using tkinter subsampling")
+        photo = PhotoImage(file=path, master=self.master)
+        # Calculate subsample factors
+        orig_width = photo.width()
+        orig_height = photo.height()
+
+        x_ratio = orig_width // self.width
+        y_ratio = orig_height // self.height
+
+        # Use the larger ratio to maintain aspect ratio
+        ratio = max(x_ratio, y_ratio)
+
+        if ratio > 1:
+            return photo.subsample(ratio, ratio)
+        else:
+            return photo
+
+
 class JokeApp:
     def __init__(self, root):
         self.root = root
@@ -23,15 +261,10 @@ class JokeApp:
         self.root.geometry("900x600")
         self.root.resizable(False, False)
 
-        # Safe paths for images
-        img1_path = os.path.join(BASE_DIR, "img_1.png")
-        img2_path = os.path.join(BASE_DIR, "img_2.png")
-        instructions_path = os.path.join(BASE_DIR, "Instructions.png")
-
-        # Load and resize background images to fit 900x600
-        self.start_bg = self.load_and_resize_image(img1_path, 900, 600)
-        self.joke_bg = self.load_and_resize_image(img2_path, 900, 600)
-        self.instructions_bg = self.load_and_resize_image(instructions_path, 900, 600)
+        # Background images are resized to fit 900x600 and decoded on demand;
+        # only the start screen is needed before the first frame
+        self.images = BackgroundImages(self.root, 900, 600)
+        self.start_bg = self.images.get("img_1.png")
 
         # Sound paths (safe)
         self.laugh_sound = os.path.join(BASE_DIR, "laugh.wav")
@@ -40,10 +273,20 @@ class JokeApp:
         # Start background music immediately
         self.play_background_music()
 
-        # Load jokes safely
-        self.jokes = self.load_jokes()
+        # Load jokes safely (selection lives in joke_service, shared with the CLI/server)
+        self.corpus = JokeCorpus.from_file()
         self.current_setup = ""
         self.current_punchline = ""
+        self.current_joke = None
+        self.state = IDLE
+        self.pending = None    # Request made while busy, run when speech ends
+        self.closed = False    # Set when the window is closed
+
+        # Select and render upcoming jokes in the background
+        self.prefetcher = JokePrefetcher(self.corpus)
+        self.player = SpeechPlayer()
+        self.poll_after = self.root.after(50, self.poll_speech)
+        self.laugh_after = None
 
         # START SCREEN
         self.start_frame = tk.Frame(self.root, width=900, height=600)
@@ -52,23 +295,15 @@ class JokeApp:
         self.start_bg_label = tk.Label(self.start_frame, image=self.start_bg)
         self.start_bg_label.place(x=0, y=0, width=900, height=600)
 
-        self.start_button = tk.Button(
-            self.start_frame, text="Start",
-            font=("Arial", 20, "bold"),
-            fg="white", bg="#6c3b18",
-            activeforeground="white", activebackground="#6c3b18",
-            relief="flat", borderwidth=0, highlightthickness=0, cursor="hand2",
+        self.start_button = ui.button(
+            self.start_frame, "joke.button", text="Start", font=("Arial", 20, "bold"),
             command=self.go_to_joke_screen
         )
         self.start_button.place(x=200, y=377, width=145, height=50)
 
         # INSTRUCTIONS BUTTON ON START SCREEN
-        self.instructions_button = tk.Button(
-            self.start_frame, text="Instructions",
-            font=("Arial", 20, "bold"),
-            fg="white", bg="#6c3b18",
-            activeforeground="white", activebackground="#6c3b18",
-            relief="flat", borderwidth=0, highlightthickness=0, cursor="hand2",
+        self.instructions_button = ui.button(
+            self.start_frame, "joke.button", text="Instructions", font=("Arial", 20, "bold"),
             command=self.show_instructions
         )
         self.instructions_button.place(x=225, y=438, width=195, height=50)
@@ -76,57 +311,35 @@ class JokeApp:
         # JOKE SCREEN
         self.joke_frame = tk.Frame(self.root, width=900, height=600)
 
-        self.joke_bg_label = tk.Label(self.joke_frame, image=self.joke_bg)
+        self.joke_bg_label = tk.Label(self.joke_frame)  # Image set on first visit
         self.joke_bg_label.place(x=0, y=0, width=900, height=600)
 
-        self.ask_button = tk.Button(
-            self.joke_frame, text="Alexa tell me a joke",
-            font=("Arial", 14, "bold"),
-            fg="white", bg="#6c3b18",
-            activeforeground="white", activebackground="#6c3b18",
-            relief="flat", borderwidth=0, highlightthickness=0, cursor="hand2",
+        self.ask_button = ui.button(
+            self.joke_frame, "joke.button", text="Alexa tell me a joke", font=("Arial", 14, "bold"),
             command=self.show_random_joke
         )
         self.ask_button.place(x=201, y=156, width=237, height=45)
 
-        self.quit_button = tk.Button(
-            self.joke_frame, text="Quit",
-            font=("Arial", 16, "bold"),
-            fg="white", bg="#cc0000",
-            activeforeground="white", activebackground="#cc0000",
-            relief="flat", borderwidth=0, highlightthickness=0, cursor="hand2",
-            command=self.root.quit
+        self.quit_button = ui.button(
+            self.joke_frame, "joke.quit", text="Quit",
+            command=self.root.destroy
         )
         self.quit_button.place(x=515, y=156, width=140, height=45)
 
-        self.setup_label = tk.Label(
-            self.joke_frame, text="", bg="white",
-            font=("Arial", 16), wraplength=500, justify="center"
-        )
+        self.setup_label = ui.label(self.joke_frame, "joke.text", text="")
         self.setup_label.place(x=150, y=221, width=590, height=70)
 
-        self.punchline_label = tk.Label(
-            self.joke_frame, text="", bg="white",
-            font=("Arial", 15, "italic"), wraplength=500, justify="center"
-        )
+        self.punchline_label = ui.label(self.joke_frame, "joke.text", text="", font=("Arial", 15, "italic"))
         self.punchline_label.place(x=150, y=306, width=590, height=70)
 
-        self.next_button = tk.Button(
-            self.joke_frame, text="Next Joke",
-            font=("Arial", 16, "bold"),
-            fg="white", bg="#6c3b18",
-            activeforeground="white", activebackground="#6c3b18",
-            relief="flat", borderwidth=0, highlightthickness=0, cursor="hand2",
+        self.next_button = ui.button(
+            self.joke_frame, "joke.button", text="Next Joke",
             command=self.show_random_joke
         )
         self.next_button.place(x=250, y=399, width=140, height=45)
 
-        self.punchline_button = tk.Button(
-            self.joke_frame, text="Show Punchline",
-            font=("Arial", 14, "bold"),
-            fg="white", bg="#6c3b18",
-            activeforeground="white", activebackground="#6c3b18",
-            relief="flat", borderwidth=0, highlightthickness=0, cursor="hand2",
+        self.punchline_button = ui.button(
+            self.joke_frame, "joke.button", text="Show Punchline", font=("Arial", 14, "bold"),
             command=self.show_punchline
         )
         self.punchline_button.place(x=485, y=399, width=237, height=45)
@@ -134,77 +347,58 @@ class JokeApp:
         # INSTRUCTIONS SCREEN
         self.instructions_frame = tk.Frame(self.root, width=900, height=600)
         
-        self.instructions_bg_label = tk.Label(self.instructions_frame, image=self.instructions_bg)
+        self.instructions_bg_label = tk.Label(self.instructions_frame)  # Image set on first visit
         self.instructions_bg_label.place(x=0, y=0, width=900, height=600)
         
         # Back button on instructions screen
-        self.back_button = tk.Button(
-            self.instructions_frame, text="Back",
-            font=("Arial", 16, "bold"),
-            fg="white", bg="#6c3b18",
-            activeforeground="white", activebackground="#6c3b18",
-            relief="flat", borderwidth=0, highlightthickness=0, cursor="hand2",
+        self.back_button = ui.button(
+            self.instructions_frame, "joke.button", text="Back",
             command=self.go_to_start_screen
         )
         self.back_button.place(x=630, y=463, width=145, height=45)
 
-    def load_and_resize_image(self, image_path, width, height):
-        """Load and resize image to fit the specified dimensions"""
-        try:
-            # Try using PIL for better image resizing
-            from PIL import Image, ImageTk
-            image = Image.open(image_path)
-            image = image.resize((width, height), Image.LANCZOS)
-            return ImageTk.PhotoImage(image)
-        except ImportError:
-            # Fallback to tkinter if PIL is not available
-            print("PIL not available, using tkinter subsampling")
-            photo = PhotoImage(file=image_path)
-            # Calculate subsample factors
-            orig_width = photo.width()
-            orig_height = photo.height()
-            
-            x_ratio = orig_width // width
-            y_ratio = orig_height // height
-            
-            # Use the larger ratio to maintain aspect ratio
-            ratio = max(x_ratio, y_ratio)
-            
-            if ratio > 1:
-                return photo.subsample(ratio, ratio)
-            else:
-                return photo
+        # Decode the other screens once the start screen has been painted
+        self.root.after_idle(self.images.preload, ["img_2.png", "Instructions.png"])
 
     # BACKGROUND MUSIC
     def play_background_music(self):
         """Loop background music forever."""
         if os.path.exists(self.bg_music):
+            winsound = sound()
             winsound.PlaySound(self.bg_music, winsound.SND_FILENAME | winsound.SND_LOOP | winsound.SND_ASYNC)
 
     # SPEECH FUNCTION
-    def speak(self, text):
-        engine = pyttsx3.init()
-        engine.setProperty("rate", 175)
-        engine.setProperty("volume", 1.0)
-
-        voices = engine.getProperty('voices')
-        for v in voices:
-            if "Zira" in v.name:
-                engine.setProperty('voice', v.id)
-                break
+    def speak(self, part):
+        """Start playback of the current joke's pre-rendered setup or punchline"""
+        if self.current_joke:
+            self.player.play(self.current_joke, part)
 
-        engine.say(text)
-        engine.runAndWait()
+    def poll_speech(self):
+        """Pick up finished speech from the player thread"""
+        try:
+            while True:
+                part = self.player.finished.get_nowait()
+                if part == "setup":
+                    self.on_setup_finished()
+                else:
+                    self.on_punchline_finished()
+        except queue.Empty:
+            pass
+        self.poll_after = self.root.after(50, self.poll_speech)
 
     # LAUGH EFFECT (LONGER + NO CUT)
     def play_laugh(self):
         """Play laugh fully, then resume background music."""
         if os.path.exists(self.laugh_sound):
+            winsound = sound()
             winsound.PlaySound(self.laugh_sound, winsound.SND_FILENAME | winsound.SND_ASYNC)
-            self.root.after(3200, self.play_background_music)
+            self.laugh_after = self.root.after(3200, self.on_laugh_finished)
+        else:
+            self.on_laugh_finished()
 
     # NAVIGATION
     def go_to_joke_screen(self):
+        self.joke_bg_label.config(image=self.images.get("img_2.png"))
         self.start_frame.pack_forget()
         self.joke_frame.pack()
 
@@ -213,51 +407,94 @@ class JokeApp:
         self.start_frame.pack()
 
     def show_instructions(self):
+        self.instructions_bg_label.config(image=self.images.get("Instructions.png"))
         self.start_frame.pack_forget()
         self.instructions_frame.pack()
 
+    # JOKE STATE MACHINE
     def show_random_joke(self):
-        if self.jokes:
-            setup, punchline = random.choice(self.jokes)
-            self.current_setup = setup
-            self.current_punchline = punchline
+        """Button handler: tell a new joke now, or once the current speech ends"""
+        if self.state in (IDLE, AWAITING_PUNCHLINE):
+            self.start_joke()
+        else:
+            self.pending = "joke"  # Coalesce repeated clicks into one request
 
-            self.setup_label.config(text=setup)
+    def show_punchline(self):
+        """Button handler: reveal the punchline now, or once the setup ends"""
+        if self.state == AWAITING_PUNCHLINE:
+            self.start_punchline()
+        elif self.state == SPEAKING_SETUP:
+            self.pending = "punchline"
+
+    def start_joke(self):
+        joke = self.prefetcher.take()
+        if joke:
+            self.current_joke = joke
+            self.current_setup = joke.setup
+            self.current_punchline = joke.punchline
+
+            self.setup_label.config(text=joke.setup)
             self.punchline_label.config(text="")
 
-            # Update UI BEFORE speaking
-            self.root.update_idletasks()
-            self.root.update()
+            self.state = SPEAKING_SETUP
+            self.speak("setup")
 
-            self.speak(setup)
-
-    def show_punchline(self):
+    def start_punchline(self):
         self.punchline_label.config(text=self.current_punchline)
 
-        self.root.update_idletasks()
-        self.root.update()
+        self.state = SPEAKING_PUNCHLINE
+        self.speak("punchline")  # Laugh plays once the punchline finishes
 
-        self.speak(self.current_punchline)
+    def on_setup_finished(self):
+        # Speech playback stops the music loop, so restart it
+        self.play_background_music()
+        self.state = AWAITING_PUNCHLINE
+        self.run_pending()
 
+    def on_punchline_finished(self):
+        self.state = LAUGHING
         self.play_laugh()
 
-    # LOAD JOKES
-    def load_jokes(self):
-        joke_file = os.path.join(BASE_DIR, "randomJokes.txt")
-        jokes = []
-        try:
-            with open(joke_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if "?" in line:
-                        q, p = line.split("?", 1)
-                        jokes.append((q + "?", p.strip()))
-        except FileNotFoundError:
-            print(f"Joke file not found: {joke_file}")
-        return jokes
+    def on_laugh_finished(self):
+        self.laugh_after = None
+        self.play_background_music()
+        self.state = IDLE
+        self.run_pending()
+
+    def run_pending(self):
+        """Replay the request that arrived while speech was playing"""
+        pending, self.pending = self.pending, None
+        if pending == "joke":
+            self.root.after_idle(self.show_random_joke)
+        elif pending == "punchline":
+            self.root.after_idle(self.show_punchline)
+
+    def close(self):
+        """Stop sound and the speech threads when the window goes away"""
+        if self.closed:
+            return
+        self.closed = True
+        for after_id in (self.poll_after, self.laugh_after):
+            if after_id:
+                self.root.after_cancel(after_id)
+        self.prefetcher.close()
+        self.player.close()
+        sound().PlaySound(None, 0)  # Stop the music loop
+
+
+def launch(master):
+    """Open the joke app in its own window on an existing Tk root (used by the portfolio launcher)"""
+    window = tk.Toplevel(master)
+    app = JokeApp(window)
+    window.bind("<Destroy>", lambda e: app.close() if e.widget is window else None)
+    return window
 
 
 if __name__ == "__main__":
     root = tk.Tk()
+    root.withdraw()  # Show the splash while the app builds its screens
+    splash = ui.Splash(root, "Loading jokes...", STARTED)
     app = JokeApp(root)
+    splash.close()
+    root.deiconify()
     root.mainloop()
\ No newline at end of file
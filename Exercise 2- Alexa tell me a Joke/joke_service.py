@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+import random
+import sys
+
+# Always locate files relative to this .py file
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOKE_FILE = os.path.join(BASE_DIR, "randomJokes.txt")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Characters that may separate a setup from its punchline
+DEFAULT_DELIMITERS = ("?",)
+
+# Cap on "count" so one request can't ask for the whole corpus many times over
+MAX_JOKES_PER_REQUEST = 50
+
+
+# CORPUS COMPILER
+def compiled_path(joke_file):
+    """Where the compiled form of a joke file is kept"""
+    return os.path.splitext(joke_file)[0] + ".compiled.json"
+
+
+def split_joke(line, delimiters=DEFAULT_DELIMITERS):
+    """Split one normalised line into (setup, punchline), or return a reject reason
+
+    The file glues the punchline straight onto the setup ("...road?To get..."),
+    so a delimiter followed by a non-space character is taken as the split.
+    This keeps extra question marks inside a setup ("Knock knock? Who's
+    there?...") or at the end of a punchline intact. Lines with no glued
+    delimiter fall back to the first delimiter that leaves text on both sides.
+    """
+    candidates = [i for i, ch in enumerate(line) if ch in delimiters]
+    if not candidates:
+        return "no delimiter"
+
+    split_at = next((i for i in candidates if i + 1 < len(line) and not line[i + 1].isspace()), None)
+    if split_at is None:
+        split_at = next((i for i in candidates if line[i + 1:].strip()), candidates[0])
+
+    # Sentence punctuation belongs to the setup; separators like "|" don't
+    delim = line[split_at]
+    setup = (line[:split_at + 1] if delim in "?!." else line[:split_at]).strip()
+    punchline = line[split_at + 1:].strip()
+    if not setup.rstrip(delim).strip():
+        return "empty setup"
+    if not punchline:
+        return "empty punchline"
+    return setup, punchline
+
+
+def compile_jokes(joke_file=JOKE_FILE, delimiters=DEFAULT_DELIMITERS):
+    """Parse a joke file in one streaming pass
+
+    Returns (jokes, rejects) where rejects is a list of
+    (line number, reason, original text) for lines that were not kept.
+    """
+    jokes, rejects = [], []
+    seen = {}  # digest of normalised joke -> line number it first appeared on
+    with open(joke_file, "r", encoding="utf-8") as f:
+        for line_no, raw in enumerate(f, 1):
+            line = " ".join(raw.split())  # Normalise all whitespace runs
+            if not line:
+                continue
+
+            result = split_joke(line, delimiters)
+            if isinstance(result, str):
+                rejects.append((line_no, result, raw.rstrip("\n")))
+                continue
+
+            # Dedup on a case-insensitive digest rather than the text itself
+            key = hashlib.blake2b("\0".join(result).casefold().encode("utf-8"), digest_size=16).digest()
+            if key in seen:
+                rejects.append((line_no, f"duplicate of line {seen[key]}", raw.rstrip("\n")))
+                continue
+            seen[key] = line_no
+            jokes.append(result)
+    return jokes, rejects
+
+
+def write_compiled(joke_file, jokes, delimiters=DEFAULT_DELIMITERS):
+    """Save parsed jokes with the source stamp they were compiled from"""
+    stat = os.stat(joke_file)
+    data = {
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "delimiters": "".join(delimiters),
+        "jokes": jokes,
+    }
+    out_path = compiled_path(joke_file)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def read_compiled(joke_file, delimiters=DEFAULT_DELIMITERS):
+    """Return compiled jokes if they are up to date with the source, else None"""
+    try:
+        stat = os.stat(joke_file)
+        with open(compiled_path(joke_file), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (data.get("source_mtime_ns") != stat.st_mtime_ns or data.get("source_size") != stat.st_size
+            or data.get("delimiters") != "".join(delimiters)):
+        return None
+    return [tuple(joke) for joke in data["jokes"]]
+
+
+# LOAD JOKES
+def load_jokes(joke_file=JOKE_FILE, delimiters=DEFAULT_DELIMITERS):
+    """Read (setup, punchline) pairs, compiling the joke file if it changed"""
+    jokes = read_compiled(joke_file, delimiters)
+    if jokes is not None:
+        return jokes
+    try:
+        jokes, rejects = compile_jokes(joke_file, delimiters)
+    except FileNotFoundError:
+        print(f"Joke file not found: {joke_file}")
+        return []
+    if rejects:
+        print(f"Skipped {len(rejects)} line(s) in {joke_file} (run 'joke_service.py check' for details)")
+    try:
+        write_compiled(joke_file, jokes, delimiters)
+    except OSError as e:
+        print(f"Could not write compiled jokes: {e}")
+    return jokes
+
+
+class JokeCorpus:
+    """The loaded jokes plus selection, shared by the Tk app, the CLI and the server"""
+    def __init__(self, jokes):
+        self.jokes = list(jokes)
+        # Pre-encode every joke once so the server never serialises per request
+        self.encoded = [json.dumps({"setup": s, "punchline": p}).encode("utf-8")
+                        for s, p in self.jokes]
+
+    @classmethod
+    def from_file(cls, joke_file=JOKE_FILE, delimiters=DEFAULT_DELIMITERS):
+        return cls(load_jokes(joke_file, delimiters))
+
+    def __len__(self):
+        return len(self.jokes)
+
+    def random_joke(self, rng=random):
+        """Return a random (setup, punchline) pair, or None if there are no jokes"""
+        if not self.jokes:
+            return None
+        return self.jokes[rng.randrange(len(self.jokes))]
+
+    def random_encoded(self, count=1, rng=random):
+        """Return `count` random jokes as a JSON array body"""
+        if not self.encoded:
+            return b"[]"
+        picks = [self.encoded[rng.randrange(len(self.encoded))] for _ in range(count)]
+        return b"[" + b",".join(picks) + b"]"
+
+
+# HTTP SERVER
+class JokeServer:
+    """Minimal asyncio HTTP/1.1 server answering joke requests from a JokeCorpus"""
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                # Read headers; only Connection matters to us
+                keep_alive = True
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+
+                status, body = self.route(request_line.decode("latin-1").split())
+                writer.write(b"HTTP/1.1 %s\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: %d\r\nConnection: %s\r\n\r\n"
+                             % (status, len(body), b"keep-alive" if keep_alive else b"close"))
+                writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, EOFError):  # EOFError covers asyncio.IncompleteReadError
+            pass
+        finally:
+            writer.close()
+
+    def route(self, parts):
+        """Map a request line to (status, JSON body)"""
+        if len(parts) < 2 or parts[0] != "GET":
+            return b"405 Method Not Allowed", b'{"error": "only GET is supported"}'
+
+        path, _, query = parts[1].partition("?")
+        if path == "/health":
+            return b"200 OK", b'{"jokes": %d}' % len(self.corpus)
+        if path == "/joke":
+            if not len(self.corpus):
+                return b"503 Service Unavailable", b'{"error": "no jokes loaded"}'
+            count = 1
+            for pair in query.split("&"):
+                key, _, value = pair.partition("=")
+                if key == "count" and value.isdigit():
+                    count = max(1, min(int(value), MAX_JOKES_PER_REQUEST))
+            return b"200 OK", self.corpus.random_encoded(count)
+        return b"404 Not Found", b'{"error": "unknown path"}'
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        import asyncio  # Only the server needs asyncio, so the GUI never pays to import it
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            print(f"Serving {len(self.corpus)} jokes on unix:{unix_path}")
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            print(f"Serving {len(self.corpus)} jokes on http://{host}:{port}/joke")
+        async with server:
+            await server.serve_forever()
+
+
+# COMMAND LINE
+def delimiter_char(text):
+    """argparse type for --delimiter; split_joke() compares one character at a time"""
+    if len(text) != 1:
+        import argparse
+        raise argparse.ArgumentTypeError(f"must be a single character, not {text!r}")
+    return text
+
+
+def main(argv=None):
+    import argparse
+    import asyncio
+    parser = argparse.ArgumentParser(description="Tell jokes without the GUI")
+    parser.add_argument("--file", default=JOKE_FILE, help="joke file to load")
+    parser.add_argument("--delimiter", action="append", dest="delimiters", metavar="CHAR", type=delimiter_char,
+                        help="setup/punchline separator (repeatable, default '?')")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    tell = commands.add_parser("tell", help="print random jokes")
+    tell.add_argument("-n", "--count", type=int, default=1)
+
+    commands.add_parser("check", help="parse the joke file and report rejected lines")
+    commands.add_parser("compile", help="parse the joke file and write its compiled form")
+
+    serve = commands.add_parser("serve", help="serve jokes over local HTTP")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead")
+
+    args = parser.parse_args(argv)
+    delimiters = tuple(args.delimiters or DEFAULT_DELIMITERS)
+
+    if args.command in ("check", "compile"):
+        jokes, rejects = compile_jokes(args.file, delimiters)
+        for line_no, reason, text in rejects:
+            print(f"line {line_no}: {reason}: {text}")
+        print(f"{len(jokes)} jokes kept, {len(rejects)} rejected from {args.file}")
+        if args.command == "compile":
+            print(f"Wrote {write_compiled(args.file, jokes, delimiters)}")
+        return 0
+
+    corpus = JokeCorpus.from_file(args.file, delimiters)
+    if args.command == "tell":
+        for _ in range(args.count):
+            joke = corpus.random_joke()
+            if joke is None:
+                return 1
+            print(f"{joke[0]}\n  {joke[1]}")
+    elif args.command == "serve":
+        try:
+            asyncio.run(JokeServer(corpus).serve(args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,76 @@
+import time
+STARTED = time.perf_counter()  # Start-up reference for the splash screen budget
 import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
 import os
+import sys
 
 # Get the base directory where the script is located
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-def load_img(name, size):
-    """Load and resize an image from the base directory"""
+# Shared fonts, widget styles and grade boundaries live at the repository
+# root, which launcher.py puts on the path; a direct run has to add it
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(BASE_DIR))
+import ui_toolkit as ui
+from app_runtime import ASSETS, worker_pool
+from student_index import StudentIndex
+from student_data import (grading, calculate_grade, student_marks, locked, parse_student_lines, write_students,
+                          typed_id, typed_mark, validate_student, COURSEWORK_MAX, EXAM_MAX)
+from student_store import StudentStore
+from student_list import StudentList
+from cohorts import CohortManager
+
+# Screen backgrounds, all drawn at the window size
+BG_SIZE = (900, 600)
+
+# How often the window checks whether the cohorts have finished parsing
+REFRESH_POLL_MS = 50
+
+# Widget presets (fonts are created once and shared by every widget using them)
+ui.define_style("students.nav", "flat_button", font=("Arial", 13), bg="#213159", fg="white",
+                activebackground="#213159", activeforeground="white")
+ui.define_style("students.quit", "students.nav", bg="#cc0000", activebackground="#cc0000")
+ui.define_style("students.action", font=("Arial", 12), fg="white", relief="flat", borderwidth=0,
+                activeforeground="white")
+ui.define_style("students.option", "students.action", bg="#1c4a7f", activebackground="#163b66", anchor="w")
+ui.define_style("students.submit", "flat_button", font=("Arial", 14), bg="#f6c03e", fg="#051d40",
+                activebackground="#f6c03e", activeforeground="#051d40")
+ui.define_style("students.row", font=("Courier New", 12), fg="white", bg="#051d40", anchor="w")
+ui.define_style("students.row_bold", "students.row", font=("Courier New", 12, "bold"))
+ui.define_style("students.name", font=("Arial", 25, "bold"), fg="#051d40", bg="#f6c03e")
+ui.define_style("students.field", font=("Arial", 18), relief="flat", borderwidth=0)
+ui.define_style("students.cohort_total", "students.row_bold", font=("Courier New", 11, "bold"), bg="#1c4a7f")
+ui.define_style("students.cohort_list", font=("Courier New", 11), fg="white", bg="#1c4a7f",
+                selectbackground="#f6c03e", selectforeground="#051d40", relief="flat", borderwidth=0,
+                highlightthickness=0, activestyle="none")
+
+def load_img(master, name, size):
+    """Load and resize an image from the base directory (shared by every window on master's Tk root)"""
     path = os.path.join(BASE_DIR, name)
-    return ImageTk.PhotoImage(Image.open(path).resize(size, Image.LANCZOS))
+    return ASSETS.photo(master, path, size)
+
+def background(name):
+    """Background attribute that loads its image the first time a screen needs it"""
+    return property(lambda self: load_img(self, name, BG_SIZE))
+
+def show_error(parent, message):
+    """Show an error dialog (messagebox is only imported once one is needed)"""
+    from tkinter import messagebox
+    messagebox.showerror("Error", message, parent=parent)
+
+def confirm(parent, message):
+    """Ask a yes/no question; True for yes"""
+    from tkinter import messagebox
+    return messagebox.askyesno("Confirm", message, parent=parent)
+
+# Every *.txt mark file beside the program is a cohort; this one opens first
+COHORT_DIR = BASE_DIR
+DEFAULT_COHORT = "studentMarks"
+
+# Most search results listed under the search box
+SEARCH_LIMIT = 12
+# Milliseconds after the last keystroke before the search runs
+SEARCH_DELAY_MS = 150
 
 # Original student data that will be written to the file on reset
 ORIGINAL_DATA = """10
@@ -27,25 +88,43 @@ ORIGINAL_DATA = """10
 
 def reset_data_file():
     """Reset the student data file to its original state"""
-    path = os.path.join(BASE_DIR, "studentMarks.txt")
-    with open(path, "w") as f:
-        f.write(ORIGINAL_DATA)
-
-def calculate_grade(percent):
-    """Calculate letter grade based on percentage score"""
-    if percent >= 70: return "A"
-    elif percent >= 60: return "B"
-    elif percent >= 50: return "C"
-    elif percent >= 40: return "D"
-    return "F"
-
-class StudentApp(tk.Tk):
-    """Main application class for Student Management System"""
-    
-    def __init__(self):
-        super().__init__()
-        # Reset data file to ensure we start with clean data
+    path = os.path.join(COHORT_DIR, DEFAULT_COHORT + ".txt")
+    with locked(path):  # Not halfway through another editor's save
+        write_students(path, parse_student_lines(ORIGINAL_DATA.splitlines()))
+
+def ensure_data_file():
+    """Create the student data file from the original data if there is none yet
+
+    The file is shared with other editors (another window, the JSON API),
+    so an existing one is never overwritten at start-up.
+    """
+    if not os.path.exists(os.path.join(COHORT_DIR, DEFAULT_COHORT + ".txt")):
         reset_data_file()
+
+class StudentManager:
+    """Student Management System screens, mixed into a Tk or Toplevel window"""
+    
+    # Backgrounds for the different screens
+    bg1 = background("1.png")  # Main menu
+    bg2 = background("2.png")  # View all students
+    bg3 = background("3.png")  # Add student
+    bg4 = background("4.png")  # Update student
+    bg5 = background("5.png")  # Highest scoring student
+    bg6 = background("6.png")  # Lowest scoring student
+    bg_instructions = background("Instructions.png")  # Instructions page
+    
+    def build(self):
+        """Set up the window; called once the Tk window itself exists"""
+        # Start from the original data only when there is no data file yet
+        ensure_data_file()
+        # Parsed cohorts, cached until their files change
+        self.cohorts = CohortManager(COHORT_DIR)
+        self.cohort_name = DEFAULT_COHORT
+        self.cohort_refresh = None  # Future of the background refresh the dropdown waits for
+        self.cohort_waiting = None  # Cohort button clicked since it started
+        self.stores = {}   # Cohort name -> (StudentStore, StudentIndex following it)
+        self.store = self.index = None
+        self.undo_btn = self.redo_btn = None
         
         # Configure main window
         self.title("Student Manager")
@@ -57,19 +136,14 @@ class StudentApp(tk.Tk):
         self.iconbitmap(icon_path)
         
         # Initialize instance variables
-        self.selected_student_id = None  # Currently selected student ID
-        self.selected_label = None       # Reference to selected student label
+        self.selected_student_id = None  # Currently selected student ID (when exactly one is)
+        self.selected_ids = []           # Every selected student ID
         self.highest_name_label = None   # Label for highest/lowest student display
         self.instructions_btn = None     # Reference to instructions button
         
-        # Load background images for different screens
-        self.bg1 = load_img("1.png", (900, 600))  # Main menu
-        self.bg2 = load_img("2.png", (900, 600))  # View all students
-        self.bg3 = load_img("3.png", (900, 600))  # Add student
-        self.bg4 = load_img("4.png", (900, 600))  # Update student
-        self.bg5 = load_img("5.png", (900, 600))  # Highest scoring student
-        self.bg6 = load_img("6.png", (900, 600))  # Lowest scoring student
-        self.bg_instructions = load_img("Instructions.png", (900, 600))  # Instructions page
+        # Only the menu background is needed for the first frame; the rest decode in the background
+        self.after_idle(ASSETS.preload, [os.path.join(BASE_DIR, name) for name in
+                                         ("2.png", "3.png", "4.png", "5.png", "6.png", "Instructions.png")], BG_SIZE, self)
         
         # Create background label
         self.bg_label = tk.Label(self, image=self.bg1)
@@ -77,14 +151,24 @@ class StudentApp(tk.Tk):
         
         # Create header for student list display
         header = f"{'ID':<6}{'NAME':<16}{'COURSEWORK':<13}{'EXAM':<9}{'%':<6}{'GRADE':<4}"
-        self.header_text = tk.Label(self, text=header, font=("Courier New", 12, "bold"),
-                                  fg="white", bg="#213159", anchor="w")
+        self.header_text = ui.label(self, "students.row_bold", text=header, bg="#213159")
         
+        # The student list is built once and follows the data through change events
+        self.student_list = StudentList(self, self.select_students)
+        self.open_cohort()
+
         # Initialize lists to track UI elements
-        self.data_labels = []     # Labels for student data rows
-        self.summary_label = None # Label for summary statistics
+        self.data_labels = []     # Labels for highest/lowest student details
         self.add_widgets = []     # Widgets for add/update forms
+        self.search_after = None  # Pending debounced search
+        self.search_query = None  # Query behind the rows on screen
+        self.search_results = []  # Rows it returned
         
+        # Undo and redo changes to the open cohort from the keyboard too
+        self.bind("<Control-z>", self.undo)
+        self.bind("<Control-y>", self.redo)
+        self.bind("<Control-Z>", self.redo)  # Ctrl+Shift+Z
+
         # Create the main navigation buttons
         self.create_buttons()
         # Create instructions button (only for main menu)
@@ -92,97 +176,78 @@ class StudentApp(tk.Tk):
 
     def create_instructions_button(self):
         """Create the instructions button (only for main menu)"""
-        self.instructions_btn = tk.Button(self, text="Instructions", command=self.show_instructions, 
-                                        font=("Arial", 13), bg="#213159", fg="white",
-                                        relief="flat", borderwidth=0, highlightthickness=0,
-                                        activebackground="#213159", activeforeground="white")
+        self.instructions_btn = ui.button(self, "students.nav", text="Instructions", command=self.show_instructions)
         self.instructions_btn.place(x=715, y=40, width=130, height=40)
 
     def _vc_id(self, proposed):
         """Validation function for Student ID field"""
-        if proposed == "": return True  # Allow empty field during typing
-        return proposed.isdigit() and len(proposed) <= 4  # Must be digits and max 4 chars
+        return typed_id(proposed)
 
     def _vc_cw(self, proposed):
         """Validation function for Coursework marks (0-20)"""
-        if proposed == "": return True  # Allow empty field during typing
-        if not proposed.isdigit(): return False  # Must be numeric
-        if len(proposed) > 2: return False  # Max 2 digits
-        try: 
-            return 0 <= int(proposed) <= 20  # Must be between 0-20
-        except: 
-            return False
+        return typed_mark(proposed, COURSEWORK_MAX)
 
     def _vc_exam(self, proposed):
         """Validation function for Exam marks (0-100)"""
-        if proposed == "": return True  # Allow empty field during typing
-        if not proposed.isdigit(): return False  # Must be numeric
-        if len(proposed) > 3: return False  # Max 3 digits
-        try: 
-            return 0 <= int(proposed) <= 100  # Must be between 0-100
-        except: 
-            return False
+        return typed_mark(proposed, EXAM_MAX)
 
     def read_student_file(self):
-        """Read and parse student data from file"""
-        path = os.path.join(BASE_DIR, "studentMarks.txt")
-        students = []
+        """Return the current cohort's students"""
+        return list(self.store)
+
+    def open_cohort(self):
+        """Load the current cohort into the store, index and list
+
+        A cohort opened before is reused, catching up with whatever other
+        editors saved to its file since: only the students they changed are
+        applied, so the list and index patch just those rows.
+        """
+        path = self.cohorts.path(self.cohort_name)
+        store, index = self.stores.get(self.cohort_name, (None, None))
         try:
-            with open(path, "r") as f:
-                lines = f.readlines()
-            if not lines: return students  # Return empty list if file is empty
-            
-            # Skip first line if it's just a count
-            first_line = lines[0].strip()
-            if first_line.isdigit(): lines = lines[1:]
-            
-            # Parse each student record
-            for line in lines:
-                line = line.strip()
-                if not line: continue  # Skip empty lines
-                parts = line.split(",")
-                if len(parts) >= 6:
-                    # Ensure we have exactly 6 fields per student
-                    while len(parts) < 6: parts.append("0")
-                    students.append(parts[:6])
+            if store is None:
+                cohort = self.cohorts.get(self.cohort_name)
+                store = StudentStore(path, cohort.rows, cohort.version)
+                index = StudentIndex(cohort.rows)
+                store.subscribe(index.store_changed)
+                self.stores[self.cohort_name] = (store, index)
+            else:
+                store.refresh()
         except FileNotFoundError:
-            messagebox.showerror("Error", "studentMarks.txt file not found!")
+            show_error(self, f"{self.cohort_name}.txt file not found!")
+            store, index = StudentStore(path), StudentIndex()
         except Exception as e:
-            messagebox.showerror("Error", f"Error reading file: {str(e)}")
-        return students
-
-    def write_student_file(self, students):
-        """Write student data back to file"""
-        path = os.path.join(BASE_DIR, "studentMarks.txt")
+            show_error(self, f"Error reading file: {str(e)}")
+            store, index = StudentStore(path), StudentIndex()
+        if store is not self.store:
+            if self.store is not None:
+                self.store.unsubscribe(self.store_changed)
+            store.subscribe(self.store_changed)
+            self.store, self.index = store, index
+            self.student_list.attach(store)
+
+    def save_change(self, change, *args):
+        """Apply a change to the store, reporting why it failed; True once it is saved"""
         try:
-            with open(path, "w") as f:
-                f.write(str(len(students)) + "\n")  # Write count on first line
-                for student in students:
-                    f.write(",".join(student) + "\n")  # Write each student record
+            change(*args)
             return True
-        except Exception as e:
-            messagebox.showerror("Error", f"Error saving file: {str(e)}")
-            return False
+        except OSError as e:
+            show_error(self, f"Error saving file: {str(e)}")
+        except ValueError as e:
+            show_error(self, str(e))  # e.g. a duplicate Student ID
+        return False
 
     def create_buttons(self):
         """Create the main navigation buttons"""
-        btn_style = {
-            "font": ("Arial", 13), "bg": "#213159", "fg": "white",
-            "relief": "flat", "borderwidth": 0, "highlightthickness": 0,
-            "activebackground": "#213159", "activeforeground": "white"
-        }
-        
         # Create all navigation buttons with their commands and positions
-        tk.Button(self, text="View All Students", command=self.show_all_students, **btn_style).place(x=50, y=158, width=170, height=45)
-        tk.Button(self, text="Add Student Record", command=lambda: self.switch(self.bg3), **btn_style).place(x=49, y=225, width=170, height=45)
-        tk.Button(self, text="Update Student", command=self.open_update_page, **btn_style).place(x=50, y=293, width=170, height=45)
-        tk.Button(self, text="Highest Scoring Student", command=self.show_highest_student, **btn_style).place(x=36, y=360, width=190, height=45)
-        tk.Button(self, text="Lowest Scoring Student", command=self.show_lowest_student, **btn_style).place(x=36, y=428, width=190, height=45)
+        ui.button(self, "students.nav", text="View All Students", command=self.show_all_students).place(x=50, y=158, width=170, height=45)
+        ui.button(self, "students.nav", text="Add Student Record", command=lambda: self.switch(self.bg3)).place(x=49, y=225, width=170, height=45)
+        ui.button(self, "students.nav", text="Update Student", command=self.open_update_page).place(x=50, y=293, width=170, height=45)
+        ui.button(self, "students.nav", text="Highest Scoring Student", command=self.show_highest_student).place(x=36, y=360, width=190, height=45)
+        ui.button(self, "students.nav", text="Lowest Scoring Student", command=self.show_lowest_student).place(x=36, y=428, width=190, height=45)
 
         # Quit button
-        tk.Button(self, text="Quit", command=self.quit, font=("Arial", 13), bg="#cc0000", fg="white",
-                relief="flat", borderwidth=0, highlightthickness=0,
-                activebackground="#cc0000", activeforeground="white").place(x=77, y=519, width=110, height=42)
+        ui.button(self, "students.quit", text="Quit", command=self.destroy).place(x=77, y=519, width=110, height=42)
 
     def show_instructions(self):
         """Display the instructions screen"""
@@ -201,164 +266,289 @@ class StudentApp(tk.Tk):
         self.sort_dropdown = tk.Frame(self, bg="#1c4a7f", relief="flat", borderwidth=0)
         self.sort_dropdown.place(x=btn_x, y=btn_y + btn_h, width=120)
 
-        # Style for dropdown options
-        opt = {
-            "font": ("Arial", 12), "bg": "#1c4a7f", "fg": "white",
-            "relief": "flat", "borderwidth": 0, "activebackground": "#163b66",
-            "activeforeground": "white", "anchor": "w"
-        }
-
         # Create sort option buttons
-        tk.Button(self.sort_dropdown, text="Sort Name (A-Z)", command=lambda: self.sort_students("name_asc"), **opt).pack(fill="x")
-        tk.Button(self.sort_dropdown, text="Sort Name (Z-A)", command=lambda: self.sort_students("name_desc"), **opt).pack(fill="x")
+        ui.button(self.sort_dropdown, "students.option", text="Sort Name (A-Z)", command=lambda: self.sort_students("name_asc")).pack(fill="x")
+        ui.button(self.sort_dropdown, "students.option", text="Sort Name (Z-A)", command=lambda: self.sort_students("name_desc")).pack(fill="x")
 
     def sort_students(self, sort_type):
         """Sort students by specified criteria and refresh display"""
-        rows = self.read_student_file()
-        if sort_type == "name_asc":
-            rows.sort(key=lambda x: x[1].lower())  # Sort A-Z by name
-        elif sort_type == "name_desc":
-            rows.sort(key=lambda x: x[1].lower(), reverse=True)  # Sort Z-A by name
-        
-        # Save sorted data and refresh display
-        if self.write_student_file(rows):
+        # Sort A-Z or Z-A by name, saving the new order
+        if self.save_change(self.store.sort, lambda x: x[1].lower(), sort_type == "name_desc"):
             try: 
                 self.sort_dropdown.destroy()  # Close dropdown
             except: 
                 pass
             self.show_all_students()  # Refresh the view
 
+    def open_cohort_dropdown(self):
+        """Open the list of cohorts once mark files that are new or changed are parsed in the background"""
+        # Toggle dropdown visibility
+        if hasattr(self, "cohort_dropdown") and self.cohort_dropdown.winfo_exists():
+            self.cohort_dropdown.destroy()
+            return
+
+        # Parsing can take seconds with many files, so it runs off the Tk thread
+        if self.cohort_refresh is None:
+            self.cohort_refresh = worker_pool().submit(self.cohorts.refresh)
+            self.after(REFRESH_POLL_MS, self.poll_cohort_refresh)
+        self.cohort_waiting = self.cohort_btn
+        self.cohort_btn.config(text="Loading…")
+
+    def poll_cohort_refresh(self):
+        """Build the cohort dropdown once the background refresh has finished"""
+        if not self.cohort_refresh.done():
+            self.after(REFRESH_POLL_MS, self.poll_cohort_refresh)
+            return
+        future, self.cohort_refresh = self.cohort_refresh, None
+        button, self.cohort_waiting = self.cohort_waiting, None
+        # The screen may have changed while the files were parsed
+        if button is not self.cohort_btn or not button.winfo_exists():
+            return
+        button.config(text=f"{self.cohort_name[:12]} ▾")
+        try:
+            cohorts = future.result()
+        except Exception as e:
+            show_error(self, f"Could not read the cohorts: {e}")
+            return
+        self.show_cohort_dropdown(cohorts)
+
+    def show_cohort_dropdown(self, cohorts):
+        """Place the list of cohorts under the cohort button"""
+        overall = self.cohorts.summary()
+        btn_y, btn_h = self.cohort_btn.winfo_y(), self.cohort_btn.winfo_height()
+        self.cohort_dropdown = tk.Frame(self, bg="#1c4a7f", relief="flat", borderwidth=0)
+        self.cohort_dropdown.place(x=540, y=btn_y + btn_h, width=300)
+
+        # Figures across every cohort, then one line per cohort
+        total = f"All {len(cohorts)}: {overall['count']} students, {overall['average']}%"
+        if self.cohorts.errors:
+            total += f" ({len(self.cohorts.errors)} unreadable)"
+        ui.label(self.cohort_dropdown, "students.cohort_total", text=total).pack(fill="x", padx=4, pady=2)
+        listbox = ui.make(tk.Listbox, self.cohort_dropdown, "students.cohort_list", height=min(len(cohorts), 10))
+        scrollbar = tk.Scrollbar(self.cohort_dropdown, command=listbox.yview)
+        listbox.config(yscrollcommand=scrollbar.set)
+        for cohort in cohorts:
+            listbox.insert("end", f"{cohort.name[:16]:<16} {cohort.stats['count']:>6} {cohort.stats['average']:6.2f}%")
+        scrollbar.pack(side="right", fill="y")
+        listbox.pack(side="left", fill="both", expand=True)
+
+        def choose(event):
+            selection = listbox.curselection()
+            if selection:
+                self.switch_cohort(cohorts[selection[0]].name)
+        listbox.bind("<<ListboxSelect>>", choose)
+
+    def switch_cohort(self, name):
+        """Show another cohort; its cached rows and index are reused if the file is unchanged"""
+        self.cohort_dropdown.destroy()
+        self.cohort_name = name
+        self.selected_student_id, self.selected_ids = None, []
+        self.show_all_students()
+
     def show_all_students(self):
         """Display the 'View All Students' screen"""
         self.switch(self.bg2)  # Switch to appropriate background
+        self.open_cohort()  # Picks up edits made to the file outside the app
+        # New boundaries in grading.json apply straight away, without re-reading any mark file
+        try:
+            if grading.reload():
+                self.cohorts.regrade()
+                self.student_list.redraw()
+        except (OSError, ValueError) as e:
+            show_error(self, f"Could not load grade boundaries: {e}")
         self.header_text.place(x=315, y=230)  # Position header
-        self.selected_student_id = None  # Reset selection
-        self.selected_label = None
-
-        # Clear existing data labels
-        for lbl in self.data_labels: 
-            lbl.destroy()
-        self.data_labels.clear()
-        if self.summary_label: 
-            self.summary_label.destroy()
 
         # Create search entry field
-        self.search_entry = tk.Entry(self, font=("Arial", 16), width=16, relief="flat", borderwidth=0)
+        self.search_entry = ui.entry(self, "students.field", font=("Arial", 16), width=16)
         self.search_entry.place(x=371, y=155, height=30)
-        self.search_entry.bind("<Return>", self.search_student)  # Search on Enter key
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)  # Search as you type
+        self.search_entry.bind("<Return>", self.search_student)  # Search straight away on Enter
+        self.search_query, self.search_results = None, []
 
         # Create delete button for selected student
-        self.delete_btn = tk.Button(self, text="Delete", font=("Arial", 12), bg="#cc0000", fg="white",
-                                  relief="flat", borderwidth=0, activebackground="#cc0000",
-                                  activeforeground="white", command=self.delete_selected_student)
+        self.delete_btn = ui.button(self, "students.action", text="Delete", bg="#cc0000", activebackground="#cc0000",
+                                    command=self.delete_selected_student)
         self.delete_btn.place(x=630, y=156, width=60, height=32)
 
         # Create sort button
-        self.sort_btn = tk.Button(self, text="Sort Students", font=("Arial", 12), bg="#051d40", fg="white",
-                                relief="flat", borderwidth=0, activebackground="#051d40",
-                                activeforeground="white", command=self.open_sort_dropdown)
+        self.sort_btn = ui.button(self, "students.action", text="Sort Students", bg="#051d40", activebackground="#051d40",
+                                  command=self.open_sort_dropdown)
         self.sort_btn.place(x=720, y=155, width=120, height=32)
 
+        # Create undo and redo buttons for changes to this cohort
+        self.undo_btn = ui.button(self, "students.action", text="↶ Undo", bg="#1c4a7f", activebackground="#1c4a7f",
+                                  command=self.undo)
+        self.undo_btn.place(x=371, y=193, width=80, height=28)
+        self.redo_btn = ui.button(self, "students.action", text="Redo ↷", bg="#1c4a7f", activebackground="#1c4a7f",
+                                  command=self.redo)
+        self.redo_btn.place(x=457, y=193, width=80, height=28)
+        self.update_history_buttons()
+
+        # Create selection options (Ctrl/Shift-click also select several rows)
+        self.select_btn = ui.button(self, "students.action", text="Select ▾", bg="#1c4a7f", activebackground="#1c4a7f",
+                                    command=self.open_select_dropdown)
+        self.select_btn.place(x=620, y=193, width=80, height=28)
+
+        # Create cohort switcher
+        self.cohort_btn = ui.button(self, "students.action", text=f"{self.cohort_name[:12]} ▾", bg="#1c4a7f",
+                                    activebackground="#1c4a7f", command=self.open_cohort_dropdown)
+        self.cohort_btn.place(x=720, y=193, width=120, height=28)
+
         # Display all students
         self.display_all_students()
 
     def display_all_students(self):
-        """Display all student records in a formatted list"""
-        rows = self.read_student_file()
-        y_offset, percentages = 275, []  # Starting Y position and list for calculating average
+        """Display all student records in a formatted list, with summary statistics
+
+        The rows are already up to date: the list follows every change to
+        the store, so showing it only has to put it on screen.
+        """
+        self.student_list.show_roster()
+        self.student_list.select(None)  # Reset selection
+        self.student_list.place(x=315, y=275)
+
+    def select_students(self, sids):
+        """Remember the students selected in the list"""
+        self.selected_ids = sids
+        self.selected_student_id = sids[0] if len(sids) == 1 else None
+
+    def open_select_dropdown(self):
+        """Open the selection options: everyone shown, everyone with a grade, or nobody"""
+        # Toggle dropdown visibility
+        if hasattr(self, "select_dropdown") and self.select_dropdown.winfo_exists():
+            self.select_dropdown.destroy()
+            return
 
-        # Process and display each student
-        for row in rows:
-            sid, name, cw1, cw2, cw3, exam = row[0], row[1], *map(int, row[2:6])
-            coursework = cw1 + cw2 + cw3  # Calculate total coursework
-            percent = round(((coursework + exam) / 160) * 100, 2)  # Calculate percentage
-            percentages.append(percent)  # Store for average calculation
-            grade = calculate_grade(percent)  # Get letter grade
-
-            # Format the student data line
-            line = f"{sid:<6}{name:<20}{coursework:<10}{exam:<7}{percent:<9}{grade:<4}"
-            lbl = tk.Label(self, text=line, font=("Courier New", 12), fg="white", bg="#051d40", anchor="w")
-            # Make label clickable for selection
-            lbl.bind("<Button-1>", lambda e, sid=sid, lbl=lbl: self.select_student(sid, lbl))
-            lbl.place(x=315, y=y_offset)
-            self.data_labels.append(lbl)
-            y_offset += 22  # Move down for next student
-
-        # Calculate and display summary statistics
-        avg_percent = round(sum(percentages) / len(rows), 2) if rows else 0
-        self.summary_label = tk.Label(self, text=f"Total Students: {len(rows)}        Average Percentage: {avg_percent}%",
-                                    font=("Courier New", 12, "bold"), fg="white", bg="#051d40", anchor="w")
-        self.summary_label.place(x=315, y=y_offset + 20)
-
-    def select_student(self, sid, lbl):
-        """Handle student selection by clicking on their row"""
-        self.selected_student_id = sid
-        # Update visual selection
-        if self.selected_label: 
-            self.selected_label.config(bg="#051d40")  # Deselect previous
-        lbl.config(bg="#1c4a7f")  # Highlight selected
-        self.selected_label = lbl  # Store reference
+        btn_x, btn_y = self.select_btn.winfo_x(), self.select_btn.winfo_y()
+        btn_h = self.select_btn.winfo_height()
+        self.select_dropdown = tk.Frame(self, bg="#1c4a7f", relief="flat", borderwidth=0)
+        self.select_dropdown.place(x=btn_x, y=btn_y + btn_h, width=120)
+
+        ui.button(self.select_dropdown, "students.option", text="All shown", command=self.select_shown).pack(fill="x")
+        for grade in reversed(grading.scheme("students").grades):
+            ui.button(self.select_dropdown, "students.option", text=f"Grade {grade}",
+                      command=lambda grade=grade: self.select_grade(grade)).pack(fill="x")
+        ui.button(self.select_dropdown, "students.option", text="None",
+                  command=lambda: self.select_by_filter(None)).pack(fill="x")
+
+    def select_shown(self):
+        """Select every student in the list as shown (all of them, or the search matches)"""
+        self.select_by_filter(lambda row: True, keep_search=True)
+
+    def select_grade(self, grade):
+        """Select every student in the cohort with a grade"""
+        def has_grade(row):
+            try:
+                return calculate_grade(student_marks(row)[2]) == grade
+            except ValueError:
+                return False  # Non-numeric marks have no grade
+        self.select_by_filter(has_grade)
+
+    def select_by_filter(self, matches, keep_search=False):
+        """Select the students a filter accepts (nobody for None), showing the full list unless keep_search"""
+        self.select_dropdown.destroy()
+        if not keep_search and self.search_query:
+            self.search_entry.delete(0, "end")
+            self.search_student()  # An empty search shows everyone again
+        if matches is None:
+            self.student_list.select(None)
+        else:
+            self.student_list.select_keys(lbl.key for lbl in self.student_list.visible()
+                                          if matches(self.store.rows[lbl.key]))
+
+    def store_changed(self, event, *args):
+        """Store listener: keep the Undo and Redo buttons in step after every change"""
+        if event == "summary":
+            self.update_history_buttons()
+
+    def update_history_buttons(self):
+        """Enable Undo and Redo only when there is something to step to"""
+        if self.undo_btn is None or not self.undo_btn.winfo_exists():
+            return  # Not on the View All Students screen
+        self.undo_btn.config(state="normal" if self.store.undo_log else "disabled")
+        self.redo_btn.config(state="normal" if self.store.redo_log else "disabled")
+
+    def undo(self, event=None):
+        """Undo the latest change to the cohort (Ctrl+Z)"""
+        self.step_history(self.store.undo)
+
+    def redo(self, event=None):
+        """Redo the latest undone change (Ctrl+Y or Ctrl+Shift+Z)"""
+        self.step_history(self.store.redo)
+
+    def step_history(self, step):
+        """Undo or redo from the View All Students screen, patching just the students involved"""
+        if self.undo_btn is None or not self.undo_btn.winfo_exists():
+            return  # Shortcuts only act where the list can show the result
+        self.save_change(step)
+        self.update_history_buttons()  # A change that no longer fits was dropped from the history
+        if self.search_query:
+            self.search_query = None  # Show the search again with the students as they are now
+            self.search_student()
 
     def delete_selected_student(self):
-        """Delete the currently selected student"""
-        if not self.selected_student_id:
-            messagebox.showerror("Error", "No student selected.")
+        """Delete the selected students, asking first when there are several"""
+        if not self.selected_ids:
+            show_error(self, "No student selected.")
             return
 
-        rows = self.read_student_file()
-        # Filter out the selected student
-        new_rows = [r for r in rows if r[0] != self.selected_student_id]
-
-        # Check if student was actually found and removed
-        if len(new_rows) == len(rows):
-            messagebox.showerror("Error", "Student not found.")
+        # Check the student is still there
+        if len(self.selected_ids) == 1 and self.selected_student_id not in self.store:
+            show_error(self, "Student not found.")
+            return
+        if len(self.selected_ids) > 1 and not confirm(self, f"Delete {len(self.selected_ids)} students?"):
             return
 
-        # Save updated data and refresh display
-        if self.write_student_file(new_rows):
-            self.show_all_students()
-
-    def search_student(self, event):
-        """Search for a student by ID and display results"""
-        search_id = self.search_entry.get().strip()
-        # Clear existing display
-        for lbl in self.data_labels: 
-            lbl.destroy()
-        self.data_labels.clear()
-        if self.summary_label: 
-            self.summary_label.destroy()
-
-        rows = self.read_student_file()
-        found = None
-        # Search for student with matching ID
-        for row in rows:
-            if row[0] == search_id:
-                found = row
-                break
-
-        if not found:
-            # Display not found message
-            lbl = tk.Label(self, text="Student not found", font=("Courier New", 14), fg="white", bg="#051d40")
-            lbl.place(x=315, y=275)
-            self.data_labels.append(lbl)
+        # Save them all with one write; the list drops just those rows and updates its summary
+        if self.save_change(self.store.remove_many, self.selected_ids) and self.search_query:
+            self.search_query = None  # Show the search again without the deleted students
+            self.search_student()
+
+    def schedule_search(self, event):
+        """Search once typing pauses, replacing any search still waiting"""
+        self.cancel_search()
+        self.search_after = self.after(SEARCH_DELAY_MS, self.search_student)
+
+    def cancel_search(self):
+        """Drop a debounced search that has not run yet"""
+        if self.search_after:
+            self.after_cancel(self.search_after)
+            self.search_after = None
+
+    def search_student(self, event=None):
+        """Search by ID prefix or (fuzzy) name and list the best matches"""
+        self.cancel_search()  # Enter, or the timer firing, supersedes anything pending
+        query = self.search_entry.get().strip()
+        if query == self.search_query:
+            return  # Keys such as arrows or Shift change nothing
+
+        previous, rows = self.search_query, self.search_results
+        self.search_query = query
+        # An empty search shows everyone again
+        if not query:
+            self.search_results = []
+            self.student_list.show_roster()
             return
 
-        # Display found student
-        sid, name, cw1, cw2, cw3, exam = found[0], found[1], *map(int, found[2:6])
-        coursework = cw1 + cw2 + cw3
-        percent = round(((coursework + exam) / 160) * 100, 2)
-        grade = calculate_grade(percent)
+        # Typing more letters usually only filters the rows already shown
+        found = self.index.narrow(previous, rows, query, SEARCH_LIMIT) if previous else None
+        if found is None:
+            found = self.index.search(query, SEARCH_LIMIT)
+        self.search_results = found
 
-        result = f"{sid:<6}{name:<20}{coursework:<10}{exam:<7}{percent:<9}{grade:<5}"
-        lbl = tk.Label(self, text=result, font=("Courier New", 12), fg="white", bg="#051d40", anchor="w")
-        lbl.place(x=315, y=275)
-        self.data_labels.append(lbl)
+        # Display matches best first, clickable like the full list
+        if not found:
+            self.student_list.show_results(found, "Student not found")
+        else:
+            more = " (showing the best)" if len(found) == SEARCH_LIMIT else ""
+            self.student_list.show_results(found, f"Matches for \"{query}\": {len(found)}{more}")
 
     def switch(self, bg_image):
         """Switch between different screens/backgrounds"""
         self.bg_label.config(image=bg_image)
         self.bg_label.image = bg_image
         self.header_text.place_forget()  # Hide header
+        self.cancel_search()  # The search box is about to go
 
         # Show instructions button only on main menu (1.png)
         if bg_image == self.bg1:
@@ -367,13 +557,12 @@ class StudentApp(tk.Tk):
             self.instructions_btn.place_forget()
 
         # Clear various UI elements
+        self.student_list.place_forget()  # Hidden, not destroyed: it keeps following the data
         if self.highest_name_label: 
             self.highest_name_label.destroy()
         for lbl in self.data_labels: 
             lbl.destroy()
         self.data_labels.clear()
-        if self.summary_label: 
-            self.summary_label.destroy()
         for w in self.add_widgets: 
             w.destroy()
         self.add_widgets = []
@@ -395,6 +584,27 @@ class StudentApp(tk.Tk):
             self.sort_dropdown.destroy()
         except: 
             pass
+        try: 
+            self.select_btn.destroy()
+        except: 
+            pass
+        try: 
+            self.undo_btn.destroy()
+            self.redo_btn.destroy()
+        except: 
+            pass
+        try: 
+            self.select_dropdown.destroy()
+        except: 
+            pass
+        try: 
+            self.cohort_btn.destroy()
+        except: 
+            pass
+        try: 
+            self.cohort_dropdown.destroy()
+        except: 
+            pass
 
         # If switching to add student screen, create the form
         if bg_image == self.bg3: 
@@ -414,7 +624,7 @@ class StudentApp(tk.Tk):
 
         # Create each form field
         for name, x, y in fields:
-            e = tk.Entry(self, font=("Arial", 18), relief="flat", borderwidth=0)
+            e = ui.entry(self, "students.field")
             # Apply appropriate validation based on field type
             if name == "ID": 
                 e.config(validate="key", validatecommand=vcmd_id)
@@ -427,59 +637,24 @@ class StudentApp(tk.Tk):
             self.add_entries[name] = e
 
         # Create add button
-        add_btn = tk.Button(self, text="Add", font=("Arial", 14), bg="#f6c03e", fg="#051d40",
-                          relief="flat", borderwidth=0, highlightthickness=0,
-                          activebackground="#f6c03e", activeforeground="#051d40",
-                          command=self.save_new_student)
+        add_btn = ui.button(self, "students.submit", text="Add", command=self.save_new_student)
         add_btn.place(x=650, y=520, width=80, height=40)
         self.add_widgets.append(add_btn)
 
     def save_new_student(self):
         """Save a new student record from the add form"""
         # Get data from form fields
-        sid = self.add_entries["ID"].get().strip()
-        name = self.add_entries["NAME"].get().strip()
-        cw1 = self.add_entries["CW1"].get().strip()
-        cw2 = self.add_entries["CW2"].get().strip()
-        cw3 = self.add_entries["CW3"].get().strip()
-        exam = self.add_entries["EXAM"].get().strip()
-
-        # Validate that all fields are filled
-        if not all([sid, name, cw1, cw2, cw3, exam]):
-            messagebox.showerror("Error", "All fields must be filled.")
-            return
-
-        # Validate Student ID format
-        if not (sid.isdigit() and len(sid) == 4):
-            messagebox.showerror("Error", "Student ID must be exactly 4 digits.")
-            return
+        fields = [self.add_entries[name].get() for name in ("ID", "NAME", "CW1", "CW2", "CW3", "EXAM")]
 
-        # Validate and convert marks to integers
+        # Same checks as the JSON API: all fields filled, a 4-digit ID, marks in range
         try:
-            cw1_i, cw2_i, cw3_i = int(cw1), int(cw2), int(cw3)
-            exam_i = int(exam)
-            # Validate coursework marks range
-            if not all(0 <= x <= 20 for x in [cw1_i, cw2_i, cw3_i]):
-                messagebox.showerror("Error", "Coursework marks must be between 0 and 20.")
-                return
-            # Validate exam mark range
-            if not 0 <= exam_i <= 100:
-                messagebox.showerror("Error", "Exam mark must be between 0 and 100.")
-                return
-        except:
-            messagebox.showerror("Error", "Marks must be numeric.")
+            row = validate_student(*fields)
+        except ValueError as e:
+            show_error(self, str(e))
             return
 
-        # Check for duplicate Student ID
-        rows = self.read_student_file()
-        for r in rows:
-            if r[0] == sid:
-                messagebox.showerror("Error", "Student ID already exists.")
-                return
-
-        # Add new student and save
-        rows.append([sid, name, str(cw1_i), str(cw2_i), str(cw3_i), str(exam_i)])
-        if self.write_student_file(rows):
+        # Add new student and save (a duplicate Student ID is refused)
+        if self.save_change(self.store.insert, row):
             self.show_all_students()  # Switch to view all students
 
     def open_update_page(self):
@@ -489,19 +664,17 @@ class StudentApp(tk.Tk):
 
     def update_student_form(self):
         """Create the form for updating an existing student"""
-        rows = self.read_student_file()
-        selected = None
         # Find the currently selected student
-        for r in rows:
-            if r[0] == self.selected_student_id:
-                selected = r
-                break
+        selected = self.store.get(self.selected_student_id)
 
         # Get current values or empty strings if no student selected
+        batch = len(self.selected_ids) > 1
         if selected: 
             sid, name, cw1, cw2, cw3, exam = selected
         else: 
             sid = name = cw1 = cw2 = cw3 = exam = ""
+        if batch:
+            sid = f"{len(self.selected_ids)} students"  # Several selected: empty fields keep each one's value
 
         # Define form fields with current values
         fields = [("ID", 550, 162, sid), ("NAME", 550, 220, name), 
@@ -516,7 +689,7 @@ class StudentApp(tk.Tk):
 
         # Create each form field with current values
         for name, x, y, value in fields:
-            e = tk.Entry(self, font=("Arial", 18), relief="flat", borderwidth=0)
+            e = ui.entry(self, "students.field")
             e.insert(0, value)  # Pre-populate with current value
             # Apply appropriate validation
             if name == "ID": 
@@ -528,69 +701,59 @@ class StudentApp(tk.Tk):
             e.place(x=x, y=y, width=295, height=35)
             self.add_widgets.append(e)
             self.update_entries[name] = e
+        if batch:
+            self.update_entries["ID"].config(state="disabled")  # IDs stay as they are
+            hint = ui.label(self, "students.row", text="Empty fields keep each student's value")
+            hint.place(x=550, y=488)
+            self.add_widgets.append(hint)
 
         # Create update button
-        update_btn = tk.Button(self, text="Update", font=("Arial", 14), bg="#f6c03e", fg="#051d40",
-                             relief="flat", borderwidth=0, highlightthickness=0,
-                             activebackground="#f6c03e", activeforeground="#051d40",
-                             command=self.save_updated_student)
+        update_btn = ui.button(self, "students.submit", text="Update",
+                               command=self.save_updated_students if batch else self.save_updated_student)
         update_btn.place(x=650, y=520, width=80, height=40)
         self.add_widgets.append(update_btn)
 
     def save_updated_student(self):
         """Save updated student information"""
         # Get data from form fields
-        sid = self.update_entries["ID"].get().strip()
-        name = self.update_entries["NAME"].get().strip()
-        cw1 = self.update_entries["CW1"].get().strip()
-        cw2 = self.update_entries["CW2"].get().strip()
-        cw3 = self.update_entries["CW3"].get().strip()
-        exam = self.update_entries["EXAM"].get().strip()
-
-        # Validate that all fields are filled
-        if not all([sid, name, cw1, cw2, cw3, exam]):
-            messagebox.showerror("Error", "All fields must be filled.")
+        fields = [self.update_entries[name].get() for name in ("ID", "NAME", "CW1", "CW2", "CW3", "EXAM")]
+
+        # Same checks as the JSON API: all fields filled, a 4-digit ID, marks in range
+        try:
+            row = validate_student(*fields)
+        except ValueError as e:
+            show_error(self, str(e))
             return
+        sid = row[0]
 
-        # Validate Student ID format
-        if not (sid.isdigit() and len(sid) == 4):
-            messagebox.showerror("Error", "Student ID must be exactly 4 digits.")
+        # Check if new ID conflicts with existing students (excluding current student)
+        if sid != self.selected_student_id and sid in self.store:
+            show_error(self, "Another student already has that ID.")
             return
 
-        # Validate and convert marks to integers
-        try:
-            cw1_i, cw2_i, cw3_i = int(cw1), int(cw2), int(cw3)
-            exam_i = int(exam)
-            # Validate coursework marks range
-            if not all(0 <= x <= 20 for x in [cw1_i, cw2_i, cw3_i]):
-                messagebox.showerror("Error", "Coursework marks must be between 0 and 20.")
-                return
-            # Validate exam mark range
-            if not 0 <= exam_i <= 100:
-                messagebox.showerror("Error", "Exam mark must be between 0 and 100.")
-                return
-        except:
-            messagebox.showerror("Error", "Marks must be numeric.")
+        # Save updated data and refresh display (nothing to update if no student was selected)
+        if self.selected_student_id not in self.store or \
+                self.save_change(self.store.update, self.selected_student_id, row):
+            self.show_all_students()
+
+    def save_updated_students(self):
+        """Apply the filled-in fields to every selected student, saving them all with one write"""
+        fields = [self.update_entries[name].get().strip() for name in ("NAME", "CW1", "CW2", "CW3", "EXAM")]
+        if not any(fields):
+            show_error(self, "Fill in the fields to change for the selected students.")
             return
 
-        # Check if new ID conflicts with existing students (excluding current student)
-        rows = self.read_student_file()
-        for r in rows:
-            if r[0] == sid and r[0] != self.selected_student_id:
-                messagebox.showerror("Error", "Another student already has that ID.")
+        # Check every merged record before anything is saved
+        rows = {}
+        for sid in self.selected_ids:
+            current = self.store.get(sid)
+            try:
+                rows[sid] = validate_student(sid, *(new or old for new, old in zip(fields, current[1:])))
+            except ValueError as e:
+                show_error(self, f"Student {sid}: {e}")
                 return
 
-        # Update student data
-        new_rows = []
-        for r in rows:
-            if r[0] == self.selected_student_id:
-                # Replace with updated data
-                new_rows.append([sid, name, str(cw1_i), str(cw2_i), str(cw3_i), str(exam_i)])
-            else: 
-                new_rows.append(r)  # Keep existing student
-
-        # Save updated data and refresh display
-        if self.write_student_file(new_rows):
+        if self.save_change(self.store.update_many, rows):
             self.show_all_students()
 
     def show_highest_student(self):
@@ -604,8 +767,6 @@ class StudentApp(tk.Tk):
         for lbl in self.data_labels: 
             lbl.destroy()
         self.data_labels.clear()
-        if self.summary_label: 
-            self.summary_label.destroy()
 
         rows = self.read_student_file()
         if not rows: 
@@ -629,8 +790,7 @@ class StudentApp(tk.Tk):
             self.highest_name_label.destroy()
 
         # Display student name prominently
-        self.highest_name_label = tk.Label(self, text=highest[1], font=("Arial", 25, "bold"),
-                                         fg="#051d40", bg="#f6c03e")
+        self.highest_name_label = ui.label(self, "students.name", text=highest[1])
         self.highest_name_label.place(x=350, y=160)
 
         # Display header and student details
@@ -639,7 +799,7 @@ class StudentApp(tk.Tk):
         self.header_text.place(x=315, y=249)
 
         line = f"{highest[0]:<6}{highest[1]:<20}{highest[2]:<10}{highest[3]:<7}{highest[4]:<9}{highest[5]:<4}"
-        lbl = tk.Label(self, text=line, font=("Courier New", 12), fg="white", bg="#051d40", anchor="w")
+        lbl = ui.label(self, "students.row", text=line)
         lbl.place(x=315, y=290)
         self.data_labels.append(lbl)
 
@@ -654,8 +814,6 @@ class StudentApp(tk.Tk):
         for lbl in self.data_labels: 
             lbl.destroy()
         self.data_labels.clear()
-        if self.summary_label: 
-            self.summary_label.destroy()
 
         rows = self.read_student_file()
         if not rows: 
@@ -679,8 +837,7 @@ class StudentApp(tk.Tk):
             self.highest_name_label.destroy()
 
         # Display student name prominently
-        self.highest_name_label = tk.Label(self, text=lowest[1], font=("Arial", 25, "bold"),
-                                         fg="#051d40", bg="#f6c03e")
+        self.highest_name_label = ui.label(self, "students.name", text=lowest[1])
         self.highest_name_label.place(x=350, y=160)
 
         # Display header and student details
@@ -689,10 +846,32 @@ class StudentApp(tk.Tk):
         self.header_text.place(x=315, y=249)
 
         line = f"{lowest[0]:<6}{lowest[1]:<20}{lowest[2]:<10}{lowest[3]:<7}{lowest[4]:<9}{lowest[5]:<4}"
-        lbl = tk.Label(self, text=line, font=("Courier New", 12), fg="white", bg="#051d40", anchor="w")
+        lbl = ui.label(self, "students.row", text=line)
         lbl.place(x=315, y=290)
         self.data_labels.append(lbl)
 
+class StudentApp(StudentManager, tk.Tk):
+    """Main application class for Student Management System"""
+
+    def __init__(self):
+        super().__init__()
+        self.withdraw()  # Show the splash while the screens are built
+        splash = ui.Splash(self, "Loading Student Manager...", STARTED)
+        self.build()
+        splash.close()
+        self.deiconify()
+
+class StudentWindow(StudentManager, tk.Toplevel):
+    """Student Management System opened on an existing Tk root"""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.build()
+
+def launch(master):
+    """Open the student manager in its own window (used by the portfolio launcher)"""
+    return StudentWindow(master)
+
 if __name__ == "__main__":
     # Create and run the application
     app = StudentApp()
@@ -0,0 +1,167 @@
+"""Many cohorts of student marks: discovery, parallel parsing and a per-file cache
+
+Each mark file in a directory is one cohort, named after the file. Parsed
+cohorts are cached by path together with the file's modification time and
+size, so switching between them costs a stat() rather than a re-read, and a
+file edited since it was parsed is parsed again on its next use. refresh()
+may run on a worker thread while the GUI thread uses the cache.
+
+    python cohorts.py path/to/cohorts         # per-cohort and overall figures
+"""
+import glob
+import os
+import sys
+import threading
+import time
+
+if __name__ == "__main__":  # student_data needs grading from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from student_data import grading, file_version, read_students, cohort_stats, merge_stats, regrade
+
+# Files in the cohort directory treated as mark files
+COHORT_PATTERN = "*.txt"
+
+# Fewer stale files than this are parsed in-process; starting workers would cost more
+PARALLEL_THRESHOLD = 8
+
+
+def parse_cohort(path):
+    """Parse one mark file, returning (version, rows, stats); runs in worker processes"""
+    version = file_version(path)  # Taken first so an edit during the read is seen as stale later
+    rows = read_students(path)
+    return version, rows, cohort_stats(rows)
+
+
+class Cohort:
+    """One parsed mark file"""
+    def __init__(self, path, version, rows, stats):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.version = version  # file_version() when it was parsed
+        self.rows = rows
+        self.stats = stats
+
+
+class CohortManager:
+    """Mark files in a directory, parsed on demand and cached until they change"""
+    def __init__(self, directory, pattern=COHORT_PATTERN, workers=None):
+        self.directory = directory
+        self.pattern = pattern
+        self.workers = workers      # Worker processes for refresh(); None = one per CPU
+        self.cache = {}             # Path -> Cohort
+        self.errors = {}            # Path -> message for files that could not be parsed
+        self.lock = threading.Lock()  # Guards cache and errors; files are parsed outside it
+
+    def discover(self):
+        """Paths of every mark file in the directory, sorted"""
+        return sorted(glob.glob(os.path.join(self.directory, self.pattern)))
+
+    def path(self, name):
+        """Path of the cohort with the given name"""
+        return os.path.join(self.directory, name + os.path.splitext(self.pattern)[1])
+
+    def get(self, name):
+        """Return a cohort, parsing its file only if it changed since it was cached"""
+        path = self.path(name)
+        with self.lock:
+            cohort = self.cache.get(path)
+        if cohort is None or cohort.version != file_version(path):
+            cohort = Cohort(path, *parse_cohort(path))
+            with self.lock:
+                self.cache[path] = cohort
+                self.errors.pop(path, None)
+        return cohort
+
+    def refresh(self):
+        """Parse every new or changed mark file, in parallel when there are many
+
+        Returns the cohorts in name order; unreadable files are listed in
+        self.errors instead.
+        """
+        paths = self.discover()
+        with self.lock:
+            for path in set(self.cache) - set(paths):
+                del self.cache[path]  # File was deleted
+            cached = dict(self.cache)
+        stale = []
+        for path in paths:
+            cohort = cached.get(path)
+            try:
+                if cohort is None or cohort.version != file_version(path):
+                    stale.append(path)
+            except OSError as e:
+                self._failed(path, e)
+
+        workers = self.workers or os.cpu_count() or 1
+        if len(stale) < PARALLEL_THRESHOLD or workers == 1:
+            for path in stale:
+                self._parsed(path, parse_cohort, path)
+        else:
+            from concurrent.futures import ProcessPoolExecutor  # Deferred so the GUI does not pay for it at start-up
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(path, pool.submit(parse_cohort, path)) for path in stale]
+                for path, future in futures:
+                    self._parsed(path, future.result)
+        with self.lock:
+            return [self.cache[path] for path in paths if path in self.cache]
+
+    def _parsed(self, path, result, *args):
+        """Cache the result of parsing path, or record why it failed"""
+        try:
+            cohort = Cohort(path, *result(*args))
+        except (OSError, UnicodeDecodeError) as e:
+            self._failed(path, e)
+            return
+        with self.lock:
+            self.cache[path] = cohort
+            self.errors.pop(path, None)
+
+    def _failed(self, path, error):
+        """Drop path from the cache and record why it could not be read"""
+        with self.lock:
+            self.cache.pop(path, None)
+            self.errors[path] = str(error)
+
+    def regrade(self, scheme=None):
+        """Redo every cached cohort's grade distribution from its stored percentages"""
+        with self.lock:
+            for cohort in self.cache.values():
+                regrade(cohort.stats, scheme)
+
+    def summary(self):
+        """Figures across every cached cohort"""
+        with self.lock:
+            return merge_stats(cohort.stats for cohort in self.cache.values())
+
+
+def main(argv=None):
+    # Command line entry point: parse a directory of cohorts and print their figures
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarise a directory of student mark files")
+    parser.add_argument("directory")
+    parser.add_argument("--pattern", default=COHORT_PATTERN)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    manager = CohortManager(args.directory, args.pattern, args.workers)
+    started = time.perf_counter()
+    cohorts = manager.refresh()
+    parsed = time.perf_counter() - started
+    started = time.perf_counter()
+    manager.refresh()
+    cached = time.perf_counter() - started
+
+    for cohort in cohorts:
+        stats = cohort.stats
+        print(f"{cohort.name:<24} {stats['count']:>7} students  average {stats['average']:6.2f}%")
+    for path, error in sorted(manager.errors.items()):
+        print(f"{os.path.basename(path):<24} skipped: {error}")
+    overall = manager.summary()
+    grades = "  ".join(f"{grade}: {overall['grades'][grade]}" for grade in reversed(grading.scheme("students").grades))
+    print(f"All {len(cohorts)} cohorts: {overall['count']} students, average {overall['average']}%")
+    print(f"Grades  {grades}")
+    print(f"Parsed in {parsed:.2f}s; checked again from the cache in {cached * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Term-end report cards for every student in one or more mark files
+
+Cards are rendered in worker processes, one chunk of students per task,
+from a template compiled once per process; each worker writes the files of
+the chunk it rendered. A manifest in the output directory records a digest
+of everything each card shows, so a later run only redoes students whose
+marks or cohort rank changed (or everyone, if the template changed).
+
+    python report_cards.py                                # studentMarks.txt -> report_cards/
+    python report_cards.py cohorts/*.txt --format txt --out cards
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import string
+import sys
+import time
+from bisect import bisect_right
+from itertools import chain, count, islice
+
+if __name__ == "__main__":  # student_data needs grading from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from student_data import calculate_grade, iter_students, student_marks
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MARKS = os.path.join(BASE_DIR, "studentMarks.txt")
+DEFAULT_OUT = os.path.join(BASE_DIR, "report_cards")
+MANIFEST = "manifest.json"
+
+CHUNK = 500  # Cards per worker task
+PARALLEL_MIN = 2000  # Fewer cards than this are rendered in-process; starting workers would cost more
+
+# Everything a card can show
+FIELDS = ("cohort", "sid", "name", "cw1", "cw2", "cw3", "coursework", "exam", "percent", "grade", "rank", "size")
+
+TEMPLATES = {
+    "html": """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Report card: {name}</title>
+<style>
+@page {{ size: A4; margin: 2cm; }}
+body {{ font-family: Arial, sans-serif; color: #051d40; }}
+h1 {{ background: #213159; color: white; padding: 12px 16px; font-size: 22px; }}
+table {{ border-collapse: collapse; width: 100%; margin: 16px 0; }}
+th, td {{ border: 1px solid #9fb3d9; padding: 6px 10px; text-align: left; }}
+th {{ width: 40%; background: #eef2fa; }}
+.grade {{ font-size: 30px; font-weight: bold; color: #f6c03e; background: #051d40; padding: 6px 18px; }}
+</style>
+</head>
+<body>
+<h1>Report card &ndash; {cohort}</h1>
+<p><strong>{name}</strong> &middot; Student ID {sid}</p>
+<table>
+<tr><th>Coursework 1</th><td>{cw1} / 20</td></tr>
+<tr><th>Coursework 2</th><td>{cw2} / 20</td></tr>
+<tr><th>Coursework 3</th><td>{cw3} / 20</td></tr>
+<tr><th>Coursework total</th><td>{coursework} / 60</td></tr>
+<tr><th>Exam</th><td>{exam} / 100</td></tr>
+<tr><th>Overall</th><td>{percent}%</td></tr>
+<tr><th>Cohort rank</th><td>{rank} of {size}</td></tr>
+</table>
+<p>Grade <span class="grade">{grade}</span></p>
+</body>
+</html>
+""",
+    # Form feed at the end so a batch of cards prints one per page
+    "txt": """REPORT CARD - {cohort}
+==============================================
+
+Student:          {name}
+Student ID:       {sid}
+
+Coursework 1:     {cw1:>3} / 20
+Coursework 2:     {cw2:>3} / 20
+Coursework 3:     {cw3:>3} / 20
+Coursework total: {coursework:>3} / 60
+Exam:             {exam:>3} / 100
+
+Overall:          {percent}%
+Grade:            {grade}
+Cohort rank:      {rank} of {size}
+\f""",
+}
+
+_compiled = {}  # Format -> render function, built once per process
+
+
+def compile_template(fmt):
+    """Return a function rendering a card's fields with the template for fmt
+
+    The template's fields are checked once here rather than on every card;
+    HTML cards have their values escaped.
+    """
+    template = TEMPLATES[fmt]
+    used = {field for _, field, _, _ in string.Formatter().parse(template) if field}
+    unknown = used - set(FIELDS)
+    if unknown:
+        raise ValueError(f"unknown fields in the {fmt} template: {', '.join(sorted(unknown))}")
+    render = template.format_map
+    if fmt == "html":
+        return lambda fields: render({key: html.escape(str(value)) for key, value in fields.items()})
+    return render
+
+
+def render_chunk(fmt, out_dir, cards):
+    """Render and write a chunk of (file name, fields) cards; runs in worker processes"""
+    render = _compiled.get(fmt)
+    if render is None:
+        render = _compiled[fmt] = compile_template(fmt)
+    for filename, fields in cards:
+        with open(os.path.join(out_dir, filename), "w", encoding="utf-8") as f:
+            f.write(render(fields))
+    return len(cards)
+
+
+def safe_name(text):
+    """Text made safe to use in a file name"""
+    return re.sub(r"[^\w.-]", "_", text.strip()) or "_"
+
+
+def unique_name(filename, taken, path, sid):
+    """A name for a card whose plain name is taken: a digest of its file and ID before the extension
+
+    Repeats of the same ID in one file get the next free digest, in file
+    order, so each card keeps its name from one run to the next.
+    """
+    stem, ext = os.path.splitext(filename)
+    for n in count():
+        key = f"{os.path.abspath(path)}\0{sid}\0{n}"
+        candidate = f"{stem}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}{ext}"
+        if candidate not in taken:
+            return candidate
+
+
+def ranked_students(path):
+    """Yield (row, marks, rank, cohort size) for each student in a mark file
+
+    Rank 1 is the best percentage and equal percentages share a rank.
+    Rows with non-numeric marks are skipped.
+    """
+    with open(path, "r") as f:
+        students = []
+        for row in iter_students(f):
+            try:
+                students.append((row, student_marks(row)))
+            except ValueError:
+                continue
+    percents = sorted(marks[2] for _, marks in students)
+    size = len(percents)
+    for row, marks in students:
+        yield row, marks, size - bisect_right(percents, marks[2]) + 1, size
+
+
+def card_fields(cohort, row, marks, rank, size):
+    """Everything one student's card shows"""
+    coursework, exam, percent = marks
+    return {"cohort": cohort, "sid": row[0], "name": row[1], "cw1": row[2], "cw2": row[3], "cw3": row[4],
+            "coursework": coursework, "exam": exam, "percent": percent,
+            "grade": calculate_grade(percent), "rank": rank, "size": size}
+
+
+def card_digest(fields):
+    """Digest of a card's content; an unchanged digest means the old file is still right"""
+    text = "\x1f".join(str(fields[key]) for key in FIELDS)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def load_manifest(out_dir):
+    """The previous run's manifest, or an empty one"""
+    try:
+        with open(os.path.join(out_dir, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    """Write the manifest atomically, so an interrupted run leaves the old one intact"""
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+
+def chunks(items, size):
+    """Split an iterable into lists of up to size items, lazily"""
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+
+def generate(paths, out_dir=DEFAULT_OUT, fmt="html", workers=None, full=False):
+    """Write report cards for every student in the mark files at paths
+
+    Only cards whose content changed since the last run are rendered,
+    unless full is set. Returns counts of cards written, unchanged,
+    removed and renamed.
+
+    A card is named after its cohort and student ID. When that name is
+    already taken (a repeated ID, same-named cohorts from different
+    directories, or names safe_name() makes alike) a short digest of the
+    mark file's path and the ID is added, so no card overwrites another.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    template_digest = hashlib.sha1((fmt + TEMPLATES[fmt]).encode("utf-8")).hexdigest()
+    old_cards = manifest.get("cards", {})
+    previous = {} if full or manifest.get("template") != template_digest else old_cards
+    cards = {}  # File name -> digest, for the new manifest
+    renamed = []  # File names given a digest because the plain name was taken
+
+    def changed():
+        # Stream students file by file, yielding only the cards that need rendering
+        for path in paths:
+            cohort = os.path.splitext(os.path.basename(path))[0]
+            for row, marks, rank, size in ranked_students(path):
+                fields = card_fields(cohort, row, marks, rank, size)
+                filename = f"{safe_name(cohort)}-{safe_name(row[0])}.{fmt}"
+                if filename in cards:
+                    filename = unique_name(filename, cards, path, row[0])
+                    renamed.append(filename)
+                cards[filename] = digest = card_digest(fields)
+                if previous.get(filename) != digest or not os.path.exists(os.path.join(out_dir, filename)):
+                    yield filename, fields
+
+    todo = changed()
+    first = list(islice(todo, PARALLEL_MIN))
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    if len(first) < PARALLEL_MIN or workers == 1:
+        for chunk in chunks(chain(first, todo), CHUNK):
+            written += render_chunk(fmt, out_dir, chunk)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for chunk in chunks(chain(first, todo), CHUNK):
+                pending.append(pool.submit(render_chunk, fmt, out_dir, chunk))
+                if len(pending) >= workers * 2:  # Keep only a few chunks in flight
+                    written += pending.pop(0).result()
+            written += sum(future.result() for future in pending)
+
+    # Cards of students who are no longer in any file
+    removed = 0
+    for filename in set(old_cards) - set(cards):
+        try:
+            os.remove(os.path.join(out_dir, filename))
+            removed += 1
+        except FileNotFoundError:
+            pass
+    save_manifest(out_dir, {"template": template_digest, "cards": cards})
+    return {"written": written, "unchanged": len(cards) - written, "removed": removed, "renamed": len(renamed)}
+
+
+def main(argv=None):
+    # Command line entry point for a term-end batch
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate a report card for every student")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_MARKS], metavar="marks.txt",
+                        help="mark files, one cohort each (default: studentMarks.txt)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory")
+    parser.add_argument("--format", choices=sorted(TEMPLATES), default="html")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--full", action="store_true", help="regenerate every card, not only changed ones")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    counts = generate(args.paths, args.out, args.format, args.workers, args.full)
+    elapsed = time.perf_counter() - started
+    print(f"{counts['written']} cards written, {counts['unchanged']} unchanged, "
+          f"{counts['removed']} removed in {elapsed:.2f}s -> {args.out}")
+    if counts["renamed"]:
+        print(f"{counts['renamed']} cards had a name already in use (repeated student IDs or cohort names); "
+              "their file names end in a digest")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""A local JSON API over a mark file, for scripts that read or update marks without the window
+
+    python student_api.py                         # serve studentMarks.txt on 127.0.0.1:8780
+    python student_api.py --file cohort.txt --port 9000
+
+Endpoints (request and response bodies are JSON):
+
+    GET    /students?offset=0&limit=100       students in file order
+    GET    /students/search?q=smi&limit=20    ID prefix or (fuzzy) name, best first
+    GET    /students/highest                  best overall percentage
+    GET    /students/lowest                   worst overall percentage
+    GET    /students/<id>
+    POST   /students                          {"id", "name", "cw1", "cw2", "cw3", "exam"}
+    PUT    /students/<id>                     any of those fields; the others are kept
+    DELETE /students/<id>
+    GET    /statistics                        count, average, highest, lowest, grades
+
+Reads are answered from memory: a StudentStore, the search index and a
+sorted list of percentages that all follow the store's change events.
+Writes are queued to a single writer task, which checks them with the same
+rules as the app's forms and applies them one at a time, so a change
+is never based on a record another client is halfway through replacing.
+Each runs on one worker thread, which holds the file's lock alone while it
+waits for other editors, reads and writes; reads are answered on the event
+loop meanwhile and only wait the moment the written change is patched into
+memory (StudentStore's `patching` lock). Changes other editors save to the
+file are merged in before each write and checked for every second; an
+update to a student one of them changed in the meantime is refused with
+409 Conflict.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+from bisect import bisect_left, insort
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from itertools import islice
+from urllib.parse import parse_qs, unquote, urlsplit
+
+if __name__ == "__main__":  # student_data needs grading from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from student_data import grading, calculate_grade, read_snapshot, student_marks, validate_student
+from student_index import StudentIndex
+from student_store import ConflictError, StudentStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FILE = os.path.join(BASE_DIR, "studentMarks.txt")
+DEFAULT_PORT = 8780
+FIELDS = ("id", "name", "cw1", "cw2", "cw3", "exam")  # JSON names of a row's fields, in file order
+PAGE_SIZE = 100      # Students per /students page unless ?limit= says otherwise
+MAX_LIMIT = 1000     # Most students one list or search response may hold
+MAX_BODY = 64 * 1024  # Largest request body accepted, in bytes
+WATCH_INTERVAL = 1.0  # Seconds between checks for the file being changed by someone else
+
+
+class ApiError(Exception):
+    """A request that cannot be served, with the HTTP status to answer it with"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def student_json(row):
+    """A student row as the API shows it, with its totals and grade"""
+    student = dict(zip(FIELDS, row))
+    try:
+        coursework, exam, percent = student_marks(row)
+    except ValueError:
+        student.update(coursework=None, percent=None, grade=None)  # Marks in the file are not numeric
+        return student
+    for field in FIELDS[2:]:
+        student[field] = int(student[field])
+    student.update(coursework=coursework, percent=percent, grade=calculate_grade(percent))
+    return student
+
+
+def encode(status, payload, keep_alive):
+    """Encode one HTTP response with a JSON body"""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def read_request(reader):
+    """Read one HTTP request; returns (method, target, keep_alive, body), or None once the client is done
+
+    A request that cannot be served raises ApiError; a line longer than the
+    stream's limit raises ValueError and a cut-off body IncompleteReadError.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise ApiError(400, "Malformed request line") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+    length = headers.get("content-length", "0")
+    if not length.isdigit() or int(length) > MAX_BODY:
+        raise ApiError(413 if length.isdigit() else 400, "Bad request body")
+    body = await reader.readexactly(int(length)) if int(length) else b""
+    return method.upper(), target, keep_alive, body
+
+
+class Rankings:
+    """Every numeric percentage in a store, kept sorted as students change
+
+    Highest, lowest and the grade distribution are then a lookup or a few
+    bisects instead of a pass over the whole cohort.
+    """
+    def __init__(self, rows=()):
+        self.ranked = sorted(filter(None, map(self._entry, rows)))  # (percent, id), lowest first
+        self.percents = [percent for percent, _ in self.ranked]
+
+    @staticmethod
+    def _entry(row):
+        try:
+            return student_marks(row)[2], row[0]
+        except ValueError:
+            return None  # Non-numeric marks are left out of the figures
+
+    def add(self, row):
+        entry = self._entry(row)
+        if entry:
+            insort(self.ranked, entry)
+            insort(self.percents, entry[0])
+
+    def remove(self, row):
+        entry = self._entry(row)
+        if entry:
+            del self.ranked[bisect_left(self.ranked, entry)]
+            del self.percents[bisect_left(self.percents, entry[0])]
+
+    def store_changed(self, event, *args):
+        """StudentStore listener"""
+        if event == "insert":
+            self.add(args[1])
+        elif event == "update":
+            self.remove(args[1])
+            self.add(args[2])
+        elif event == "remove":
+            self.remove(args[1])
+
+    def highest(self):
+        """ID of the student with the best percentage, or None"""
+        return self.ranked[-1][1] if self.ranked else None
+
+    def lowest(self):
+        """ID of the student with the worst percentage, or None"""
+        return self.ranked[0][1] if self.ranked else None
+
+    def grades(self, scheme):
+        """Students per grade, best grade first"""
+        counts = scheme.distribution(self.percents)
+        return {grade: counts[grade] for grade in reversed(scheme.grades)}
+
+
+class StudentAPI:
+    """Serves one mark file over HTTP; see the module docstring for the endpoints"""
+    def __init__(self, path):
+        self.path = path
+        self.writes = None  # Queue of (change, args, future), created with the event loop
+        self.worker = ThreadPoolExecutor(max_workers=1)  # Runs changes and refreshes, one at a time, off the loop
+        self.memory = threading.Lock()  # Held while the store and its views are read, or patched after a write
+        self.load()
+
+    def load(self):
+        """Read the mark file and build the in-memory views of it"""
+        version, digest, rows = read_snapshot(self.path)
+        self.store = StudentStore(self.path, rows, version, digest, patching=self.memory)
+        self.index = StudentIndex(rows)
+        self.rankings = Rankings(rows)
+        self.store.subscribe(self.index.store_changed)
+        self.store.subscribe(self.rankings.store_changed)
+
+    async def watch(self):
+        # Check now and then for edits saved by other editors (e.g. the app), so reads do not go stale for long
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            try:
+                await loop.run_in_executor(self.worker, self.store.refresh)  # Applies just the students they changed
+            except OSError:
+                pass  # Keep serving what was last read; the next write reports the problem
+
+    async def write(self, change, *args):
+        """Queue a change for the writer task and wait for its result"""
+        done = asyncio.get_running_loop().create_future()
+        await self.writes.put((change, args, done))
+        return await done
+
+    async def writer(self):
+        # Apply queued changes one at a time, in the order they arrived
+        loop = asyncio.get_running_loop()
+        while True:
+            change, args, done = await self.writes.get()
+            if done.cancelled():
+                continue  # The client went away while it waited
+            try:
+                result = await loop.run_in_executor(self.worker, change, *args)
+            except Exception as e:
+                if not done.cancelled():
+                    done.set_exception(e)
+            else:
+                if not done.cancelled():
+                    done.set_result(result)
+
+    # Reads, answered straight from memory (dispatch holds self.memory)
+
+    def list_students(self, query):
+        offset = self._int_param(query, "offset", 0, 0, len(self.store))
+        limit = self._int_param(query, "limit", PAGE_SIZE, 1, MAX_LIMIT)
+        rows = islice(self.store, offset, offset + limit)
+        return 200, {"total": len(self.store), "offset": offset, "students": list(map(student_json, rows))}
+
+    def search(self, query):
+        text = query.get("q", [""])[0].strip()
+        if not text:
+            raise ApiError(400, "Give the text to search for as ?q=")
+        limit = self._int_param(query, "limit", 20, 1, MAX_LIMIT)
+        return 200, {"query": text, "students": list(map(student_json, self.index.search(text, limit)))}
+
+    def get_student(self, sid):
+        return 200, student_json(self._row(sid))
+
+    def ranked_student(self, sid):
+        if sid is None:
+            raise ApiError(404, "No students with numeric marks.")
+        return 200, student_json(self.store.get(sid))
+
+    def statistics(self):
+        grading.reload()  # Show current boundaries if grading.json was edited
+        highest, lowest = self.rankings.highest(), self.rankings.lowest()
+        return 200, {"count": len(self.store), "marked": self.store.marked, "average": self.store.average,
+                     "highest": highest and student_json(self.store.get(highest)),
+                     "lowest": lowest and student_json(self.store.get(lowest)),
+                     "grades": self.rankings.grades(grading.scheme("students"))}
+
+    # Writes, run by the writer task on the worker thread
+
+    def create(self, body):
+        row = self._validated({field: body.get(field) for field in FIELDS})
+        try:
+            self.store.insert(row)
+        except ValueError as e:
+            raise ApiError(409, str(e)) from None  # Duplicate Student ID
+        return 201, student_json(row)
+
+    def update(self, sid, body):
+        current = dict(zip(FIELDS, self._row(sid)))
+        row = self._validated({field: body.get(field, current[field]) for field in FIELDS})
+        try:
+            self.store.update(sid, row)
+        except ValueError as e:
+            raise ApiError(409, str(e)) from None  # The new ID belongs to someone else
+        return 200, student_json(row)
+
+    def delete(self, sid):
+        row = self._row(sid)
+        self.store.remove(sid)
+        return 200, student_json(row)
+
+    def _row(self, sid):
+        row = self.store.get(sid)
+        if row is None:
+            raise ApiError(404, "Student not found.")
+        return row
+
+    @staticmethod
+    def _validated(fields):
+        try:
+            return validate_student(*("" if fields[field] is None else fields[field] for field in FIELDS))
+        except ValueError as e:
+            raise ApiError(400, str(e)) from None
+
+    @staticmethod
+    def _int_param(query, name, default, lowest, highest):
+        try:
+            value = int(query.get(name, [default])[0])
+        except ValueError:
+            raise ApiError(400, f"{name} must be a whole number") from None
+        return max(lowest, min(value, highest))
+
+    @staticmethod
+    def _json_body(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON") from None
+        if not isinstance(data, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return data
+
+    async def dispatch(self, method, target, body):
+        """Route one request; returns (status, payload)"""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        query = parse_qs(url.query)
+        try:
+            if parts == ["statistics"]:
+                if method != "GET":
+                    raise ApiError(405, "Use GET")
+                with self.memory:
+                    return self.statistics()
+            if parts[0] != "students" or len(parts) > 2:
+                raise ApiError(404, "No such endpoint")
+            if len(parts) == 1:
+                if method == "GET":
+                    with self.memory:
+                        return self.list_students(query)
+                if method == "POST":
+                    return await self.write(self.create, self._json_body(body))
+                raise ApiError(405, "Use GET or POST")
+            name = parts[1]
+            if name in ("search", "highest", "lowest"):  # Student IDs are digits, so these never clash
+                if method != "GET":
+                    raise ApiError(405, "Use GET")
+                with self.memory:
+                    if name == "search":
+                        return self.search(query)
+                    return self.ranked_student(self.rankings.highest() if name == "highest"
+                                               else self.rankings.lowest())
+            if method == "GET":
+                with self.memory:
+                    return self.get_student(name)
+            if method == "PUT":
+                return await self.write(self.update, name, self._json_body(body))
+            if method == "DELETE":
+                return await self.write(self.delete, name)
+            raise ApiError(405, "Use GET, PUT or DELETE")
+        except ApiError as e:
+            return e.status, {"error": e.message}
+        except ConflictError as e:
+            return 409, {"error": str(e)}  # Someone else changed the student since it was read
+        except TimeoutError as e:
+            return 503, {"error": str(e)}  # Another editor held the file's lock too long
+        except OSError as e:
+            return 500, {"error": f"Error saving file: {e}"}
+
+    async def handle_client(self, reader, writer):
+        # Serve one connection's requests in turn, keeping it open between them unless asked not to
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ApiError as e:
+                    writer.write(encode(e.status, {"error": e.message}, False))
+                    break
+                except (asyncio.IncompleteReadError, ValueError):
+                    break  # Client went away mid-request, or sent a line longer than the stream limit
+                if request is None:
+                    break
+                method, target, keep_alive, body = request
+                status, payload = await self.dispatch(method, target, body)
+                writer.write(encode(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass  # Client went away
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        # Listen for clients and apply their writes until interrupted
+        self.writes = asyncio.Queue()
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"Student Manager API for {os.path.basename(self.path)} ({len(self.store)} students) "
+              f"on http://{host}:{port}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.writer(), self.watch())
+
+
+def main(argv=None):
+    # Command line entry point for serving a mark file
+    parser = argparse.ArgumentParser(description="Serve a Student Manager mark file as a local JSON API")
+    parser.add_argument("--file", default=DEFAULT_FILE, help="mark file to serve (default: studentMarks.txt)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: this machine only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    try:
+        api = StudentAPI(args.file)
+    except OSError as e:
+        parser.error(f"cannot read {args.file}: {e}")
+    try:
+        asyncio.run(api.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Many concurrent clients against student_api.py, reporting latency per kind of request
+
+    python student_api.py --file /tmp/copy.txt &
+    python student_api_loadtest.py --clients 100 --requests 200
+
+Writes put each student's own marks back, so the data is unchanged
+afterwards, but the file is still rewritten: point the server at a copy.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import quote
+
+if __name__ == "__main__":  # student_api's marks code needs grading from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from student_api import DEFAULT_PORT
+
+# Share of requests of each kind (weights, not necessarily summing to 1)
+MIX = {"get": 40, "search": 25, "list": 10, "statistics": 10, "highest": 5, "update": 10}
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection"""
+    def __init__(self, reader, writer, host):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+
+    async def request(self, method, path, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+                          .encode("latin-1") + body)
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+
+class LoadStats:
+    # Results gathered across every simulated client
+    def __init__(self):
+        self.latency = defaultdict(list)  # Kind of request -> seconds per request
+        self.failures = defaultdict(int)  # Kind of request -> non-2xx responses
+
+
+async def client(index, args, students, stats):
+    # One simulated script: a stream of mixed requests over one connection
+    rng = random.Random(index)
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    conn = Client(reader, writer, args.host)
+    kinds, weights = zip(*MIX.items())
+    try:
+        for _ in range(args.requests):
+            kind = rng.choices(kinds, weights)[0]
+            student = rng.choice(students)
+            if kind == "get":
+                call = ("GET", f"/students/{student['id']}")
+            elif kind == "search":
+                call = ("GET", f"/students/search?q={quote(student['name'][:rng.randint(2, 5)])}")
+            elif kind == "list":
+                call = ("GET", f"/students?offset={rng.randrange(max(1, len(students)))}&limit=50")
+            elif kind == "statistics":
+                call = ("GET", "/statistics")
+            elif kind == "highest":
+                call = ("GET", rng.choice(["/students/highest", "/students/lowest"]))
+            else:
+                call = ("PUT", f"/students/{student['id']}", {"exam": student["exam"]})
+            started = time.perf_counter()
+            status, _ = await conn.request(*call)
+            stats.latency[kind].append(time.perf_counter() - started)
+            if status >= 300:
+                stats.failures[kind] += 1
+    finally:
+        writer.close()
+
+
+async def fetch_students(args):
+    # Read every student through the API, so the clients have real IDs and names to use
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    conn = Client(reader, writer, args.host)
+    students, offset = [], 0
+    try:
+        while True:
+            _, page = await conn.request("GET", f"/students?offset={offset}&limit=1000")
+            students += [s for s in page["students"] if s["percent"] is not None]
+            offset += len(page["students"])
+            if offset >= page["total"] or not page["students"]:
+                return students
+    finally:
+        writer.close()
+
+
+async def run(args):
+    # Start every client at once and wait for them all to finish
+    students = await fetch_students(args)
+    if not students:
+        print("The server has no students with numeric marks to test with")
+        return
+    stats = LoadStats()
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client(i, args, students, stats) for i in range(args.clients)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    errors = [r for r in results if isinstance(r, Exception)]
+
+    done = sum(map(len, stats.latency.values()))
+    print(f"{args.clients} clients, {len(errors)} failed; {done} requests in {elapsed:.1f}s "
+          f"({done / elapsed:.0f} requests/s) against {len(students)} students")
+    for kind, latency in sorted(stats.latency.items()):
+        latency.sort()
+        p95 = latency[max(0, int(len(latency) * 0.95) - 1)]
+        print(f"  {kind:<11} {len(latency):>6}  median {statistics.median(latency) * 1000:6.1f} ms  "
+              f"p95 {p95 * 1000:6.1f} ms  max {latency[-1] * 1000:6.1f} ms  non-2xx {stats.failures[kind]}")
+    for error in errors[:5]:
+        print(f"  {type(error).__name__}: {error}")
+
+
+def main(argv=None):
+    # Command line entry point for load testing the student API
+    parser = argparse.ArgumentParser(description="Simulate many clients against the Student Manager API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="requests sent by each client")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
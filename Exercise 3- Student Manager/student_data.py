@@ -0,0 +1,243 @@
+"""Student mark files and the marks arithmetic shared by the Student Manager tools
+
+Nothing here touches Tk, so worker processes can import it cheaply.
+"""
+import hashlib
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import msvcrt  # Windows
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+# Grade boundaries are shared with the Math Quiz from the repository root,
+# which the program importing this module has put on the path
+import grading
+
+# Three coursework marks out of 20 plus an exam out of 100
+TOTAL_MARKS = 160
+COURSEWORK_MAX = 20
+EXAM_MAX = 100
+ID_DIGITS = 4
+
+# Seconds to wait for another editor to finish saving a mark file
+LOCK_TIMEOUT = 10.0
+
+
+def calculate_grade(percent):
+    """Letter grade for a percentage, from the "students" scheme in grading.json"""
+    return grading.scheme("students").grade(percent)
+
+
+def student_marks(row):
+    """Return (total coursework, exam, percentage) for a student row"""
+    cw1, cw2, cw3, exam = map(int, row[2:6])
+    coursework = cw1 + cw2 + cw3
+    return coursework, exam, round(((coursework + exam) / TOTAL_MARKS) * 100, 2)
+
+
+def typed_id(text):
+    """Whether text can still become a Student ID (checked on each keystroke)"""
+    if text == "": return True  # Allow empty field during typing
+    return text.isdigit() and len(text) <= ID_DIGITS  # Must be digits and max 4 chars
+
+
+def typed_mark(text, maximum):
+    """Whether text can still become a mark from 0 to maximum (checked on each keystroke)"""
+    if text == "": return True  # Allow empty field during typing
+    if not text.isdigit(): return False  # Must be numeric
+    if len(text) > len(str(maximum)): return False  # No more digits than the maximum has
+    return int(text) <= maximum
+
+
+def validate_student(sid, name, cw1, cw2, cw3, exam):
+    """Check a complete record as the add and update forms do
+
+    Returns the row to store, with marks written without leading zeros;
+    raises ValueError with the message to show the user otherwise.
+    """
+    fields = [str(field).strip() for field in (sid, name, cw1, cw2, cw3, exam)]
+    sid, name, cw1, cw2, cw3, exam = fields
+
+    # Validate that all fields are filled
+    if not all(fields):
+        raise ValueError("All fields must be filled.")
+
+    # Validate Student ID format
+    if not (sid.isdigit() and len(sid) == ID_DIGITS):
+        raise ValueError("Student ID must be exactly 4 digits.")
+
+    # Commas and line breaks would split the record in the mark file
+    if "," in name or "\n" in name or "\r" in name:
+        raise ValueError("Name cannot contain commas or line breaks.")
+
+    # Validate and convert marks to integers
+    try:
+        cw1_i, cw2_i, cw3_i, exam_i = int(cw1), int(cw2), int(cw3), int(exam)
+    except ValueError:
+        raise ValueError("Marks must be numeric.") from None
+    # Validate coursework marks range
+    if not all(0 <= x <= COURSEWORK_MAX for x in [cw1_i, cw2_i, cw3_i]):
+        raise ValueError("Coursework marks must be between 0 and 20.")
+    # Validate exam mark range
+    if not 0 <= exam_i <= EXAM_MAX:
+        raise ValueError("Exam mark must be between 0 and 100.")
+    return [sid, name, str(cw1_i), str(cw2_i), str(cw3_i), str(exam_i)]
+
+
+def iter_students(lines):
+    """Yield [id, name, cw1, cw2, cw3, exam] rows from the lines of a mark file, one at a time"""
+    for number, line in enumerate(lines):
+        line = line.strip()
+        if number == 0 and line.isdigit(): continue  # Skip first line if it's just a count
+        if not line: continue  # Skip empty lines
+        parts = line.split(",")
+        if len(parts) >= 6:
+            yield parts[:6]  # Extra fields are ignored
+
+
+def parse_student_lines(lines):
+    """Parse the lines of a mark file into a list of student rows"""
+    return list(iter_students(lines))
+
+
+def read_students(path):
+    """Read and parse a mark file (OSError if it cannot be read)"""
+    with open(path, "r") as f:
+        return parse_student_lines(f)
+
+
+def read_snapshot(path, known_digest=None):
+    """Read a mark file as (file_version, content digest, rows), for spotting other editors' changes
+
+    rows is None when the digest equals known_digest: the contents are
+    those already held, so they are not parsed again.
+    """
+    version = file_version(path)  # Taken first so an edit during the read is seen as stale later
+    with open(path, "r") as f:
+        text = f.read()
+    digest = content_digest(text)
+    return version, digest, None if digest == known_digest else parse_student_lines(text.splitlines())
+
+
+def format_students(rows):
+    """The text of a mark file holding these rows, count first"""
+    return "".join([str(len(rows)) + "\n", *(",".join(student) + "\n" for student in rows)])
+
+
+def content_digest(text):
+    """Short fingerprint of a mark file's text; equal digests mean equal contents"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def write_students(path, rows):
+    """Replace a mark file with student rows; returns the digest of what was written
+
+    The rows go to a temporary file that then replaces the mark file in one
+    step, so nobody ever reads a half-written file and a failed write
+    (OSError) leaves the old one intact.
+    """
+    text = format_students(rows)
+    with open(path + ".tmp", "w") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+    return content_digest(text)
+
+
+def file_version(path):
+    """Modification time and size; a different value means data parsed from the file is stale"""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _try_lock(f):
+    try:
+        if msvcrt:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False  # Held by someone else
+
+
+def _unlock(f):
+    if msvcrt:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def locked(path, timeout=LOCK_TIMEOUT):
+    """Hold a mark file's advisory write lock (TimeoutError if another editor keeps it too long)
+
+    The lock is taken on a ".lock" file beside the mark file, since writes
+    replace the mark file itself. It is advisory: every Student Manager
+    tool takes it before writing, but other programs are not stopped.
+    """
+    with open(path + ".lock", "a+b") as f:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(f):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{os.path.basename(path)} is being saved by someone else; please try again.")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+def cohort_stats(rows):
+    """Summary statistics for a list of student rows
+
+    The percentages are kept, sorted, so regrade() can redo the grade
+    distribution without parsing the file again.
+    """
+    stats = {"count": 0, "total": 0.0, "highest": None, "lowest": None, "percents": []}
+    best = worst = None
+    for row in rows:
+        try:
+            percent = student_marks(row)[2]
+        except ValueError:
+            continue  # Non-numeric marks are left out of the figures
+        stats["count"] += 1
+        stats["total"] += percent
+        stats["percents"].append(percent)
+        if best is None or percent > best:
+            best, stats["highest"] = percent, row
+        if worst is None or percent < worst:
+            worst, stats["lowest"] = percent, row
+    stats["average"] = round(stats["total"] / stats["count"], 2) if stats["count"] else 0
+    stats["percents"].sort()
+    return regrade(stats)
+
+
+def regrade(stats, scheme=None):
+    """Recompute the grade distribution of cohort_stats() results, e.g. after the boundaries changed"""
+    scheme = scheme or grading.scheme("students")
+    stats["grades"] = scheme.distribution(stats["percents"])
+    return stats
+
+
+def merge_stats(all_stats):
+    """Combine cohort_stats results into figures for every student in them"""
+    merged = {"count": 0, "total": 0.0, "highest": None, "lowest": None, "grades": Counter()}
+    for stats in all_stats:
+        if not stats["count"]:
+            continue
+        merged["count"] += stats["count"]
+        merged["total"] += stats["total"]
+        merged["grades"].update(stats["grades"])
+        if merged["highest"] is None or student_marks(stats["highest"])[2] > student_marks(merged["highest"])[2]:
+            merged["highest"] = stats["highest"]
+        if merged["lowest"] is None or student_marks(stats["lowest"])[2] < student_marks(merged["lowest"])[2]:
+            merged["lowest"] = stats["lowest"]
+    merged["average"] = round(merged["total"] / merged["count"], 2) if merged["count"] else 0
+    return merged
@@ -0,0 +1,474 @@
+"""Fuzzy student search: a trigram index over the words of names plus prefix indexes over words and IDs"""
+import heapq
+import os
+import sys
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+
+# A short query word starting at most this many name words, such as "x",
+# narrows a typo search to those names instead of every close word
+NARROW_SPAN = 2000
+
+
+def normalize(text):
+    """Lower-case and collapse whitespace so "  Gareth  S" matches "gareth s\""""
+    return " ".join(text.lower().split())
+
+
+def trigrams(word):
+    """Three-letter slices of a word ("gar", "are", "ret", "eth" for "gareth")"""
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def padded_trigrams(word):
+    """Trigrams of a word with two spaces either side, so its ends count too ("  g", " ga" ... "th ", "h  ")
+
+    A typo in the middle of a short word leaves few of its inner trigrams
+    ("garth" shares only "gar" with "gareth"), but the padded ones at the
+    ends still match.
+    """
+    return trigrams(f"  {word}  ")
+
+
+def similarity(shared, grams, word):
+    """Dice similarity of a query word's padded trigrams and an indexed word sharing `shared` of them"""
+    return 2 * shared / (len(grams) + len(word) + 2)  # A word has len(word) + 2 padded trigrams
+
+
+def shortest_first(lists):
+    """Merge sorted lists of (length, ID), starting on each list only once its first entry is due
+
+    Unlike heapq.merge, which starts on every list up front, this costs one
+    sort of the lists plus the entries actually taken, so a fragment shared
+    by thousands of words costs little more than one shared by a few.
+    """
+    lists = sorted(lists)  # By first entry
+    heap = []
+    following = 0
+    while True:
+        while following < len(lists) and (not heap or lists[following][0] < heap[0][0]):
+            heapq.heappush(heap, (lists[following][0], following, 0))
+            following += 1
+        if not heap:
+            return
+        entry, which, at = heapq.heappop(heap)
+        yield entry
+        if at + 1 < len(lists[which]):
+            heapq.heappush(heap, (lists[which][at + 1], which, at + 1))
+
+
+class StudentIndex:
+    """Student rows keyed by ID, searchable by ID prefix and fuzzy name match
+
+    Keep it in step with the data file by calling add/update/remove whenever
+    a record is written.
+
+    Fragments and typos are matched against the distinct words of the
+    names, which are far fewer than the students, so even a common first
+    letter only means scanning the words that start with it, not every
+    student.
+    """
+    def __init__(self, rows=()):
+        self.rows = {}        # ID -> student row (list of 6 strings)
+        self.names = {}       # ID -> normalized name
+        for row in rows:
+            self._index(row)
+        # Sorted once here; add() and remove() keep them sorted
+        self.words = sorted((word, sid) for sid, name in self.names.items() for word in set(name.split()))
+        self.ids = sorted(self.rows)
+        self.word_ids = {}    # Distinct word -> [(len(name), ID)] of the names using it, shortest first
+        self.word_grams = {}  # Padded trigram (inner ones included) -> set of distinct words containing it
+        for length, sid in sorted((len(name), sid) for sid, name in self.names.items()):
+            for word in set(self.names[sid].split()):
+                if word not in self.word_ids:
+                    self._add_word(word)
+                self.word_ids[word].append((length, sid))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, sid):
+        return sid in self.rows
+
+    def _index(self, row):
+        """Add a row to the ID and name maps"""
+        sid = row[0]
+        name = normalize(row[1])
+        self.rows[sid] = row
+        self.names[sid] = name
+        return name
+
+    def add(self, row):
+        """Index a new student row"""
+        self.remove(row[0])
+        name = self._index(row)
+        for word in set(name.split()):
+            insort(self.words, (word, row[0]))
+            if word not in self.word_ids:
+                self._add_word(word)
+            insort(self.word_ids[word], (len(name), row[0]))
+        insort(self.ids, row[0])
+
+    def remove(self, sid):
+        """Drop a student from the index (no-op if unknown)"""
+        if sid not in self.rows:
+            return
+        del self.rows[sid]
+        name = self.names.pop(sid)
+        for word in set(name.split()):
+            del self.words[bisect_left(self.words, (word, sid))]
+            ids = self.word_ids[word]
+            del ids[bisect_left(ids, (len(name), sid))]
+            if not ids:
+                self._remove_word(word)
+        del self.ids[bisect_left(self.ids, sid)]
+
+    def _add_word(self, word):
+        """Start indexing a word no name used before"""
+        self.word_ids[word] = []
+        for gram in padded_trigrams(word):
+            self.word_grams.setdefault(gram, set()).add(word)
+
+    def _remove_word(self, word):
+        """Stop indexing a word no name uses any more"""
+        del self.word_ids[word]
+        for gram in padded_trigrams(word):
+            words = self.word_grams[gram]
+            words.discard(word)
+            if not words:
+                del self.word_grams[gram]
+
+    def update(self, old_sid, row):
+        """Replace a student's row; the ID itself may change"""
+        self.remove(old_sid)
+        self.add(row)
+
+    def store_changed(self, event, *args):
+        """StudentStore listener keeping the index in step with the store"""
+        if event == "insert":
+            self.add(args[1])
+        elif event == "update":
+            self.update(args[1][0], args[2])
+        elif event == "remove":
+            self.remove(args[1][0])
+
+    def search(self, query, limit=20):
+        """Return up to `limit` student rows best matching query, best first
+
+        Digits match ID prefixes. Otherwise names whose words start with every
+        query word come first ("gareth s" finds Gareth Southgate), then names
+        containing every query word ("uthga"), then names with a word close to
+        each query word, sharing at least half of its padded trigrams, so
+        typos still find a student ("garth", "shaerer" and "jon" find Gareth
+        Southgate, Alan Shearer and John Curry; run this module to check
+        them, and the time they take among 100k students).
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        if query.isdigit():
+            return [self.rows[sid] for sid in self._prefixed_ids(query, limit)]
+
+        tokens = sorted(query.split(), key=len, reverse=True)  # The longest word narrows the most
+        found = self._word_prefix_matches(tokens, limit)
+        if len(found) < limit:
+            long_tokens = [t for t in tokens if len(t) >= 3]
+            short_tokens = [t for t in tokens if len(t) < 3]
+            if long_tokens:
+                found.extend(self._substring_matches(long_tokens, short_tokens, set(found), limit - len(found)))
+                if not found:
+                    found = self._fuzzy_matches(long_tokens, short_tokens, set(), limit)
+        return [self.rows[sid] for sid in found]
+
+    def matches(self, sid, query):
+        """True if a student is an exact (not fuzzy) match for query"""
+        query = normalize(query)
+        if query.isdigit():
+            return sid.startswith(query)
+        tokens = query.split()
+        if self._has_prefixes(sid, tokens):
+            return True
+        long_tokens = [t for t in tokens if len(t) >= 3]
+        if not long_tokens or not self._has_prefixes(sid, [t for t in tokens if len(t) < 3]):
+            return False
+        return all(token in self.names[sid] for token in long_tokens)
+
+    def narrow(self, previous, rows, query, limit=20):
+        """Rank the rows a shorter query returned against a longer one, without a new search
+
+        Returns None when that could miss students: rows were cut off at
+        limit, some were fuzzy matches, query does not extend previous, or
+        previous had a word under three letters (matched as a word prefix
+        only, while "joh" may also match inside "Bjohn").
+        """
+        previous, query = normalize(previous), normalize(query)
+        if not previous or len(rows) >= limit or not query.startswith(previous):
+            return None
+        if previous.isdigit() != query.isdigit():
+            return None
+        if not previous.isdigit() and min(map(len, previous.split())) < 3:
+            return None
+        sids = [row[0] for row in rows if row[0] in self.rows]
+        if not all(self.matches(sid, previous) for sid in sids):
+            return None
+        hits = [sid for sid in sids if self.matches(sid, query)]
+        hits.sort(key=lambda sid: self._rank(sid, query))
+        return [self.rows[sid] for sid in hits]
+
+    def _rank(self, sid, query):
+        """Sort key giving an exact match the place search() would give it"""
+        if query.isdigit():
+            return (0, sid)
+        tokens = query.split()
+        first = max(tokens, key=len)  # search() walks the words starting with the longest token
+        words = sorted(self.names[sid].split())
+        if self._has_prefixes(sid, tokens):
+            return (0, next(word for word in words if word.startswith(first)), sid)
+        return (1, len(self.names[sid]), sid)
+
+    def _prefixed_ids(self, prefix, limit):
+        """Up to `limit` IDs starting with prefix, in order"""
+        start = bisect_left(self.ids, prefix)
+        return [sid for sid in self.ids[start:start + limit] if sid.startswith(prefix)]
+
+    def _has_prefixes(self, sid, prefixes):
+        """True if every prefix starts some word of the student's name"""
+        name = " " + self.names[sid]  # Normalized, so words are split by single spaces
+        return all(" " + p in name for p in prefixes)
+
+    def _word_prefix_matches(self, tokens, limit):
+        """IDs whose name has a word starting with each token, alphabetical by the matched word
+
+        The token starting the fewest words is the one walked.
+        """
+        spans = {token: self._prefix_span(token) for token in tokens}
+        first = min(tokens, key=lambda token: spans[token][1] - spans[token][0])
+        others = [token for token in tokens if token != first]
+        found = {}  # Insertion-ordered set
+        for i in range(*spans[first]):
+            sid = self.words[i][1]
+            if sid not in found and self._has_prefixes(sid, others):
+                found[sid] = None
+                if len(found) == limit:
+                    break
+        return list(found)
+
+    def _prefix_span(self, prefix):
+        """Start and end of the entries in self.words whose word starts with prefix"""
+        start = bisect_left(self.words, (prefix,))
+        return start, bisect_left(self.words, (prefix + "\U0010ffff",), start)
+
+    def _words_containing(self, token):
+        """Indexed words with token inside them, found by intersecting their trigram sets rarest first"""
+        postings = sorted((self.word_grams.get(g, set()) for g in trigrams(token)), key=len)
+        words = postings[0] & postings[1] if len(postings) > 1 else postings[0]
+        for more in postings[2:]:
+            if not words:
+                break
+            words = words & more
+        return [word for word in words if token in word]  # Shared trigrams alone may be out of order
+
+    def _substring_matches(self, tokens, short_tokens, taken, wanted):
+        """Up to `wanted` IDs, not taken, whose name contains every token, shortest first
+
+        Short words still have to start a word of the name.
+        """
+        lists = []
+        for token in tokens:
+            words = self._words_containing(token)
+            if not words:
+                return []
+            lists.append([self.word_ids[word] for word in words])
+        rarest = min(lists, key=lambda ids: sum(map(len, ids)))
+        entries = shortest_first(rarest)
+        if short_tokens:
+            start, end = min(map(self._prefix_span, short_tokens), key=lambda span: span[1] - span[0])
+            if end - start < sum(map(len, rarest)):
+                # A short word starting few words, such as "x", narrows more than the fragments
+                entries = sorted((len(self.names[sid]), sid) for _, sid in self.words[start:end])
+        needles = tokens + [" " + p for p in short_tokens]  # Searched in " " + name, as in _has_prefixes
+        seen = set(taken)  # A name may have two such words
+        found = []
+        for _, sid in entries:
+            if sid in seen:
+                continue
+            seen.add(sid)
+            name = " " + self.names[sid]
+            if all(needle in name for needle in needles):
+                found.append(sid)
+                if len(found) == wanted:
+                    break
+        return found
+
+    def _close_words(self, token):
+        """{word: Dice similarity} for indexed words sharing at least half of token's padded trigrams
+
+        A word sharing that many must be in one of the rarest len - half + 1
+        posting sets, so only those are counted in full; the common grams
+        (a first letter such as "  g") are only intersected with what they
+        found. Similarity weighs the shared grams against both words' sizes,
+        so "garth" is closer to "gareth" than to "gartereleth".
+        """
+        grams = padded_trigrams(token)
+        needed = (len(grams) + 1) // 2
+        postings = sorted((self.word_grams.get(g, set()) for g in grams), key=len)
+        split = len(postings) - needed + 1
+        counts = Counter()
+        for words in postings[:split]:
+            counts.update(words)
+        for words in postings[split:]:
+            for word in counts.keys() & words:
+                counts[word] += 1
+        return {word: similarity(n, grams, word) for word, n in counts.items() if n >= needed}
+
+    def _fuzzy_matches(self, tokens, short_tokens, taken, wanted):
+        """Up to `wanted` IDs whose name has a word close to every token; most similar, then shortest, first"""
+        seen = set(taken)
+        if short_tokens:
+            start, end = min(map(self._prefix_span, short_tokens), key=lambda span: span[1] - span[0])
+            if end - start <= NARROW_SPAN:
+                # Score just the names with a word starting that short word
+                candidates = [sid for _, sid in self.words[start:end]]
+                close = [self._words_close_to(token, candidates) for token in tokens]
+                return self._best_scores(candidates, close, short_tokens, seen, wanted)
+
+        close = [self._close_words(token) for token in tokens]
+        if not all(close):
+            return []
+        if len(tokens) == 1:
+            # Walk the best-scoring words' students, each word's list already shortest name first
+            by_score = {}
+            for word, n in close[0].items():
+                by_score.setdefault(n, []).append(self.word_ids[word])
+            found = []
+            for n in sorted(by_score, reverse=True):
+                for _, sid in shortest_first(by_score[n]):
+                    if sid not in seen and self._has_prefixes(sid, short_tokens):
+                        seen.add(sid)
+                        found.append(sid)
+                        if len(found) == wanted:
+                            return found
+            return found
+
+        # Several words: score the students of the token with the fewest against every token
+        fewest = min(close, key=lambda words: sum(len(self.word_ids[w]) for w in words))
+        candidates = (sid for word in fewest for _, sid in self.word_ids[word])
+        return self._best_scores(candidates, close, short_tokens, seen, wanted)
+
+    def _words_close_to(self, token, ids):
+        """_close_words for token, limited to the words of the given students' names"""
+        grams = padded_trigrams(token)
+        needed = (len(grams) + 1) // 2
+        close = {}
+        for sid in ids:
+            for word in self.names[sid].split():
+                if word not in close:
+                    n = len(grams & padded_trigrams(word))
+                    close[word] = similarity(n, grams, word) if n >= needed else 0
+        return close
+
+    def _best_scores(self, ids, close, short_tokens, seen, wanted):
+        """Up to `wanted` of ids, not seen, with a word in every close map; highest summed score first"""
+        scores = {}
+        for sid in ids:
+            if sid in seen or not self._has_prefixes(sid, short_tokens):
+                continue
+            seen.add(sid)
+            words = self.names[sid].split()
+            shared = [max(c.get(w, 0) for w in words) for c in close]
+            if all(shared):
+                scores[sid] = sum(shared)
+        return heapq.nsmallest(wanted, scores, key=lambda sid: (-scores[sid], len(self.names[sid]), sid))
+
+
+# Typos the search docstring promises to forgive, and who each must find first in studentMarks.txt
+EXAMPLES = {"gareth s": "Gareth Southgate", "uthga": "Gareth Southgate", "garth": "Gareth Southgate",
+            "shaerer": "Alan Shearer", "jon": "John Curry"}
+
+# Fragments shared by many made-up names, the slowest cases for the timed check
+HEAVY_QUERIES = ("ar", "son", "ar son", "ilso", "wilsno", "gar s")
+
+
+def synthetic_roster(rows, count, seed=7):
+    """The given rows plus made-up students up to `count`, for timing searches on a large roster"""
+    import random  # Only the command line check needs it, so the app does not pay to import it
+    rng = random.Random(seed)
+    # Common fragments such as "gar", "son" and "ar", but no "eth" or "jo" to spell out the examples
+    syllables = ["ar", "ben", "cal", "dor", "el", "fin", "gar", "har", "is", "kel", "lan", "mor", "nor",
+                 "os", "per", "quin", "ros", "sal", "ton", "ur", "vin", "wil", "son", "ley", "ter", "rick"]
+    word = lambda: "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))).capitalize()
+    firsts = [word() for _ in range(3000)]
+    lasts = [word() for _ in range(40000)]
+    taken = {row[0] for row in rows}
+    marks = list(rows[0][2:]) if rows else []
+    fake = ([sid, f"{rng.choice(firsts)} {rng.choice(lasts)}"] + marks
+            for sid in (f"{i:07d}" for i in range(count)) if sid not in taken)
+    return list(rows) + list(islice(fake, max(0, count - len(rows))))
+
+
+def check_examples(index, budget=None):
+    """Print each example's result and return how many failed
+
+    Without a budget the expected student must come first. With one (in ms),
+    made-up names may rank alongside it, so it only has to be found, but the
+    best of five searches must fit the budget.
+    """
+    failed = 0
+    for query, expected in EXAMPLES.items():
+        found = [row[1] for row in index.search(query)]
+        ok = found[:1] == [expected]
+        timing = ""
+        if budget is not None:
+            best = 1e3 * min(_timed(index.search, query) for _ in range(5))
+            ok = expected in found and best <= budget
+            timing = f" in {best:.2f} ms"
+        failed += not ok
+        shown = found[:1] if ok else found[:3]
+        print(f"{'ok' if ok else 'FAIL':<5}{query!r:<12} -> {', '.join(shown) or 'nothing'}{timing}")
+    return failed
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    # Command line entry point: search a mark file, or check the docstring's examples against it
+    import argparse
+    from student_data import read_snapshot
+    parser = argparse.ArgumentParser(description="Search a Student Manager mark file by ID or name")
+    parser.add_argument("query", nargs="*", help="text to search for (default: check the documented examples)")
+    parser.add_argument("--file", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "studentMarks.txt"))
+    parser.add_argument("--students", type=int, default=100000, metavar="N",
+                        help="also time the examples among N students, padded with made-up ones (0 to skip)")
+    parser.add_argument("--budget", type=float, default=1.0, metavar="MS",
+                        help="slowest example search allowed in the timed check (default: 1 ms)")
+    args = parser.parse_args(argv)
+    rows = read_snapshot(args.file)[2]
+    index = StudentIndex(rows)
+
+    if args.query:
+        for row in index.search(" ".join(args.query)):
+            print(",".join(row))
+        return
+    failed = check_examples(index)
+    if args.students:
+        print(f"among {args.students} students:")
+        big = StudentIndex(synthetic_roster(rows, args.students))
+        failed += check_examples(big, args.budget)
+        for query in HEAVY_QUERIES:
+            best = 1e3 * min(_timed(big.search, query) for _ in range(5))
+            failed += best > args.budget
+            print(f"{'ok' if best <= args.budget else 'FAIL':<5}{query!r:<12} -> {len(big.search(query))} found"
+                  f" in {best:.2f} ms")
+    if failed:
+        raise SystemExit(f"{failed} example checks did not find the expected student in time")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # For grading, via student_data
+    main()
@@ -0,0 +1,205 @@
+"""The View All Students list, kept in step with a StudentStore through its change events"""
+import tkinter as tk
+
+import ui_toolkit as ui
+from student_data import calculate_grade, student_marks
+
+ROW_BG = "#051d40"
+SELECTED_BG = "#1c4a7f"
+
+
+def student_line(row):
+    """Format a student row for the list; returns (text, percentage)"""
+    sid, name = row[0], row[1]
+    coursework, exam, percent = student_marks(row)
+    grade = calculate_grade(percent)  # Get letter grade
+    return f"{sid:<6}{name:<20}{coursework:<10}{exam:<7}{percent:<9}{grade:<4}", percent
+
+
+class StudentList(tk.Frame):
+    """One label per student, created once and only reconfigured when that student changes
+
+    The roster follows the store's events, so an add, update or delete
+    touches one row label and the summary however long the list is. Search
+    results are shown in a second frame whose labels are reused from one
+    search to the next.
+
+    Click selects one student, Ctrl-click adds or removes one and
+    Shift-click selects the run of rows from the last click. The selection
+    is kept as store keys, so it survives ID changes and re-sorting.
+    """
+    def __init__(self, master, on_select):
+        super().__init__(master, bg=ROW_BG)
+        self.on_select = on_select        # Called with the selected students' IDs, in the order they were picked
+        self.roster = tk.Frame(self, bg=ROW_BG)   # Every student, in file order
+        self.results = tk.Frame(self, bg=ROW_BG)  # Search matches, best first
+        self.summary = ui.label(self, "students.row_bold")
+        self.labels = {}          # Store key -> roster label
+        self.result_labels = []   # Search result labels, reused
+        self.store = None
+        self.searching = False
+        self.selected = {}        # Keys of the highlighted students (a dict, for click order)
+        self.anchor = None        # Key Shift-click extends from
+        self.roster.pack(anchor="w")
+        self.summary.pack(anchor="w", pady=(20, 0))
+
+    def attach(self, store):
+        """Show a store's students, following its changes from now on"""
+        if self.store is not None:
+            self.store.unsubscribe(self.store_changed)
+        self.store = store
+        store.subscribe(self.store_changed)
+        self.redraw()
+
+    def redraw(self):
+        """Rebuild every roster row (new store, or new grade boundaries)"""
+        self.select(None)
+        for lbl in self.labels.values():
+            lbl.destroy()
+        self.labels = {key: self._roster_label(key, row) for key, row in self.store.rows.items()}
+        self.show_summary()
+
+    def _roster_label(self, key, row):
+        lbl = self._row_label(self.roster)
+        self._fill(lbl, key, row)
+        lbl.pack(anchor="w")
+        return lbl
+
+    def _row_label(self, parent):
+        lbl = ui.label(parent, "students.row")
+        # Make label clickable for selection
+        lbl.bind("<Button-1>", lambda e, lbl=lbl: self.select(lbl))
+        lbl.bind("<Control-Button-1>", lambda e, lbl=lbl: self.toggle(lbl))
+        lbl.bind("<Shift-Button-1>", lambda e, lbl=lbl: self.extend(lbl))
+        return lbl
+
+    def _fill(self, lbl, key, row):
+        """Show a row on a label, touching Tk only for what changed"""
+        line = student_line(row)[0]
+        if lbl.cget("text") != line:
+            lbl.config(text=line)
+        lbl.key = key
+        self._paint(lbl)
+
+    def _paint(self, lbl):
+        bg = SELECTED_BG if lbl.key in self.selected else ROW_BG
+        if lbl.cget("bg") != bg:
+            lbl.config(bg=bg)
+
+    def store_changed(self, event, *args):
+        """StudentStore listener: apply one change to the roster"""
+        if event == "insert":
+            key, row = args
+            self.labels[key] = self._roster_label(key, row)
+        elif event == "update":
+            key, old, row = args
+            self._fill(self.labels[key], key, row)
+            if key in self.selected:
+                self._report()  # The selected student's ID may have changed
+        elif event == "remove":
+            key = args[0]
+            self.labels.pop(key).destroy()
+            if key in self.selected:
+                del self.selected[key]
+                self._report()
+        elif event == "reorder":
+            for lbl in self.labels.values():
+                lbl.pack_forget()
+            for key in self.store.rows:
+                self.labels[key].pack(anchor="w")
+        elif event == "summary" and not self.searching:
+            self.show_summary()
+
+    def show_summary(self):
+        count, average = len(self.store), self.store.average
+        text = f"Total Students: {count}        Average Percentage: {average}%"
+        if len(self.selected) > 1:
+            text += f"        Selected: {len(self.selected)}"
+        self.summary.config(text=text)
+
+    def visible(self):
+        """The row labels on screen, top to bottom"""
+        if self.searching:
+            return self.result_labels
+        return [self.labels[key] for key in self.store.rows]
+
+    def select(self, lbl):
+        """Select just this row (or nobody)"""
+        self.select_keys([] if lbl is None else [lbl.key])
+
+    def toggle(self, lbl):
+        """Add a row to the selection, or take it off"""
+        keys = dict(self.selected)
+        if lbl.key in keys:
+            del keys[lbl.key]
+        else:
+            keys[lbl.key] = True
+        self.select_keys(keys, lbl.key)
+
+    def extend(self, lbl):
+        """Select every row between the last clicked one and this one"""
+        rows = self.visible()
+        keys = [row.key for row in rows]
+        if self.anchor not in keys:
+            return self.select(lbl)
+        start, end = sorted((keys.index(self.anchor), keys.index(lbl.key)))
+        self.select_keys(keys[start:end + 1], self.anchor)
+
+    def select_keys(self, keys, anchor=None):
+        """Highlight exactly these students and report the selection
+
+        Only rows whose highlight changes are touched, so selecting
+        hundreds of students, or clearing them, stays quick.
+        """
+        keys = dict.fromkeys(keys, True)
+        changed = self.selected.keys() ^ keys.keys()
+        self.selected = keys
+        self.anchor = anchor if anchor is not None else next(iter(keys), None)
+        for key in changed:
+            if key in self.labels:
+                self._paint(self.labels[key])
+        for lbl in self.result_labels:
+            self._paint(lbl)
+        self._report()
+
+    def _report(self):
+        if not self.searching:
+            self.show_summary()
+        self.on_select([self.store.rows[key][0] for key in self.selected])
+
+    def show_roster(self):
+        """Show every student"""
+        if self.searching:
+            self.searching = False
+            self.results.pack_forget()
+            self.roster.pack(anchor="w", before=self.summary)
+        self.show_summary()
+
+    def show_results(self, rows, text):
+        """Show search matches in place of the roster
+
+        Result labels are reused: only rows whose text changed are
+        reconfigured, new ones are created below and surplus ones destroyed,
+        so the list can be refreshed on every keystroke without flicker.
+        """
+        if not self.searching:
+            self.searching = True
+            self.roster.pack_forget()
+            self.results.pack(anchor="w", before=self.summary)
+        for i, row in enumerate(rows):
+            if i < len(self.result_labels):
+                lbl = self.result_labels[i]
+            else:
+                lbl = self._row_label(self.results)
+                lbl.pack(anchor="w")
+                self.result_labels.append(lbl)
+            self._fill(lbl, self.store.key(row[0]), row)
+        for lbl in self.result_labels[len(rows):]:
+            lbl.destroy()
+        del self.result_labels[len(rows):]
+        self.summary.config(text=text)
+
+        # Keep the highlight on selected students still shown, and drop the rest
+        shown = {lbl.key for lbl in self.result_labels}
+        if not self.selected.keys() <= shown:
+            self.select_keys([key for key in self.selected if key in shown], self.anchor)
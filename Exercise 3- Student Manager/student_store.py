@@ -0,0 +1,426 @@
+"""The students of one mark file, with change events for the views that show them"""
+import time
+from array import array
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from itertools import count
+
+from student_data import file_version, locked, read_snapshot, student_marks, write_students
+
+# A file modified this recently may have changed again within the same
+# modification time (coarse on network shares), so its contents are checked
+RACY_SECONDS = 2.0
+
+# Changes kept for undo, per store
+HISTORY_LIMIT = 100
+
+# Sorts kept for undo hold one position per student (4 bytes); past this many
+# positions between them the oldest changes are forgotten
+SORT_HISTORY_BUDGET = 2_000_000
+
+
+class ConflictError(ValueError):
+    """A change to a student that someone else changed or deleted since they were read"""
+
+    def __init__(self, count=None, message=None):
+        if message is None:
+            students = "this student" if count is None else f"{count} of these students"
+            message = (f"Someone else changed {students} since it was opened; "
+                       "their version is shown now, please check it and try again.")
+        super().__init__(message)
+
+
+class Delta:
+    """What one change did, for undo and redo
+
+    rows holds (key, before, after, position) for each student it touched:
+    before is None for a student it added and after is None for one it
+    deleted, whose position in the file is kept so undoing puts them back
+    there. A sort keeps, in an array of ints, where each student was
+    before it, plus hashes of the order before and after to check the
+    roster is still as it left it. Only the students involved are held,
+    never a copy of the roster.
+    """
+    __slots__ = ("label", "rows", "positions", "orders")
+
+    def __init__(self, label, rows=(), positions=None, orders=None):
+        self.label = label          # e.g. "Delete 3 students"
+        self.rows = list(rows)
+        self.positions = positions  # For a sort: positions[i] = where the student now i-th was before
+        self.orders = orders        # For a sort: hash() of the tuple of keys before and after
+
+    def inverse(self):
+        """The change that undoes this one"""
+        positions = None
+        if self.positions is not None:
+            positions = array("I", [0]) * len(self.positions)
+            for now, before in enumerate(self.positions):
+                positions[before] = now
+        return Delta(self.label, [(key, after, before, position) for key, before, after, position in reversed(self.rows)],
+                     positions, self.orders and self.orders[::-1])
+
+
+class StudentStore:
+    """Student rows of one mark file, in file order
+
+    Every change is written to the file and then announced to listeners as
+    listener(event, *args):
+
+        "insert", key, row
+        "update", key, old_row, row     (the student ID may have changed)
+        "remove", key, row
+        "reorder"                       (same students, new order)
+        "summary", count, average       (after any of the above)
+
+    Keys are handles that stay the same when a student's ID changes, so a
+    view can map them to its widgets. Rows live in a dict, so applying a
+    change and updating the figures costs the same however many students
+    there are; only writing the file grows with the roster. The file is
+    written before memory changes, so a failed write (OSError) leaves the
+    store as it was.
+
+    The file may be shared with other editors. Each change holds the file's
+    lock only while it catches up with their saved changes, checks its own
+    and writes. Catching up applies just the students that differ, announced
+    like local changes. A change to a student someone else changed in the
+    meantime raises ConflictError instead of overwriting their work.
+    Memory is patched, and listeners told, only after the lock is released,
+    inside the `patching` context manager (a threading.Lock, say), so
+    readers on other threads can hold it without waiting on file I/O.
+
+    Each change is also kept as a Delta, so undo() and redo() can step back
+    and forth through the last HISTORY_LIMIT changes (fewer once sorts of a
+    big roster pass SORT_HISTORY_BUDGET). Other editors' changes are not
+    undone; a step that would overwrite one raises ConflictError.
+    """
+    def __init__(self, path, rows=(), version=None, digest=None, patching=None):
+        self.path = path
+        self.patching = nullcontext() if patching is None else patching  # Held while memory changes
+        self.version = version  # file_version() of the file these rows match
+        self.digest = digest    # content_digest() of it, if known
+        self.rows = {}          # Key -> row, in file order
+        self.keys = {}          # Student ID -> key
+        self.listeners = []
+        self.marked = 0         # Students whose marks are numeric
+        self.total = 0          # Sum of their percentages, in hundredths so it stays exact
+        self._next_key = count()
+        self.undo_log = deque(maxlen=HISTORY_LIMIT)  # Deltas, latest last
+        self.redo_log = []                           # Deltas undone, latest last
+        for row in rows:
+            self._add(row)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows.values())
+
+    def __contains__(self, sid):
+        return sid in self.keys
+
+    def get(self, sid):
+        """The row of the student with this ID, or None"""
+        key = self.keys.get(sid)
+        return None if key is None else self.rows[key]
+
+    def key(self, sid):
+        """The key of the student with this ID, or None"""
+        return self.keys.get(sid)
+
+    @property
+    def average(self):
+        """Average percentage, rounded as the list shows it"""
+        return round(self.total / 100 / self.marked, 2) if self.marked else 0
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def _emit(self, event, *args):
+        self._emit_all([(event, *args)])
+
+    def _emit_all(self, events):
+        """Announce several changes, then the figures once"""
+        listeners = list(self.listeners)
+        for event in events:
+            for listener in listeners:
+                listener(*event)
+        for listener in listeners:
+            listener("summary", len(self.rows), self.average)
+
+    def _tally(self, row, sign):
+        """Add a row to (sign 1) or take it off (sign -1) the running figures"""
+        try:
+            percent = student_marks(row)[2]
+        except ValueError:
+            return  # Non-numeric marks are left out of the figures
+        self.marked += sign
+        self.total += sign * round(percent * 100)
+
+    def _add(self, row, key=None):
+        if key is None:
+            key = next(self._next_key)
+        self.rows[key] = row
+        self.keys[row[0]] = key
+        self._tally(row, 1)
+        return key
+
+    def _discard(self, key):
+        row = self.rows.pop(key)
+        del self.keys[row[0]]
+        self._tally(row, -1)
+        return row
+
+    def _replace(self, key, row):
+        old = self.rows[key]
+        del self.keys[old[0]]
+        self._tally(old, -1)
+        self.rows[key] = row
+        self.keys[row[0]] = key
+        self._tally(row, 1)
+        return old
+
+    def insert(self, row):
+        """Add a student at the end of the file"""
+        with self._committing():
+            if row[0] in self.keys:
+                raise ValueError("Student ID already exists.")
+            self._write([*self.rows.values(), row])
+        with self.patching:
+            key = self._add(row)
+            self._record(Delta(f"Add {row[0]}", [(key, None, row, len(self.rows) - 1)]))
+            self._emit("insert", key, row)
+
+    def update(self, sid, row):
+        """Replace a student's row in place; the ID may change"""
+        with self._committing() as changed:
+            if sid in changed:
+                raise ConflictError()
+            key = self.keys[sid]
+            if row[0] != sid and row[0] in self.keys:
+                raise ValueError("Another student already has that ID.")
+            self._write([row if k == key else r for k, r in self.rows.items()])
+        with self.patching:
+            old = self._replace(key, row)
+            self._record(Delta(f"Update {sid}", [(key, old, row, None)]))
+            self._emit("update", key, old, row)
+
+    def update_many(self, rows):
+        """Replace several students' rows ({id: row}) with one write; IDs stay the same
+
+        Either every row is saved or, if any of those students was changed
+        by someone else meanwhile, none is (ConflictError).
+        """
+        with self._committing() as changed:
+            if changed.intersection(rows):
+                raise ConflictError(len(changed.intersection(rows)))
+            if any(row[0] != sid for sid, row in rows.items()):
+                raise ValueError("Student IDs cannot be changed for several students at once.")
+            new = {self.keys[sid]: row for sid, row in rows.items()}
+            self._write([new.get(k, r) for k, r in self.rows.items()])
+        with self.patching:
+            events = [("update", key, self._replace(key, row), row) for key, row in new.items()]
+            self._record(Delta(f"Update {len(events)} students", [(key, old, row, None) for _, key, old, row in events]))
+            self._emit_all(events)
+
+    def remove(self, sid):
+        """Delete a student"""
+        self.remove_many([sid])
+
+    def remove_many(self, sids):
+        """Delete several students with one write
+
+        Students someone else already deleted are skipped; if any of the
+        others was changed by someone else meanwhile, nobody is deleted
+        (ConflictError).
+        """
+        with self._committing() as changed:
+            sids = [sid for sid in sids if sid in self.keys]
+            if changed.intersection(sids):
+                raise ConflictError(len(changed.intersection(sids)))
+            if not sids:
+                return
+            keys = set(self.keys[sid] for sid in sids)
+            kept, positions = [], []
+            for position, (key, row) in enumerate(self.rows.items()):
+                if key in keys:
+                    positions.append((key, position))
+                else:
+                    kept.append(row)
+            self._write(kept)
+        with self.patching:
+            events = [("remove", key, self._discard(key)) for key, _ in positions]
+            label = f"Delete {sids[0]}" if len(events) == 1 else f"Delete {len(events)} students"
+            self._record(Delta(label, [(key, row, None, position)
+                                       for (_, key, row), (_, position) in zip(events, positions)]))
+            self._emit_all(events)
+
+    def sort(self, key, reverse=False):
+        """Reorder the students, e.g. by name"""
+        with self._committing():
+            items = list(self.rows.items())
+            positions = array("I", sorted(range(len(items)), key=lambda i: key(items[i][1]), reverse=reverse))
+            rows = {items[i][0]: items[i][1] for i in positions}
+            self._write(list(rows.values()))
+        with self.patching:
+            self._record(Delta("Sort", positions=positions, orders=(hash(tuple(self.rows)), hash(tuple(rows)))))
+            self.rows = rows
+            self._emit("reorder")
+
+    def undo(self):
+        """Reverse the latest change; returns its label, or None if there was nothing to undo"""
+        return self._replay(self.undo_log, self.redo_log, undo=True)
+
+    def redo(self):
+        """Make the latest undone change again; returns its label, or None if there was none"""
+        return self._replay(self.redo_log, self.undo_log, undo=False)
+
+    def _replay(self, source, target, undo):
+        """Apply the latest delta of one log and move it to the other
+
+        Like any change, it is written under the lock after catching up
+        with other editors, but only the students it names are patched in
+        memory and announced. A delta that no longer fits, because someone
+        else changed those students, is dropped with ConflictError.
+        """
+        if not source:
+            return None
+        delta = source[-1]
+        change = delta.inverse() if undo else delta
+        with self._committing():
+            try:
+                order = self._save(change, "undone" if undo else "redone")
+            except ConflictError:
+                source.pop()
+                raise
+        with self.patching:
+            events = self._patch(change, order)
+            target.append(source.pop())
+            self._emit_all(events)
+        return delta.label
+
+    def _save(self, delta, action):
+        """Write the file as it is after a delta; returns the keys in their new order
+
+        Every student it names must still be as the delta expects, or
+        ConflictError says it can no longer be undone/redone (the action).
+        """
+        for key, before, after, position in delta.rows:
+            if before is None:
+                fits = key not in self.rows and after[0] not in self.keys
+            else:
+                fits = self.rows.get(key) == before and (after is None or after[0] == before[0]
+                                                          or after[0] not in self.keys)
+            if not fits:
+                break
+        else:
+            fits = delta.orders is None or delta.orders[0] == hash(tuple(self.rows))
+        if not fits:
+            raise ConflictError(message=f"\"{delta.label}\" can no longer be {action}: "
+                                        "someone else has changed those students since.")
+
+        # The file as it will be: changed rows in place, deleted ones out, added ones at their positions
+        rows = dict(self.rows)
+        for key, before, after, position in delta.rows:
+            if after is None:
+                del rows[key]
+            else:
+                rows[key] = after
+        if delta.positions is not None:
+            keys = list(self.rows)
+            order = [keys[i] for i in delta.positions]
+        else:
+            order = [key for key in self.rows if key in rows]
+            added = [(position, key) for key, before, after, position in delta.rows if before is None]
+            for position, key in sorted(added):
+                order.insert(position, key)
+        self._write([rows[key] for key in order])
+        return order
+
+    def _patch(self, delta, order):
+        """Apply a saved delta to memory; returns the events to announce"""
+        events = []
+        for key, before, after, position in delta.rows:
+            if before is None:
+                events.append(("insert", self._add(after, key), after))
+            elif after is None:
+                events.append(("remove", key, self._discard(key)))
+            else:
+                events.append(("update", key, self._replace(key, after), after))
+        if order != list(self.rows):
+            self.rows = {key: self.rows[key] for key in order}
+            events.append(("reorder",))
+        return events
+
+    def _record(self, delta):
+        """Keep a change for undo; a new change drops anything that could have been redone"""
+        self.undo_log.append(delta)
+        self.redo_log.clear()
+        while len(self.undo_log) > 1 and sum(len(d.positions or ()) for d in self.undo_log) > SORT_HISTORY_BUDGET:
+            self.undo_log.popleft()
+
+    def refresh(self):
+        """Apply changes other editors saved to the file; True if there were any"""
+        return bool(self._catch_up())
+
+    @contextmanager
+    def _committing(self):
+        """Hold the file's lock, caught up with other editors; yields the IDs they changed"""
+        with locked(self.path):
+            yield self._catch_up()
+
+    def _catch_up(self):
+        """Bring memory in line with the file if someone else saved it; returns the IDs that changed
+
+        Checking costs a stat() unless the file looks changed or was saved
+        too recently for its modification time to be trusted; only then is
+        it read, and only if its digest differs is it parsed and compared.
+        """
+        try:
+            version = file_version(self.path)
+        except FileNotFoundError:
+            if self.version is None:
+                return set()  # Never saved yet; the first write creates it
+            raise
+        if version == self.version and time.time_ns() - version[0] > RACY_SECONDS * 1e9:
+            return set()
+        version, digest, rows = read_snapshot(self.path, self.digest)
+        changed = set()
+        if rows is not None:
+            with self.patching:
+                changed = self._merge(rows)
+        self.version, self.digest = version, digest
+        return changed
+
+    def _merge(self, rows):
+        """Apply the differences between the file's rows and ours, announcing each; returns their IDs"""
+        theirs = {row[0]: row for row in rows}
+        changed = set()
+        for sid, key in list(self.keys.items()):
+            row = theirs.get(sid)
+            if row is None:
+                self._emit("remove", key, self._discard(key))
+            elif row != self.rows[key]:
+                self._emit("update", key, self._replace(key, row), row)
+            else:
+                continue
+            changed.add(sid)
+        for sid, row in theirs.items():
+            if sid not in self.keys:
+                self._emit("insert", self._add(row), row)
+                changed.add(sid)
+        order = [self.keys[sid] for sid in theirs]
+        if order != list(self.rows):
+            self.rows = {key: self.rows[key] for key in order}
+            self._emit("reorder")
+        return changed
+
+    def _write(self, rows):
+        """Write the file as it will be after a change, before the change is applied
+
+        If the write fails (OSError) nothing in memory has changed yet.
+        """
+        self.digest = write_students(self.path, rows)
+        self.version = file_version(self.path)
@@ -0,0 +1,146 @@
+"""Process-wide resources shared by the portfolio apps
+
+When the apps run from launcher.py they live in one process, so the decoded
+images and the worker threads here are created once and reused by every
+window. Run standalone, each app simply gets its own copy.
+"""
+import atexit
+import os
+import threading
+import weakref
+
+# Background threads shared by every app (image decoding, file parsing, ...)
+WORKER_THREADS = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def worker_pool():
+    """Return the shared ThreadPoolExecutor, starting it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from concurrent.futures import ThreadPoolExecutor  # Deferred: costs ~10 ms to import
+            _pool = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="portfolio")
+            atexit.register(_pool.shutdown, wait=False)
+    return _pool
+
+
+class AssetCache:
+    """Resized images keyed by path, size and modification time
+
+    Given a cache_dir, resized copies are also saved there as PNGs, so later
+    launches load them instead of resampling the originals again.
+    """
+    def __init__(self):
+        self.images = {}                           # key -> resized PIL image not yet turned into a photo
+        self.photos = weakref.WeakKeyDictionary()  # Tk root -> {key: PhotoImage}
+        self.loading = {}                          # key -> Future of a preload still running
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(path, size):
+        """Cache key; a changed file gets a new key instead of a stale image"""
+        return (os.path.abspath(path), tuple(size), os.stat(path).st_mtime_ns)
+
+    def image(self, path, size, cache_dir=None):
+        """Return the image at path resized to size as a PIL image (thread safe)"""
+        key = self.key(path, size)
+        with self.lock:
+            image = self.images.get(key)
+            loading = self.loading.get(key)
+        if image is None:
+            if loading is not None:
+                return loading.result()  # A preload is already decoding it
+            image = self._decode(key, path, size, cache_dir)
+        return image
+
+    def _decode(self, key, path, size, cache_dir=None):
+        """Decode and resize one image, keeping the first result if two threads race"""
+        try:
+            from PIL import Image
+            saved = cache_dir and self._saved_path(cache_dir, key)
+            if saved and os.path.exists(saved):
+                with Image.open(saved) as source:
+                    image = source.copy()
+            else:
+                with Image.open(path) as source:
+                    image = source.resize(tuple(size), Image.LANCZOS)
+                if saved:
+                    self._save(image, saved)
+            with self.lock:
+                return self.images.setdefault(key, image)
+        finally:
+            with self.lock:
+                self.loading.pop(key, None)
+
+    @staticmethod
+    def _saved_path(cache_dir, key):
+        """On-disk copy's name, from the source's name, the size and the source's mtime"""
+        path, (width, height), mtime = key
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(cache_dir, f"{stem}_{width}x{height}_{mtime}.png")
+
+    @staticmethod
+    def _save(image, saved):
+        """Write a resized copy to the disk cache and drop stale versions of it"""
+        try:
+            cache_dir = os.path.dirname(saved)
+            os.makedirs(cache_dir, exist_ok=True)
+            prefix = os.path.basename(saved).rsplit("_", 1)[0] + "_"
+            for old in os.listdir(cache_dir):
+                if old.startswith(prefix):
+                    os.remove(os.path.join(cache_dir, old))
+            tmp_path = saved + f".{threading.get_ident()}.tmp"
+            image.save(tmp_path, "PNG")
+            os.replace(tmp_path, saved)
+        except OSError as e:
+            print(f"Could not cache {saved}: {e}")
+
+    def cached(self, widget, path, size):
+        """True if the photo for path and size already exists on widget's Tk root"""
+        return self.key(path, size) in self.photos.get(widget._root(), ())
+
+    def photo(self, widget, path, size, factory=None, cache_dir=None):
+        """Return a PhotoImage shared by every window on widget's Tk root (Tk thread only)
+
+        factory() builds the photo when it is not cached; by default the file
+        is resized with PIL.
+        """
+        root = widget._root()
+        photos = self.photos.get(root)
+        if photos is None:
+            photos = self.photos[root] = {}
+        key = self.key(path, size)
+        photo = photos.get(key)
+        if photo is None:
+            if factory is None:
+                from PIL import ImageTk
+                photo = ImageTk.PhotoImage(self.image(path, size, cache_dir), master=root)
+            else:
+                photo = factory()
+            photos[key] = photo
+            with self.lock:
+                self.images.pop(key, None)  # The photo holds the pixels now
+        return photo
+
+    def preload(self, paths, size, master=None, cache_dir=None):
+        """Decode and resize images on the worker pool ahead of first use
+
+        Paths that already have a photo on master's Tk root are skipped.
+        """
+        photos = self.photos.get(master._root(), {}) if master is not None else {}
+        futures = []
+        for path in paths:
+            key = self.key(path, size)
+            with self.lock:
+                if key in photos or key in self.images or key in self.loading:
+                    continue
+                future = self.loading[key] = worker_pool().submit(self._decode, key, path, size, cache_dir)
+            futures.append(future)
+        return futures
+
+
+# The cache every app uses
+ASSETS = AssetCache()
@@ -0,0 +1,85 @@
+"""Grade boundaries shared by the portfolio apps, loaded from grading.json
+
+A scheme maps a mark to the grade with the highest cut-off not above it,
+found with bisect over the sorted cut-offs. Quiz scores are whole numbers,
+so the quiz's "above 90" for A+ is written as a cut-off of 91.
+
+Edit grading.json and call reload() to pick up new boundaries; nothing
+else needs to change.
+"""
+import json
+import os
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grading.json")
+
+_schemes = {}      # Scheme name -> GradingScheme
+_version = None    # (mtime, size) of the config they were loaded from
+
+
+class GradingScheme:
+    """Sorted grade cut-offs with O(log k) lookups"""
+    def __init__(self, cutoffs, below):
+        # cutoffs: {grade: lowest mark for it}; below: grade for marks under every cut-off
+        pairs = sorted((float(mark), grade) for grade, mark in cutoffs.items())
+        self.cutoffs = [mark for mark, _ in pairs]
+        self.grades = [below] + [grade for _, grade in pairs]
+
+    def grade(self, mark):
+        """Grade for one mark"""
+        return self.grades[bisect_right(self.cutoffs, mark)]
+
+    __call__ = grade
+
+    def regrade(self, marks):
+        """Grades for many marks at once"""
+        return list(map(self.grade, marks))
+
+    def distribution(self, sorted_marks):
+        """How many of a sorted list of marks get each grade
+
+        One bisect per cut-off finds where each grade starts, so regrading a
+        whole cohort costs O(k log n) however many students it has.
+        """
+        edges = [0] + [bisect_left(sorted_marks, mark) for mark in self.cutoffs] + [len(sorted_marks)]
+        return Counter({grade: high - low for grade, low, high in zip(self.grades, edges, edges[1:]) if high > low})
+
+    def __repr__(self):
+        bounds = ", ".join(f"{grade}: {mark:g}" for mark, grade in zip(self.cutoffs, self.grades[1:]))
+        return f"GradingScheme({{{bounds}}}, below={self.grades[0]!r})"
+
+
+def load_schemes(path=CONFIG_PATH):
+    """Read every scheme in a config file (ValueError if one is malformed)"""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    schemes = {}
+    for name, entry in config.items():
+        try:
+            schemes[name] = GradingScheme(entry["cutoffs"], entry["below"])
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"grading scheme {name!r} in {path} is malformed: {e}") from None
+    return schemes
+
+
+def _config_version():
+    st = os.stat(CONFIG_PATH)
+    return st.st_mtime_ns, st.st_size
+
+
+def reload():
+    """Reload the schemes if grading.json changed; True if they did"""
+    global _schemes, _version
+    version = _config_version()
+    if version == _version:
+        return False
+    _schemes, _version = load_schemes(), version
+    return True
+
+
+def scheme(name):
+    """The named scheme, loading the config on first use"""
+    if _version is None:
+        reload()
+    return _schemes[name]
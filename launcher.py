@@ -0,0 +1,103 @@
+"""Skills portfolio launcher: open any of the three apps from one process
+
+Every app runs in its own Toplevel on a single Tk root, so switching apps
+costs neither a new Python interpreter nor a new Tk. Each app module is
+imported the first time it is opened and exposes launch(master), which
+builds its window. Apps share the fonts in ui_toolkit and the image cache
+and worker pool in app_runtime.
+
+    python launcher.py            # choose an app
+    python launcher.py students   # open one straight away
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tkinter as tk
+
+import ui_toolkit as ui
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Key -> (button text, folder, script)
+APPS = {
+    "quiz": ("🧮 Math Quiz", "Exercise 1- Math Quiz", "Exercise 1- Math Quiz.py"),
+    "jokes": ("😂 Alexa Tell Me A Joke", "Exercise 2- Alexa tell me a Joke", "Exercise 2- Alexa tell me a Joke.py"),
+    "students": ("🎓 Student Manager", "Exercise 3- Student Manager", "Exercise 3- Student Manager.py"),
+}
+
+ui.define_style("launcher.button", "flat_button", font=("Arial", 14, "bold"), bg="#213159", fg="white",
+                activebackground="#1c4a7f", activeforeground="white", cursor="hand2", width=24, pady=8)
+ui.define_style("launcher.title", font=("Arial", 20, "bold"), bg="#051d40", fg="white")
+ui.define_style("launcher.status", font=("Arial", 10), bg="#051d40", fg="#9fb3d9")
+
+_modules = {}  # Key -> imported app module
+
+
+def load_app(key):
+    """Import an app's script the first time it is needed"""
+    module = _modules.get(key)
+    if module is None:
+        _, folder, script = APPS[key]
+        app_dir = os.path.join(BASE_DIR, folder)
+        if app_dir not in sys.path:
+            sys.path.insert(0, app_dir)  # Apps import helper modules from their own folder
+        spec = importlib.util.spec_from_file_location(f"portfolio_{key}", os.path.join(app_dir, script))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[key] = module
+    return module
+
+
+class Launcher:
+    """Small window with one button per app"""
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Skills Portfolio")
+        self.root.configure(bg="#051d40", padx=30, pady=20)
+        self.root.resizable(False, False)
+        self.windows = {}  # Key -> open app window
+
+        ui.label(root, "launcher.title", text="Skills Portfolio").pack(pady=(0, 15))
+        for key, (text, _, _) in APPS.items():
+            ui.button(root, "launcher.button", text=text, command=lambda k=key: self.open(k)).pack(pady=6)
+        self.status = ui.label(root, "launcher.status", text="Choose an app")
+        self.status.pack(pady=(15, 0))
+
+    def open(self, key):
+        """Bring an app's window to the front, opening it if needed"""
+        window = self.windows.get(key)
+        if window is not None and window.winfo_exists():
+            window.deiconify()
+            window.lift()
+            window.focus_force()
+            return window
+
+        # First opens import the app and build its screens, so show a splash meanwhile
+        splash = ui.Splash(self.root, f"Opening {APPS[key][0]}...")
+        try:
+            window = load_app(key).launch(self.root)
+        except Exception as e:
+            self.status.config(text=f"Could not open {APPS[key][0]}: {e}")
+            raise
+        finally:
+            splash.close()
+        self.windows[key] = window
+        self.status.config(text="Choose an app")
+        return window
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open the skills portfolio apps")
+    parser.add_argument("app", nargs="?", choices=sorted(APPS), help="app to open straight away")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    launcher = Launcher(root)
+    if args.app:
+        root.after_idle(launcher.open, args.app)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
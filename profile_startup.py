@@ -0,0 +1,83 @@
+"""Measure how long each portfolio app takes to import, using python -X importtime
+
+Each app script is imported (not run) in a fresh interpreter several times,
+and the median of the total import time is reported along with the modules
+that cost the most. Apps whose optional dependencies are missing are
+reported with the import error instead of a time.
+
+    python profile_startup.py              # all apps
+    python profile_startup.py quiz -n 9    # one app, 9 runs
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from launcher import APPS, BASE_DIR
+
+# Imports an app script the way launcher.load_app does, without starting its GUI
+IMPORT_APP = """
+import importlib.util, sys
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {folder!r})
+spec = importlib.util.spec_from_file_location("app_under_test", {script!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+
+def parse_importtime(stderr):
+    """Return (total microseconds, {module: cumulative microseconds}) from -X importtime output"""
+    total = 0
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative = int(cumulative)
+        modules[name.strip()] = max(modules.get(name.strip(), 0), cumulative)
+        if not name.startswith("  "):  # Top-level imports; nested ones are already included
+            total += cumulative
+    return total, modules
+
+
+def profile(key, runs):
+    """Import one app `runs` times; return (median total us, module costs from the median run) or an error"""
+    _, folder, script = APPS[key]
+    folder = os.path.join(BASE_DIR, folder)
+    code = IMPORT_APP.format(root=BASE_DIR, folder=folder, script=os.path.join(folder, script))
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              capture_output=True, text=True, cwd=folder)
+        if proc.returncode:
+            return proc.stderr.strip().splitlines()[-1]
+        results.append(parse_importtime(proc.stderr))
+    results.sort(key=lambda result: result[0])
+    return results[len(results) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the import time of the portfolio apps")
+    parser.add_argument("apps", nargs="*", metavar="app", help=f"apps to profile: {', '.join(APPS)} (default: all)")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="runs per app; the median is reported")
+    parser.add_argument("--top", type=int, default=8, help="heaviest modules to list per app")
+    args = parser.parse_args(argv)
+    unknown = set(args.apps) - set(APPS)
+    if unknown:
+        parser.error(f"unknown app: {', '.join(sorted(unknown))}")
+
+    for key in args.apps or APPS:
+        result = profile(key, args.runs)
+        if isinstance(result, str):
+            print(f"{key:<10} import failed: {result}")
+            continue
+        total, modules = result
+        print(f"{key:<10} {total / 1000:7.1f} ms")
+        heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for name, cumulative in heaviest:
+            print(f"    {cumulative / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Shared Tk fonts, style presets and widget factories for the portfolio apps
+
+Fonts are created once per Tk root as named tkfont.Font objects, so widgets
+share one Tk font instead of each parsing its own ("Arial", 13) spec.
+Style presets are plain dicts of widget options; their fonts are resolved
+to the cached Font objects the first time a preset is used on a root.
+"""
+import sys
+import time
+import tkinter as tk
+import weakref
+from tkinter import font as tkfont
+
+# Preset name -> widget options, with "font" given as a (family, size, *modifiers) tuple
+STYLES = {}
+
+# Seconds from start-up until a splash screen should be on screen
+SPLASH_BUDGET = 0.25
+
+# Tk root -> {"fonts": {spec: Font}, "styles": {name: resolved options}}
+_caches = weakref.WeakKeyDictionary()
+
+
+def define_style(name, base=None, **options):
+    """Register a style preset, optionally extending another preset"""
+    merged = dict(STYLES[base]) if base else {}
+    merged.update(options)
+    STYLES[name] = merged
+    for cache in _caches.values():
+        cache["styles"].pop(name, None)  # Re-resolve on next use
+    return name
+
+
+def _cache(widget):
+    """Font and style caches for the Tk root a widget belongs to"""
+    root = widget._root()
+    cache = _caches.get(root)
+    if cache is None:
+        cache = _caches[root] = {"fonts": {}, "styles": {}}
+    return cache
+
+
+def get_font(widget, spec):
+    """Return the shared Font for a (family, size, *modifiers) spec, creating it once per root"""
+    fonts = _cache(widget)["fonts"]
+    font = fonts.get(spec)
+    if font is None:
+        family, size, *modifiers = spec
+        font = fonts[spec] = tkfont.Font(
+            root=widget._root(), family=family, size=size,
+            weight="bold" if "bold" in modifiers else "normal",
+            slant="italic" if "italic" in modifiers else "roman",
+            underline="underline" in modifiers, overstrike="overstrike" in modifiers)
+    return font
+
+
+def style_options(widget, name):
+    """Widget options for a preset with its font resolved (cached, do not modify)"""
+    styles = _cache(widget)["styles"]
+    options = styles.get(name)
+    if options is None:
+        options = dict(STYLES[name])
+        if isinstance(options.get("font"), tuple):
+            options["font"] = get_font(widget, options["font"])
+        styles[name] = options
+    return options
+
+
+def make(widget_class, parent, style=None, **overrides):
+    """Create a widget from a preset plus per-widget options"""
+    options = style_options(parent, style) if style else {}
+    if overrides:
+        if isinstance(overrides.get("font"), tuple):
+            overrides["font"] = get_font(parent, overrides["font"])
+        options = {**options, **overrides}
+    return widget_class(parent, **options)
+
+
+def button(parent, style=None, **options):
+    """Create a tk.Button from a preset"""
+    return make(tk.Button, parent, style, **options)
+
+
+def label(parent, style=None, **options):
+    """Create a tk.Label from a preset"""
+    return make(tk.Label, parent, style, **options)
+
+
+def entry(parent, style=None, **options):
+    """Create a tk.Entry from a preset"""
+    return make(tk.Entry, parent, style, **options)
+
+
+# Flat buttons used by the Joke and Student Manager apps; presets add font and colours
+define_style("flat_button", relief="flat", borderwidth=0, highlightthickness=0)
+define_style("splash", font=("Arial", 16, "bold"), bg="#051d40", fg="white", padx=40, pady=25)
+
+
+class Splash:
+    """Borderless loading window, mapped before an app does its heavy start-up work"""
+    def __init__(self, master, text, started=None, budget=SPLASH_BUDGET):
+        self.window = tk.Toplevel(master)
+        self.window.overrideredirect(True)
+        label(self.window, "splash", text=text).pack()
+
+        # Centre on screen, then force it onto the screen now rather than at the next idle
+        self.window.update_idletasks()
+        width, height = self.window.winfo_reqwidth(), self.window.winfo_reqheight()
+        x = (self.window.winfo_screenwidth() - width) // 2
+        y = (self.window.winfo_screenheight() - height) // 2
+        self.window.geometry(f"+{x}+{y}")
+        self.window.update()
+
+        # started is a time.perf_counter() taken as early as possible in the script
+        self.mapped_in = None if started is None else time.perf_counter() - started
+        if self.mapped_in is not None and self.mapped_in > budget:
+            print(f"Splash took {self.mapped_in * 1000:.0f} ms to appear (budget {budget * 1000:.0f} ms)",
+                  file=sys.stderr)
+
+    def close(self):
+        """Remove the splash once the real window is ready"""
+        self.window.destroy()